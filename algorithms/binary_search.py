@@ -1,12 +1,26 @@
 from __future__ import annotations
-from data_structures.referential_array import ArrayR
+from data_structures.referential_array import ArrayR, ArrayRView
+from data_structures.typed_array import TypedArray
 from data_structures.array_list import ArrayList
+from data_structures.numpy_backend import numpy, as_numpy
 from typing import TypeVar
 
 T = TypeVar("T")
 
-# We are defining a type, and we are saying it can be either an ArrayList or an ArrayR.
-ListOrArray = TypeVar("ListOrArray", ArrayList[T], ArrayR[T])
+# We are defining a type, and we are saying it can be either an ArrayList or an array
+# (an ArrayR, a typed array or a view of one).
+ListOrArray = TypeVar("ListOrArray", ArrayList[T], ArrayR[T], TypedArray[T], ArrayRView[T])
+
+
+def numpy_binary_search(values: numpy.ndarray, target_item: T) -> int:
+    """
+    binary_search on the values of a typed array, with numpy.searchsorted,
+    which finds the first occurrence of the item.
+    """
+    index = int(numpy.searchsorted(values, target_item))
+    if index < len(values) and values[index] == target_item:
+        return index
+    raise ValueError(f"{target_item} not found in the list.")
 
 
 def binary_search(my_list: ListOrArray, target_item: T) -> int:
@@ -26,7 +40,15 @@ def binary_search(my_list: ListOrArray, target_item: T) -> int:
     Complexity:
         Best Case Complexity: O(1), when middle index contains item.
         Worst Case Complexity: O(log(N)), where N is the length of my_list.
+
+    If the item occurs more than once, the index of its first occurrence is returned.
+    Typed arrays (or ArrayLists holding them) are searched by NumPy (numpy.searchsorted)
+    when it is installed, see data_structures.numpy_backend, with the same result.
     """
+    values = as_numpy(my_list)
+    if values is not None:
+        return numpy_binary_search(values, target_item)
+
     def _binary_search_aux(my_list, target_item, lo, hi) -> int:
         """
         Auxiliary method used by binary search.
@@ -59,8 +81,10 @@ def binary_search(my_list: ListOrArray, target_item: T) -> int:
             # Item would be after mid
             return _binary_search_aux(my_list, target_item, mid + 1, hi)
         elif my_list[mid] == target_item:
-            # Item is at mid
-            return mid
+            # Item is at mid, but might occur before it too
+            if mid == lo or my_list[mid - 1] != target_item:
+                return mid
+            return _binary_search_aux(my_list, target_item, lo, mid)
         
         # If we reach here, it means the comparison operator is not implemented correctly. Otherwise, at least
         # one of the conditions above should have been true.
@@ -0,0 +1,201 @@
+"""
+An external (out-of-core) mergesort, for inputs too large to hold in memory.
+
+The records are read in chunks that fit in a memory budget, each chunk is
+sorted with mergesort and written to a temporary file as a sorted run, then
+the runs are read back a few records at a time and combined with a k-way
+merge (heapq.merge), so only one chunk, or one batch of records per run, is
+in memory at any time. The sorted records are produced by a generator, and
+can be written out as they come.
+
+The runs are written with the format of data_structures.serialization, which
+pickles the records in batches, so the records (and their keys) must be
+picklable. If there are more runs than fan_in, groups of fan_in runs are first
+merged into longer runs, so the number of files open at once stays bounded.
+
+With a key, the key of each record is computed once, when its chunk is
+sorted, and the runs hold (key, record) pairs, so the merges compare the
+stored keys rather than calling key again on every pass.
+
+Equal records keep their input order, so the result is the same as mergesort
+on all the records at once.
+"""
+from __future__ import annotations
+
+import heapq
+import os
+import sys
+import tempfile
+from operator import itemgetter
+from typing import Any, BinaryIO, Iterable, Iterator
+
+from algorithms.mergesort import identity, mergesort
+from data_structures.referential_array import ArrayR
+from data_structures.serialization import StructureWriter, StructureReader
+
+# Default memory budget for the records of a chunk, in bytes.
+DEFAULT_MEMORY_BUDGET = 64 * 2 ** 20
+# Estimate of the memory taken by each record of a chunk on top of the record itself: the
+# references to it from the chunk, the ArrayR and the lists of mergesort, and its key.
+RECORD_OVERHEAD = 64
+# Default number of runs merged at once.
+DEFAULT_FAN_IN = 64
+# Name of a sorted run in a temporary file, see data_structures.serialization.
+RUN_NAME = "SortedRun"
+
+
+def read_lines(path: str | os.PathLike) -> Iterator[str]:
+    """
+    Reads the lines of a text file one at a time, without their line endings.
+
+    complexity:
+    O(1) per line, plus the length of the line.
+    """
+    with open(path) as fp:
+        for line in fp:
+            yield line.rstrip("\n")
+
+
+def sorted_chunks(records: Iterable, key=identity, memory_budget: int = DEFAULT_MEMORY_BUDGET) -> Iterator[tuple]:
+    """
+    Reads the records into chunks, each holding as many records as fit in memory_budget bytes
+    (estimated with sys.getsizeof plus RECORD_OVERHEAD per record, and at least one record),
+    and yields each chunk sorted with mergesort, as a list.
+    With a key, the chunk is decorated as in mergesort, and the list holds the sorted
+    (key, record) pairs, so the key of each record is computed once.
+    One record is read ahead, to tell whether a chunk is the last one.
+
+    returns:
+    A generator of (chunk, last) pairs, where last is True for the last chunk.
+
+    complexity:
+    O(ClogC) per chunk, where C is the number of records in the chunk.
+    """
+    end = object()
+    records = iter(records)
+    record = next(records, end)
+    while record is not end:
+        chunk = []
+        used = 0
+        while record is not end and used < memory_budget:
+            chunk.append(record)
+            used += sys.getsizeof(record) + RECORD_OVERHEAD
+            record = next(records, end)
+        if key is identity:
+            yield mergesort(ArrayR.from_list(chunk)).to_list(), record is end
+        else:
+            decorated = mergesort(ArrayR.from_list([(key(item), i) for i, item in enumerate(chunk)]))
+            yield [(item_key, chunk[i]) for item_key, i in decorated], record is end
+
+
+def write_run(records: Iterable, temp_dir: str | None = None) -> BinaryIO:
+    """
+    Writes sorted records to a new temporary file, which is deleted when it is closed.
+
+    returns:
+    The file, positioned at its start.
+
+    complexity:
+    O(N) where N is the number of records.
+    """
+    fp = tempfile.TemporaryFile(dir=temp_dir)
+    try:
+        writer = StructureWriter(fp, RUN_NAME)
+        for record in records:
+            writer.write(record)
+        writer.close()
+        fp.seek(0)
+    except BaseException:
+        fp.close()
+        raise
+    return fp
+
+
+def read_run(fp: BinaryIO, count: int) -> Iterator[Any]:
+    """
+    Reads back the count records of a run written by write_run, one at a time
+    (the records are unpickled in batches, see data_structures.serialization).
+
+    complexity:
+    O(1) amortised per record.
+    """
+    reader = StructureReader(fp, RUN_NAME)
+    for _ in range(count):
+        yield reader.read()
+    reader.close()
+
+
+def merge_streams(streams: list, keyed: bool = False) -> Iterator[Any]:
+    """
+    Merges sorted streams of records with a heap, keeping equal records of earlier streams first.
+    If keyed is True, the streams hold (key, record) pairs, as written by sorted_chunks,
+    which are merged on their stored keys only, so the records are never compared.
+
+    complexity:
+    O(Nlog k) where N is the total number of records and k is the number of streams.
+    """
+    return heapq.merge(*streams, key=itemgetter(0) if keyed else None)
+
+
+def external_sort(records: Iterable | str | os.PathLike, key=identity, memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                  temp_dir: str | None = None, fan_in: int = DEFAULT_FAN_IN) -> Iterator[Any]:
+    """
+    Sorts records that may not fit in memory, see the module documentation.
+    records can be any iterable, or the path of a text file, whose lines (without their line
+    endings) are sorted. The temporary files are created in temp_dir (by default the system's
+    temporary directory), and are deleted once the result is read, or closed.
+
+    returns:
+    A generator of the records in sorted order, the same as mergesort(records, key).
+
+    raises:
+    ValueError if memory_budget is not positive, or fan_in is less than 2.
+
+    complexity:
+    O(NlogN) where N is the number of records, with O(N) reads and writes of each record
+    per merge pass (one, unless there are more than fan_in runs).
+    """
+    if memory_budget <= 0:
+        raise ValueError("The memory budget should be positive.")
+    if fan_in < 2:
+        raise ValueError("At least 2 runs should be merged at once.")
+    if isinstance(records, (str, os.PathLike)):
+        records = read_lines(records)
+    return external_sort_runs(records, key, memory_budget, temp_dir, fan_in)
+
+
+def external_sort_runs(records: Iterable, key, memory_budget: int, temp_dir: str | None,
+                       fan_in: int) -> Iterator[Any]:
+    """
+    The generator returned by external_sort.
+    Runs are kept as (file, number of records) pairs, in the order of the records they came
+    from, and merged in consecutive groups, so equal records keep their input order.
+    If the records fit in a single chunk, nothing is written to disk.
+    """
+    keyed = key is not identity
+    runs = []
+    # The runs written by the current merge pass, closed with the others if the pass fails
+    merged = []
+    try:
+        for chunk, last in sorted_chunks(records, key, memory_budget):
+            if last and not runs:
+                yield from (record for _, record in chunk) if keyed else chunk
+                return
+            runs.append((write_run(chunk, temp_dir), len(chunk)))
+            # Free the chunk before the next one is read
+            del chunk
+
+        while len(runs) > fan_in:
+            for start in range(0, len(runs), fan_in):
+                group = runs[start:start + fan_in]
+                merged_fp = write_run(merge_streams([read_run(fp, count) for fp, count in group], keyed), temp_dir)
+                merged.append((merged_fp, sum(count for _, count in group)))
+                for group_fp, _ in group:
+                    group_fp.close()
+            runs, merged = merged, []
+
+        result = merge_streams([read_run(fp, count) for fp, count in runs], keyed)
+        yield from (record for _, record in result) if keyed else result
+    finally:
+        for fp, _ in runs + merged:
+            fp.close()
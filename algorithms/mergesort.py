@@ -1,15 +1,42 @@
 from __future__ import annotations
-from data_structures.referential_array import ArrayR
+from data_structures.referential_array import ArrayR, ArrayRView
+from data_structures.typed_array import TypedArray
 from data_structures.array_list import ArrayList
+from data_structures.numpy_backend import numpy, as_numpy, from_numpy, same_type
 from typing import TypeVar
 
 T = TypeVar("T")
 
-# We are defining a type, and we are saying it can be either an ArrayList or an ArrayR.
-ListOrArray = TypeVar("ListOrArray", ArrayList[T], ArrayR[T])
+# We are defining a type, and we are saying it can be either an ArrayList or an array
+# (an ArrayR, a typed array or a view of one).
+ListOrArray = TypeVar("ListOrArray", ArrayList[T], ArrayR[T], TypedArray[T], ArrayRView[T])
 
 
-def merge(list1: ListOrArray, list2: ListOrArray, key=lambda x: x) -> ListOrArray:
+def identity(x: T) -> T:
+    """ Default key, which orders the items by their own value. """
+    return x
+
+
+def array_type_of(my_list: ListOrArray) -> type:
+    """ The type of an array, or of the array a view is of or an ArrayList stores its items in. """
+    if isinstance(my_list, ArrayList):
+        my_list = my_list.view()
+    return type(my_list.base) if isinstance(my_list, ArrayRView) else type(my_list)
+
+
+def new_from_numpy(my_list: ListOrArray, values: numpy.ndarray) -> ListOrArray:
+    """
+    Returns a new list of the same type as my_list, a typed array (or a view of one) or an
+    ArrayList holding one, with a copy of the values of a NumPy array.
+
+    complexity:
+    O(N) where N is the number of values.
+    """
+    result = from_numpy(values, array_type_of(my_list))
+    return new_like(my_list, result) if isinstance(my_list, ArrayList) else result
+
+
+def merge(list1: ListOrArray, list2: ListOrArray, key=identity) -> ListOrArray:
     """
     Merges two sorted lists into one larger sorted list,
     containing all elements from the smaller lists.
@@ -18,20 +45,43 @@ def merge(list1: ListOrArray, list2: ListOrArray, key=lambda x: x) -> ListOrArra
 
     returns:
     The sorted list in the same type as the input lists.
-    If both lists are of type ArrayR, the result will be an ArrayR.
+    If both lists are of type ArrayR (or views of one), the result will be an ArrayR,
+    and likewise for the typed arrays of data_structures.typed_array.
     If both lists are of type ArrayList, the result will be an ArrayList.
 
     pre:
     Both l1 and l2 are sorted, and contain comparable elements.
 
+    Typed arrays (or ArrayLists holding them) ordered by their own value are merged by NumPy
+    when it is installed
+    (see data_structures.numpy_backend).
+
+    The key of each item is computed once (key is not called at all when it is identity).
+
     complexity:
     Best/Worst Case: O(n), n = len(l1)+len(l2).
     """
+    if key is identity and same_type(list1, list2):
+        values1 = as_numpy(list1)
+        if values1 is not None:
+            # A stable sort finds the two sorted runs and merges them, keeping list1 first on ties.
+            merged = numpy.sort(numpy.concatenate((values1, as_numpy(list2))), kind='stable')
+            return new_from_numpy(list1, merged)
+
+    if key is identity:
+        # The items are their own keys, so compare them without calling key
+        keys1 = list1
+        keys2 = list2
+    else:
+        # Compute the key of each item once, rather than at every comparison
+        keys1 = [key(list1[i]) for i in range(len(list1))]
+        keys2 = [key(list2[i]) for i in range(len(list2))]
+
     new_list = []
     cur_left = 0
     cur_right = 0
     while cur_left < len(list1) and cur_right < len(list2):
-        if key(list1[cur_left]) <= key(list2[cur_right]):
+        if keys1[cur_left] <= keys2[cur_right]:
             new_list.append(list1[cur_left])
             cur_left += 1
         else:
@@ -44,67 +94,236 @@ def merge(list1: ListOrArray, list2: ListOrArray, key=lambda x: x) -> ListOrArra
     for i in range(cur_right, len(list2)):
         new_list.append(list2[i])
     
-    # Create the result list based on the type of the input lists
-    # If it's an ArrayR, we can create it directly from the list
-    # If it's an ArrayList, we need to append the elements
-    if isinstance(list1, ArrayR):
-        return ArrayR.from_list(new_list)
-    elif isinstance(list1, ArrayList):
-        result = ArrayList(len(new_list))
-        for i in range(len(new_list)):
-            result.append(new_list[i])
+    return new_like(list1, new_list)
+
+
+def new_like(my_list: ListOrArray, items: list) -> ListOrArray:
+    """
+    Returns a new list of the same type as my_list holding items.
+    If my_list is an ArrayR or a typed array (or a view of one), the result is an array of that
+    type, which can be created directly from the items.
+    If my_list is an ArrayList, the result is an ArrayList with the same type of array, and we
+    need to append the items.
+
+    complexity:
+    O(N) where N is the number of items.
+    """
+    if isinstance(my_list, (ArrayR, TypedArray, ArrayRView)):
+        return array_type_of(my_list).from_list(items)
+    elif isinstance(my_list, ArrayList):
+        result = ArrayList(len(items), type(my_list.view().base))
+        for i in range(len(items)):
+            result.append(items[i])
         return result
     else:
-        raise TypeError("Unsupported type for list1 and list2. Must be ArrayR or ArrayList.")
+        raise TypeError("Unsupported type for my_list. Must be an array or ArrayList.")
 
 
-def mergesort(my_list: ListOrArray, key=lambda x: x) -> ListOrArray:
+def mergesort(my_list: ListOrArray, key=identity) -> ListOrArray:
     """
     Sort a list using the mergesort operation.
+    Typed arrays (or ArrayLists holding them) ordered by their own value are sorted by NumPy
+    (with a stable sort) when it is installed, see data_structures.numpy_backend.
+
+    With a key, the list is decorated first: the (key, position) pair of each item is
+    computed once and the pairs are sorted (positions are unique, so the items themselves
+    are never compared), then the items are taken in the order of the sorted pairs.
+    So key is called N times, rather than at every comparison of every level.
 
     complexity:
     Best/Worst Case: O(NlogN) where N is the length of the list.
 
     Return type is the same as the input type.
-    If the input is an ArrayR, the output will be an ArrayR.
+    If the input is an ArrayR, the output will be an ArrayR (or a typed array of the same type).
     If the input is an ArrayList, the output will be an ArrayList.
     """
     if len(my_list) <= 1:
         return my_list
+
+    if key is not identity:
+        decorated = ArrayR.from_list([(key(my_list[i]), i) for i in range(len(my_list))])
+        return new_like(my_list, [my_list[i] for _, i in mergesort(decorated)])
+
+    values = as_numpy(my_list)
+    if values is not None:
+        return new_from_numpy(my_list, numpy.sort(values, kind='stable'))
     
     # Split the list into two halves
     break_index = (len(my_list)+1) // 2
     
-    # Create two new lists to hold the two halves. Create them
-    # with the same type as the original list
-    if isinstance(my_list, ArrayR):
-        left_half = ArrayR(break_index)
-        right_half = ArrayR(len(my_list) - break_index)
-    elif isinstance(my_list, ArrayList):
-        left_half = ArrayList(break_index)
-        right_half = ArrayList(len(my_list) - break_index)
-    else:
-        raise TypeError("Unsupported type for my_list. Must be ArrayR or ArrayList.")
-    
-    # Now fill the two halves with the elements from the original list
-    # If it's an ArrayR, we can set the elements directly
+    # Create two new lists holding the two halves, with the same type as the original list
+    # If it's an array, each half is a view of it, so nothing is copied
     # If it's an ArrayList, we need to append the elements
-    
-    # Left half
-    for i in range(break_index):
-        if isinstance(left_half, ArrayR):
-            left_half[i] = my_list[i]
-        else:
+    if isinstance(my_list, (ArrayR, TypedArray, ArrayRView)):
+        left_half = my_list.view(0, break_index)
+        right_half = my_list.view(break_index)
+    elif isinstance(my_list, ArrayList):
+        array_type = type(my_list.view().base)
+        left_half = ArrayList(break_index, array_type)
+        right_half = ArrayList(len(my_list) - break_index, array_type)
+        for i in range(break_index):
             left_half.append(my_list[i])
-    
-    # Right half
-    for i in range(break_index, len(my_list)):
-        if isinstance(right_half, ArrayR):
-            right_half[i - break_index] = my_list[i]
-        else:
+        for i in range(break_index, len(my_list)):
             right_half.append(my_list[i])
+    else:
+        raise TypeError("Unsupported type for my_list. Must be an array or ArrayList.")
     
     # Recursively sort the two halves and merge them
-    list1 = mergesort(left_half, key)
-    list2 = mergesort(right_half, key)
-    return merge(list1, list2, key)
+    list1 = mergesort(left_half)
+    list2 = mergesort(right_half)
+    return merge(list1, list2)
+
+
+def merge_runs(source: list, lo: int, mid: int, hi: int, target: list, start: int) -> None:
+    """
+    Merges the sorted runs source[lo:mid] and source[mid:hi] into target[start:start + hi - lo].
+    The items are compared directly (sort_items decorates them with their keys).
+
+    pre:
+    Both runs are non-empty and sorted, and the target range does not overlap them.
+
+    complexity:
+    Best Case: O(n), when the runs are already in order, which is a single block copy.
+    Worst Case: O(n), n = hi - lo, comparisons.
+    """
+    left = source[mid - 1]
+    right = source[mid]
+    if left <= right:
+        target[start:start + hi - lo] = source[lo:hi]
+        return
+
+    i = lo
+    j = mid
+    left = source[i]
+    while True:
+        if left <= right:
+            target[start] = left
+            start += 1
+            i += 1
+            if i == mid:
+                break
+            left = source[i]
+        else:
+            target[start] = right
+            start += 1
+            j += 1
+            if j == hi:
+                break
+            right = source[j]
+
+    # One run is used up, copy the rest of the other in one block
+    if i < mid:
+        target[start:start + mid - i] = source[i:mid]
+    else:
+        target[start:start + hi - j] = source[j:hi]
+
+
+def decorated_sort(items: list, sort_list, key=identity) -> list:
+    """
+    Sorts a Python list with sort_list(items), which sorts a Python list in place.
+    With a key, the list is decorated as for mergesort: sort_list sorts the (key, position)
+    pairs of the items, so key is called once per item and sort_list never calls it.
+
+    returns:
+    The sorted list, which is items itself when key is identity.
+
+    complexity:
+    O(N) on top of sort_list, where N is the length of the list.
+    """
+    if key is identity:
+        sort_list(items)
+        return items
+    decorated = [(key(item), i) for i, item in enumerate(items)]
+    sort_list(decorated)
+    return [items[i] for _, i in decorated]
+
+
+def sort_items(my_list: ListOrArray, sort_list, key=identity, in_place: bool = False) -> ListOrArray | None:
+    """
+    Sorts the items of my_list with sort_list(items), which sorts a Python list in place.
+    Used by the sorts that work on a list of the items, like bottom_up_mergesort: writing to an
+    ArrayR one item at a time is slow (ctypes keeps a reference to each stored object), so the
+    items are read into a list and written back with one block copy each.
+    The list is sorted with decorated_sort, so key is called once per item.
+    Typed arrays ordered by their own value are sorted by NumPy (with a stable sort) instead
+    when it is installed, see data_structures.numpy_backend.
+
+    If in_place is True, the items of my_list (an array, a view of one or an ArrayList) are
+    sorted where they are and None is returned. Otherwise my_list is unchanged and the result
+    is a new list of the same type as the input, as for mergesort.
+
+    complexity:
+    O(N) on top of sort_list, where N is the length of the list.
+    """
+    if isinstance(my_list, ArrayList):
+        items = my_list.view()
+        if not in_place:
+            result = ArrayList(len(my_list), type(items.base))
+            for item in items:
+                result.append(item)
+            sort_items(result, sort_list, key, True)
+            return result
+    elif isinstance(my_list, (ArrayR, TypedArray, ArrayRView)):
+        if in_place:
+            items = my_list
+        else:
+            items = my_list.copy() if isinstance(my_list, ArrayRView) else my_list[:]
+    else:
+        raise TypeError("Unsupported type for my_list. Must be an array or ArrayList.")
+
+    values = as_numpy(items) if key is identity else None
+    if values is not None:
+        values[:] = numpy.sort(values, kind='stable')
+    elif len(items) > 1:
+        items[0:len(items)] = decorated_sort(items.to_list(), sort_list, key)
+
+    return None if in_place else items
+
+
+def bottom_up_sort_list(items: list) -> None:
+    """
+    Sorts a Python list in place with a bottom-up mergesort, see bottom_up_mergesort.
+    The items are compared directly (sort_items decorates them with their keys).
+
+    complexity:
+    Best Case: O(N) comparisons, when the list is already sorted, as every merge is a block copy.
+    Worst Case: O(NlogN) where N is the length of the list.
+    """
+    length = len(items)
+    source = items
+    target = [None] * length
+    width = 1
+    while width < length:
+        for lo in range(0, length, 2 * width):
+            mid = min(lo + width, length)
+            hi = min(lo + 2 * width, length)
+            if mid == hi:
+                # A run with no partner, carried over to the next pass
+                target[lo:hi] = source[lo:hi]
+            else:
+                merge_runs(source, lo, mid, hi, target, lo)
+        source, target = target, source
+        width *= 2
+    if source is not items:
+        items[:] = source
+
+
+def bottom_up_mergesort(my_list: ListOrArray, key=identity, in_place: bool = False) -> ListOrArray | None:
+    """
+    Sort a list using an iterative, bottom-up mergesort.
+    The first pass merges pairs of items, the next pairs of runs of 2, then of 4, and so on.
+    Each pass merges from a list of the items into a single auxiliary list of the same length,
+    or back, so sorting N items allocates two lists of N positions (and the result, unless
+    in_place), rather than new arrays at every level like mergesort. The sort is stable.
+    Typed arrays ordered by their own value are sorted by NumPy when it is installed,
+    see data_structures.numpy_backend.
+
+    If in_place is True, the items of my_list (an array, a view of one or an ArrayList) are
+    sorted where they are and None is returned. Otherwise my_list is unchanged and the result
+    is a new list of the same type as the input, as for mergesort.
+
+    complexity:
+    Best Case: O(N) comparisons, when the list is already sorted, as every merge is a block copy.
+    Worst Case: O(NlogN) where N is the length of the list.
+    """
+    return sort_items(my_list, bottom_up_sort_list, key, in_place)
@@ -0,0 +1,169 @@
+"""
+A mergesort that sorts chunks of the list in separate processes, to use more
+than one core, then merges the sorted chunks.
+
+The list is split into one chunk per worker, each chunk is sorted in a
+process of a ProcessPoolExecutor with the bottom-up mergesort, and the
+sorted chunks are combined with a k-way merge (heapq.merge), which keeps
+equal items of earlier chunks first. As every step is stable, the result is
+the same as the one of mergesort. With a key, the workers compute the key of
+each item once and send back the sorted (key, position) pairs of their
+chunk, which the merge compares, so key is never called in this process.
+
+Sending items to another process means pickling them. The values of a typed
+array (see data_structures.typed_array) are copied once into a block of
+shared memory (multiprocessing.shared_memory) instead, and each worker sorts
+its chunk where it is, so only the name of the block and the bounds of the
+chunk are sent. The items of an ArrayR, which can be any objects, are sent
+as one pickled list per chunk.
+
+The key is sent to the workers too, so it must be picklable: a function
+defined at the top level of a module, rather than a lambda.
+"""
+from __future__ import annotations
+
+import heapq
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+from algorithms.mergesort import ListOrArray, identity, new_like, bottom_up_sort_list, bottom_up_mergesort
+from data_structures.referential_array import ArrayR, ArrayRView
+from data_structures.typed_array import TypedArray
+from data_structures.array_list import ArrayList
+from data_structures.numpy_backend import as_numpy
+
+# Lists shorter than this are sorted in this process, as starting the workers would take longer.
+PARALLEL_THRESHOLD = 10_000
+
+
+def sort_chunk(items: list, key=identity, start: int = 0) -> list:
+    """
+    Sorts a chunk of items sent to a worker, whose first item is in position start of the
+    whole list, and returns it to be sent back.
+    With a key, the chunk is decorated as in mergesort.decorated_sort, and the sorted
+    (key, position) pairs are returned rather than the items, so the key of each item is
+    computed once, here, and the final merge compares the keys without calling key again.
+
+    returns:
+    The sorted items if key is identity, otherwise the sorted (key, position in the whole list)
+    pairs of the items.
+
+    complexity:
+    O(NlogN) where N is the length of the chunk.
+    """
+    if key is identity:
+        bottom_up_sort_list(items)
+        return items
+    decorated = [(key(item), start + i) for i, item in enumerate(items)]
+    bottom_up_sort_list(decorated)
+    return decorated
+
+
+def sort_shared_chunk(name: str, typecode: str, lo: int, hi: int, key=identity) -> list | None:
+    """
+    Sorts positions lo to hi - 1 of the values in the block of shared memory called name,
+    which hold values of the array.array type typecode, where they are.
+
+    returns:
+    None if key is identity, otherwise the keys of the sorted values, in order.
+
+    complexity:
+    O(NlogN) where N = hi - lo.
+    """
+    memory = SharedMemory(name)
+    try:
+        with memory.buf.cast(typecode) as values:
+            chunk = values[lo:hi].tolist()
+            result = sort_chunk(chunk, key, lo)
+            if key is identity:
+                values[lo:hi] = array(typecode, result)
+                return None
+            values[lo:hi] = array(typecode, [chunk[position - lo] for _, position in result])
+            return [chunk_key for chunk_key, _ in result]
+    finally:
+        memory.close()
+
+
+def chunk_bounds(length: int, chunks: int) -> list:
+    """ The (lo, hi) bounds of chunks of positions from 0 to length - 1, of nearly equal lengths. """
+    return [(length * i // chunks, length * (i + 1) // chunks) for i in range(chunks)]
+
+
+def sort_shared(items: TypedArray | ArrayRView, bounds: list, key, workers: int) -> TypedArray:
+    """
+    Sorts the values of a typed array (or a view of one) in chunks with the given bounds,
+    in shared memory, see the module documentation.
+    The sorted chunks are merged straight from the shared memory into the result: with a key,
+    by merging the (key, position) pairs of the values, with the keys sent back by the workers.
+
+    returns:
+    A new typed array of the same type, holding the sorted values.
+
+    complexity:
+    O((N/W)log(N/W)) in each of the W workers, then O(Nlog W) to merge, where N is the number
+    of values.
+    """
+    base = items.base if isinstance(items, ArrayRView) else items
+    start = items.start if isinstance(items, ArrayRView) else 0
+    storage = base.array
+    size = len(items) * storage.itemsize
+    memory = SharedMemory(create=True, size=max(1, size))
+    try:
+        memory.buf[:size] = storage[start:start + len(items)].tobytes()
+        with ProcessPoolExecutor(workers) as executor:
+            futures = [executor.submit(sort_shared_chunk, memory.name, storage.typecode, lo, hi, key)
+                       for lo, hi in bounds]
+            chunk_keys = [future.result() for future in futures]
+        with memory.buf.cast(storage.typecode) as values:
+            if key is identity:
+                merged = heapq.merge(*[values[lo:hi] for lo, hi in bounds])
+            else:
+                pairs = heapq.merge(*[zip(keys, range(lo, hi)) for keys, (lo, hi) in zip(chunk_keys, bounds)])
+                merged = (values[position] for _, position in pairs)
+            return type(base).from_list(merged)
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def parallel_mergesort(my_list: ListOrArray, key=identity, workers: int | None = None) -> ListOrArray:
+    """
+    Sort a list with mergesort, using workers processes (by default one per core),
+    see the module documentation.
+    The result is the same as mergesort(my_list, key), and of the same type as the input.
+    Lists shorter than PARALLEL_THRESHOLD, and typed arrays ordered by their own value
+    when NumPy is installed, are sorted by bottom_up_mergesort in this process.
+
+    complexity:
+    Best/Worst Case: O((N/W)log(N/W)) in each of the W workers, then O(Nlog W) to merge,
+    where N is the length of the list.
+    """
+    if isinstance(my_list, ArrayList):
+        items = my_list.view()
+    elif isinstance(my_list, (ArrayR, TypedArray, ArrayRView)):
+        items = my_list
+    else:
+        raise TypeError("Unsupported type for my_list. Must be an array or ArrayList.")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("There should be at least 1 worker.")
+    if len(items) < PARALLEL_THRESHOLD or workers == 1 or (key is identity and as_numpy(items) is not None):
+        return bottom_up_mergesort(my_list, key)
+
+    bounds = chunk_bounds(len(items), workers)
+    base = items.base if isinstance(items, ArrayRView) else items
+    if isinstance(base, TypedArray):
+        result = sort_shared(items, bounds, key, workers)
+        return new_like(my_list, result) if isinstance(my_list, ArrayList) else result
+
+    python_list = items.to_list()
+    with ProcessPoolExecutor(workers) as executor:
+        chunks = list(executor.map(sort_chunk, [python_list[lo:hi] for lo, hi in bounds], [key] * workers,
+                                   [lo for lo, _ in bounds]))
+    if key is identity:
+        return new_like(my_list, list(heapq.merge(*chunks)))
+    # The pairs hold the keys computed by the workers, so key is not called again here
+    return new_like(my_list, [python_list[position] for _, position in heapq.merge(*chunks)])
@@ -0,0 +1,307 @@
+"""
+An adaptive, natural-run mergesort in the style of Timsort (the sort used by
+Python's list.sort), for data that is often nearly sorted.
+
+Rather than splitting the list in halves, the sort scans it for runs that are
+already in order: ascending, or strictly descending (which are reversed in
+place, keeping the sort stable). Runs shorter than a minimum length (between
+32 and 64, chosen so the number of runs is close to a power of 2) are extended
+with a binary insertion sort. Each run is pushed on a stack of pending runs,
+which are merged as soon as their lengths stop shrinking quickly enough down
+the stack, so every merge combines runs of similar lengths.
+
+When merging, if one run keeps winning the comparisons, the merge switches to
+galloping: an exponential search for where the next item of the other run
+goes, and a block copy of all the items before it. A list that is already
+sorted is a single run, found with N - 1 comparisons.
+"""
+from __future__ import annotations
+
+from algorithms.mergesort import ListOrArray, identity, sort_items
+
+# Number of consecutive wins by the same run before a merge starts galloping.
+MIN_GALLOP = 7
+
+
+def min_run_length(n: int) -> int:
+    """
+    Minimum length of a run for a list of n items: n itself if it is under 64,
+    otherwise a length between 32 and 64 such that n / length is a power of 2,
+    or just under one.
+
+    complexity:
+    O(log n)
+    """
+    extra = 0
+    while n >= 64:
+        extra |= n & 1
+        n >>= 1
+    return n + extra
+
+
+def count_run(items: list, lo: int, hi: int) -> int:
+    """
+    Returns the end of the run starting at lo in items[lo:hi], which is either
+    ascending or strictly descending. A descending run is reversed, so the
+    run is ascending afterwards; as it is strictly descending no equal items
+    swap places.
+
+    complexity:
+    O(n) where n is the length of the run
+    """
+    run_hi = lo + 1
+    if run_hi == hi:
+        return hi
+    if items[run_hi] < items[lo]:
+        run_hi += 1
+        while run_hi < hi and items[run_hi] < items[run_hi - 1]:
+            run_hi += 1
+        items[lo:run_hi] = items[lo:run_hi][::-1]
+    else:
+        run_hi += 1
+        while run_hi < hi and not items[run_hi] < items[run_hi - 1]:
+            run_hi += 1
+    return run_hi
+
+
+def binary_insertion_sort(items: list, lo: int, hi: int, start: int) -> None:
+    """
+    Sorts items[lo:hi], of which items[lo:start] is already sorted, by finding
+    the position of each following item with a binary search, after any equal
+    items, and shifting the items after that position in one block copy.
+
+    complexity:
+    O(n log n) comparisons and O(n^2) moves, where n = hi - lo, which is fast
+    for the short runs it is used for.
+    """
+    for i in range(start, hi):
+        item = items[i]
+        left = lo
+        right = i
+        while left < right:
+            mid = (left + right) // 2
+            if item < items[mid]:
+                right = mid
+            else:
+                left = mid + 1
+        items[left + 1:i + 1] = items[left:i]
+        items[left] = item
+
+
+def gallop(items: list, value, lo: int, hi: int, hint: int, after_equal: bool = False) -> int:
+    """
+    Returns the position where value goes in the sorted items[lo:hi]:
+    before any equal items, or after them if after_equal is True.
+    The search starts at hint, and checks positions 1, 3, 7, 15, ... away
+    from it before a binary search between the last two, so it is faster the
+    closer the answer is to hint.
+
+    complexity:
+    O(log d) comparisons, where d is the distance of the answer from hint
+    """
+    def before(position: int) -> bool:
+        """ True if the item in position goes before the value. """
+        return items[position] <= value if after_equal else items[position] < value
+
+    if before(hint):
+        # Search to the right of hint
+        last = hint
+        offset = 1
+        while hint + offset < hi and before(hint + offset):
+            last = hint + offset
+            offset = 2 * offset + 1
+        left = last + 1
+        right = min(hint + offset, hi)
+    else:
+        # Search to the left of hint
+        last = hint
+        offset = 1
+        while hint - offset >= lo and not before(hint - offset):
+            last = hint - offset
+            offset = 2 * offset + 1
+        left = max(hint - offset + 1, lo)
+        right = last
+
+    while left < right:
+        mid = (left + right) // 2
+        if before(mid):
+            left = mid + 1
+        else:
+            right = mid
+    return left
+
+
+def merge_runs(items: list, lo: int, mid: int, hi: int, min_gallop: int) -> int:
+    """
+    Merges the adjacent sorted runs items[lo:mid] and items[mid:hi] in place,
+    keeping equal items of the first run before those of the second.
+    The items of the first run that are already in place, at its start, and
+    those of the second run, at its end, are skipped with a gallop. The rest
+    of the first run is copied to a temporary list, and merged with the
+    second one into the positions from lo.
+    min_gallop is the number of consecutive wins by one run after which the
+    merge starts galloping. It goes down while galloping pays off, and up when
+    it does not.
+
+    returns:
+    the min_gallop to use for the next merge
+
+    complexity:
+    O(n) where n = hi - lo, O(log n) if the runs are already in order
+    """
+    lo = gallop(items, items[mid], lo, mid, lo, after_equal=True)
+    if lo == mid:
+        return min_gallop
+    hi = gallop(items, items[mid - 1], mid, hi, hi - 1)
+
+    first = items[lo:mid]
+    first_length = len(first)
+    i = 0
+    j = mid
+    dest = lo
+    while True:
+        # Take one item at a time, counting the consecutive wins by each run
+        first_wins = 0
+        second_wins = 0
+        while first_wins < min_gallop and second_wins < min_gallop:
+            if items[j] < first[i]:
+                items[dest] = items[j]
+                dest += 1
+                j += 1
+                second_wins += 1
+                first_wins = 0
+                if j == hi:
+                    items[dest:hi] = first[i:]
+                    return min_gallop
+            else:
+                items[dest] = first[i]
+                dest += 1
+                i += 1
+                first_wins += 1
+                second_wins = 0
+                if i == first_length:
+                    return min_gallop
+
+        i, j, dest, min_gallop = gallop_merge(items, first, i, j, dest, hi, min_gallop)
+        if i == first_length:
+            return min_gallop
+
+
+def gallop_merge(items: list, first: list, i: int, j: int, dest: int, hi: int, min_gallop: int) -> tuple:
+    """
+    The galloping phase of merge_runs, which merges first[i:] (the rest of the first run)
+    and items[j:hi] (the rest of the second run) into the positions from dest.
+    It gallops, copying the items of each run that go before the next item of the other
+    in one block, until neither run wins MIN_GALLOP times in a row, or a run is used up.
+
+    returns:
+    the new (i, j, dest, min_gallop), where i == len(first) if the merge is finished
+
+    complexity:
+    O(n) where n is the number of items merged, O(log n) comparisons per block
+    """
+    first_length = len(first)
+    while True:
+        count = gallop(first, items[j], i, first_length, i, after_equal=True) - i
+        items[dest:dest + count] = first[i:i + count]
+        dest += count
+        i += count
+        if i == first_length:
+            return i, j, dest, min_gallop
+        items[dest] = items[j]
+        dest += 1
+        j += 1
+        if j == hi:
+            items[dest:hi] = first[i:]
+            return first_length, j, hi, min_gallop
+
+        second_count = gallop(items, first[i], j, hi, j) - j
+        items[dest:dest + second_count] = items[j:j + second_count]
+        dest += second_count
+        j += second_count
+        if j == hi:
+            items[dest:hi] = first[i:]
+            return first_length, j, hi, min_gallop
+        items[dest] = first[i]
+        dest += 1
+        i += 1
+        if i == first_length:
+            return i, j, dest, min_gallop
+
+        if count < MIN_GALLOP and second_count < MIN_GALLOP:
+            return i, j, dest, min_gallop + 1
+        min_gallop = max(1, min_gallop - 1)
+
+
+def timsort_list(items: list) -> None:
+    """
+    Sorts a Python list in place with an adaptive mergesort, see the module documentation.
+    The items are compared directly (sort_items decorates them with their keys).
+    The pending runs are kept on a stack of (start, length) pairs such that, from the top,
+    each run is longer than the one above it and than the two above it together,
+    so the stack holds O(log N) runs.
+
+    complexity:
+    Best Case: O(N), when the list is already sorted (or in reverse order).
+    Worst Case: O(NlogN) where N is the length of the list.
+    """
+    length = len(items)
+    min_run = min_run_length(length)
+    min_gallop = MIN_GALLOP
+    runs = []
+
+    def merge_at(index: int) -> None:
+        """ Merges the runs at index and index + 1 of the stack. """
+        nonlocal min_gallop
+        start, first_length = runs[index]
+        second_length = runs[index + 1][1]
+        min_gallop = merge_runs(items, start, start + first_length, start + first_length + second_length,
+                                min_gallop)
+        runs[index] = (start, first_length + second_length)
+        del runs[index + 1]
+
+    lo = 0
+    while lo < length:
+        run_hi = count_run(items, lo, length)
+        if run_hi - lo < min_run:
+            forced_hi = min(lo + min_run, length)
+            binary_insertion_sort(items, lo, forced_hi, run_hi)
+            run_hi = forced_hi
+        runs.append((lo, run_hi - lo))
+        lo = run_hi
+
+        # Restore the invariants of the stack
+        while len(runs) > 1:
+            n = len(runs) - 2
+            if (n > 0 and runs[n - 1][1] <= runs[n][1] + runs[n + 1][1]) or \
+                    (n > 1 and runs[n - 2][1] <= runs[n - 1][1] + runs[n][1]):
+                if runs[n - 1][1] < runs[n + 1][1]:
+                    n -= 1
+            elif runs[n][1] > runs[n + 1][1]:
+                break
+            merge_at(n)
+
+    while len(runs) > 1:
+        n = len(runs) - 2
+        if n > 0 and runs[n - 1][1] < runs[n + 1][1]:
+            n -= 1
+        merge_at(n)
+
+
+def timsort(my_list: ListOrArray, key=identity, in_place: bool = False) -> ListOrArray | None:
+    """
+    Sort a list using an adaptive, natural-run mergesort (see the module documentation).
+    The sort is stable, and orders the items by key(item), as mergesort does, calling
+    key once per item (see mergesort.sort_items).
+    Typed arrays ordered by their own value are sorted by NumPy when it is installed,
+    see data_structures.numpy_backend.
+
+    If in_place is True, the items of my_list (an array, a view of one or an ArrayList) are
+    sorted where they are and None is returned. Otherwise my_list is unchanged and the result
+    is a new list of the same type as the input, as for mergesort.
+
+    complexity:
+    Best Case: O(N), when the list is already sorted (or in reverse order).
+    Worst Case: O(NlogN) where N is the length of the list.
+    """
+    return sort_items(my_list, timsort_list, key, in_place)
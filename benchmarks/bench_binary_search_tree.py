@@ -0,0 +1,60 @@
+"""
+Per-operation latency of BinarySearchTree lookups, updates, inserts and deletes
+at the bottom of a degenerate (chain shaped) tree of a given depth.
+
+Run from the root of the repository with:
+
+```
+python -m benchmarks.bench_binary_search_tree
+```
+"""
+import sys
+import timeit
+
+from data_structures.binary_search_tree import BinarySearchTree
+from data_structures.node import BinaryNode
+
+DEPTHS = [10, 1_000, 100_000]
+
+
+def build_chain(depth: int) -> BinarySearchTree[int, int]:
+    """
+    Builds the tree that inserting 0, 1, ..., depth - 1 in order would produce,
+    linking the nodes directly so that setting up the benchmark is O(depth).
+    """
+    root = BinaryNode(0, 0, depth)
+    current = root
+    for i in range(1, depth):
+        current._right = BinaryNode(i, i, depth - i)
+        current = current._right
+    return BinarySearchTree.from_node(root, depth)
+
+
+def time_per_op(statement, number: int) -> float:
+    """ Best of 3 runs, in microseconds per operation. """
+    return min(timeit.repeat(statement, number=number, repeat=3)) / number * 1e6
+
+
+def main(depths=DEPTHS) -> None:
+    print(f"{'depth':>10} {'get (us)':>12} {'update (us)':>12} {'insert+delete (us)':>20}")
+    for depth in depths:
+        tree = build_chain(depth)
+        deepest = depth - 1
+        number = max(1, 100_000 // depth)
+
+        def get():
+            return tree[deepest]
+
+        def update():
+            tree[deepest] = deepest
+
+        def insert_delete():
+            tree[depth] = depth
+            del tree[depth]
+
+        print(f"{depth:>10} {time_per_op(get, number):>12.2f} {time_per_op(update, number):>12.2f} "
+              f"{time_per_op(insert_delete, number):>20.2f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEPTHS)
@@ -0,0 +1,284 @@
+"""
+Throughput of the hash tables under different workloads.
+
+Run from the root of the repository with:
+
+```
+python -m benchmarks.bench_hash_tables
+```
+"""
+import gc
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from data_structures.hash_table_linear_probing import LinearProbeTable
+from data_structures.hash_table_separate_chaining import HashTableSeparateChaining
+from data_structures.hash_table_ordered import OrderedHashTable
+from data_structures.hash_table_mmap import MmapLinearProbeTable
+from data_structures.hashing import polynomial_hash, string_hash
+
+
+def ops_per_second(operation, *args) -> float:
+    """ Runs operation(*args), which should return the number of operations it performed. """
+    start = time.perf_counter()
+    count = operation(*args)
+    return count / (time.perf_counter() - start)
+
+
+def delete_heavy(table, keys: list, rounds: int) -> int:
+    """
+    Cache-like churn: fill the table with all keys, then repeatedly evict a random
+    key and insert it back. Returns the number of operations performed.
+    """
+    for key in keys:
+        table[key] = key
+    rng = random.Random(1008)
+    for _ in range(rounds):
+        key = rng.choice(keys)
+        del table[key]
+        table[key] = key
+    return len(keys) + 2 * rounds
+
+
+def bench_deletion(sizes=(1_000, 10_000, 50_000)) -> None:
+    print("Delete-heavy workload (ops/sec)")
+    print(f"{'entries':>10} {'cluster rehash':>16} {'tombstones':>12}")
+    for size in sizes:
+        keys = [f"key-{i}" for i in range(size)]
+        rehash = ops_per_second(delete_heavy, LinearProbeTable(), keys, size)
+        tombstones = ops_per_second(delete_heavy, LinearProbeTable(tombstones=True), keys, size)
+        print(f"{size:>10} {rehash:>16,.0f} {tombstones:>12,.0f}")
+
+
+def insert_and_lookup(table, keys: list, missing: list) -> int:
+    """ Inserts all keys, then looks up every key and every missing key. """
+    for key in keys:
+        table[key] = key
+    for key in keys:
+        _ = table[key]
+    for key in missing:
+        _ = key in table
+    return 2 * len(keys) + len(missing)
+
+
+def bench_probing(size: int = 20_000) -> None:
+    print(f"Probe strategies, {size} entries")
+    print(f"{'strategy':>12} {'load factor':>12} {'slots/entry':>12} {'ops/sec':>10}")
+    keys = [f"key-{i}" for i in range(size)]
+    missing = [f"missing-{i}" for i in range(size)]
+    configurations = [
+        (LinearProbeTable.LINEAR_PROBING, 0.5),
+        (LinearProbeTable.QUADRATIC_PROBING, 0.5),
+        (LinearProbeTable.DOUBLE_HASHING, 0.5),
+        (LinearProbeTable.DOUBLE_HASHING, 0.9),
+        (LinearProbeTable.ROBIN_HOOD, 0.5),
+        (LinearProbeTable.ROBIN_HOOD, 0.9),
+    ]
+    for probe, load_factor in configurations:
+        table = LinearProbeTable(probe=probe, max_load_factor=load_factor)
+        speed = ops_per_second(insert_and_lookup, table, keys, missing)
+        print(f"{probe:>12} {load_factor:>12} {table.table_size / size:>12.2f} {speed:>10,.0f}")
+
+
+def hash_all(hasher, keys: list) -> int:
+    for key in keys:
+        hasher(key)
+    return len(keys)
+
+
+def lookup_all(table, keys: list) -> int:
+    for key in keys:
+        _ = table[key]
+    return len(keys)
+
+
+def bench_hashing(size: int = 10_000) -> None:
+    print(f"Hash functions and lookups, {size} keys (ops/sec)")
+    print(f"{'key length':>10} {'hasher':>16} {'hash':>12} {'probe get':>12} {'chaining get':>14}")
+    for length in [8, 100]:
+        keys = [str(i).rjust(length, "k") for i in range(size)]
+        for hasher in [polynomial_hash, string_hash]:
+            probe_table = LinearProbeTable(hasher=hasher)
+            chaining_table = HashTableSeparateChaining(2 * size + 1, hasher=hasher)
+            for key in keys:
+                probe_table[key] = key
+                chaining_table[key] = key
+            print(f"{length:>10} {hasher.__name__:>16} {ops_per_second(hash_all, hasher, keys):>12,.0f} "
+                  f"{ops_per_second(lookup_all, probe_table, keys):>12,.0f} "
+                  f"{ops_per_second(lookup_all, chaining_table, keys):>14,.0f}")
+
+
+def insert_update_lookup(table, keys: list) -> tuple:
+    """ Returns the insertions, updates and lookups per second when using every key once. """
+    start = time.perf_counter()
+    for key in keys:
+        table[key] = key
+    inserted = time.perf_counter()
+    for key in keys:
+        table[key] = None
+    updated = time.perf_counter()
+    for key in keys:
+        _ = table[key]
+    end = time.perf_counter()
+    return len(keys) / (inserted - start), len(keys) / (updated - inserted), len(keys) / (end - updated)
+
+
+def bench_chaining(size: int = 1_000_000) -> None:
+    print(f"Separate chaining, {size} entries (ops/sec)")
+    print(f"{'insert':>10} {'update':>10} {'get':>10}")
+    keys = [f"key-{i}" for i in range(size)]
+    insert, update, get = insert_update_lookup(HashTableSeparateChaining(), keys)
+    print(f"{insert:>10,.0f} {update:>10,.0f} {get:>10,.0f}")
+
+
+def load_one_by_one(table, pairs: list) -> int:
+    for key, value in pairs:
+        table[key] = value
+    return len(pairs)
+
+
+def load_bulk(table, pairs: list) -> int:
+    table.update(pairs)
+    return len(pairs)
+
+
+def bench_bulk_load(size: int = 200_000) -> None:
+    print(f"Loading {size} pairs (pairs/sec)")
+    print(f"{'table':>18} {'setitem':>10} {'update':>10}")
+    pairs = [(f"key-{i}", i) for i in range(size)]
+    for name, table_type in [("linear probing", LinearProbeTable), ("separate chaining", HashTableSeparateChaining)]:
+        one_by_one = ops_per_second(load_one_by_one, table_type(), pairs)
+        bulk = ops_per_second(load_bulk, table_type(), pairs)
+        print(f"{name:>18} {one_by_one:>10,.0f} {bulk:>10,.0f}")
+
+
+def bench_persistence(size: int = 200_000) -> None:
+    """ Time to get a usable table at process start: rebuilding it versus opening a saved one. """
+    print(f"Persistent lookup table, {size} keys")
+    print(f"{'table':>18} {'ready in (s)':>14} {'gets/sec':>10}")
+    pairs = [(f"key-{i}", i) for i in range(size)]
+    keys = [key for key, _ in pairs]
+
+    start = time.perf_counter()
+    table = LinearProbeTable()
+    table.update(pairs)
+    print(f"{'rebuilt':>18} {time.perf_counter() - start:>14.3f} {ops_per_second(lookup_all, table, keys):>10,.0f}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "table.bin")
+        with open(path, "wb") as fp:
+            table.dump(fp)
+        start = time.perf_counter()
+        with open(path, "rb") as fp:
+            loaded = LinearProbeTable.load(fp)
+        seconds = time.perf_counter() - start
+        print(f"{'load (dump once)':>18} {seconds:>14.3f} {ops_per_second(lookup_all, loaded, keys):>10,.0f}")
+
+        path = os.path.join(directory, "table.lpt")
+        start = time.perf_counter()
+        MmapLinearProbeTable.build(path, pairs).close()
+        print(f"{'mmap (build once)':>18} {time.perf_counter() - start:>14.3f} {'':>10}")
+        start = time.perf_counter()
+        with MmapLinearProbeTable(path) as mapped:
+            opened = time.perf_counter() - start
+            print(f"{'mmap (reopen)':>18} {opened:>14.6f} {ops_per_second(lookup_all, mapped, keys):>10,.0f}")
+
+
+class StopTheWorldChaining(HashTableSeparateChaining):
+    """ Moves every chain as soon as a resize starts. """
+    MIGRATION_STEP = 1 << 62
+
+
+def insert_latencies(table, keys: list) -> tuple:
+    """
+    Returns the total and the worst single insertion time, in seconds.
+    The garbage collector is paused, as its own pauses would otherwise dominate the worst case.
+    """
+    worst = 0
+    gc.disable()
+    start = time.perf_counter()
+    for key in keys:
+        before = time.perf_counter()
+        table[key] = key
+        worst = max(worst, time.perf_counter() - before)
+    total = time.perf_counter() - start
+    gc.enable()
+    return total, worst
+
+
+def bench_resizing(size: int = 100_000) -> None:
+    print(f"Separate chaining growth, {size} insertions")
+    print(f"{'resizing':>16} {'ops/sec':>10} {'worst insert (ms)':>18}")
+    keys = [f"key-{i}" for i in range(size)]
+    configurations = [
+        # Chains grow linearly without resizing, so only a tenth of the keys are inserted.
+        ("fixed size", HashTableSeparateChaining(max_load_factor=float("inf")), keys[:size // 10]),
+        ("stop the world", StopTheWorldChaining(), keys),
+        ("incremental", HashTableSeparateChaining(), keys),
+    ]
+    for name, table, table_keys in configurations:
+        total, worst = insert_latencies(table, table_keys)
+        print(f"{name:>16} {len(table_keys) / total:>10,.0f} {worst * 1000:>18.2f}")
+
+
+def bench_memory(size: int = 1_000_000) -> None:
+    """
+    Memory used by the table itself (not the keys or values), and the speed of updating
+    the value of every key once the table is full.
+    """
+    print(f"Linear probing memory, {size} entries")
+    print(f"{'bytes/entry':>12} {'updates/sec':>12}")
+    keys = [f"key-{i}" for i in range(size)]
+    tracemalloc.start()
+    table = LinearProbeTable()
+    for key in keys:
+        table[key] = None
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for key in keys:
+        table[key] = key
+    updates = size / (time.perf_counter() - start)
+    print(f"{used / size:>12,.0f} {updates:>12,.0f}")
+
+
+def iterate(table, rounds: int) -> int:
+    """ Iterates over all the items of the table, rounds times. """
+    for _ in range(rounds):
+        table.items()
+    return rounds * len(table)
+
+
+def bench_iteration(size: int = 100_000, rounds: int = 10) -> None:
+    print(f"Iterating over items(), {size} keys inserted (items/sec)")
+    print(f"{'kept':>10} {'linear probing':>16} {'ordered':>12}")
+    keys = [f"key-{i}" for i in range(size)]
+    for kept in [size, size // 10]:
+        tables = [LinearProbeTable(tombstones=True), OrderedHashTable()]
+        speeds = []
+        for table in tables:
+            for key in keys:
+                table[key] = key
+            for key in keys[kept:]:
+                del table[key]
+            speeds.append(ops_per_second(iterate, table, rounds))
+        print(f"{kept:>10} {speeds[0]:>16,.0f} {speeds[1]:>12,.0f}")
+
+
+def main() -> None:
+    bench_deletion()
+    bench_probing()
+    bench_hashing()
+    bench_chaining()
+    bench_bulk_load()
+    bench_persistence()
+    bench_resizing()
+    bench_memory()
+    bench_iteration()
+
+
+if __name__ == "__main__":
+    main()
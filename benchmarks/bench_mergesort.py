@@ -0,0 +1,117 @@
+"""
+Time taken and peak memory allocated by the recursive mergesort, the bottom-up
+mergesort (returning a sorted copy, and in place) and timsort on an ArrayR of
+random ints, and the time taken on nearly sorted ints (sorted, with 1% of them
+swapped with a neighbour), as in a log with small reorderings, and on records
+ordered by a key parsed out of them. Last, parallel_mergesort with 1, 2, 4, ...
+workers, up to the number of cores, on the records in an ArrayR and on ints in
+an ArrayI64 (ordered by record_key and negate, as NumPy would otherwise sort
+them without the workers).
+
+Run from the root of the repository with:
+
+```
+python -m benchmarks.bench_mergesort
+```
+
+Sizes can be given as arguments, e.g. `python -m benchmarks.bench_mergesort 10000000`
+(the recursive mergesort takes minutes at that size). Tracing allocations slows
+the sorts down a lot, so memory is only measured up to MEMORY_SIZE items.
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+from algorithms.mergesort import mergesort, bottom_up_mergesort, identity
+from algorithms.timsort import timsort
+from algorithms.parallel_mergesort import parallel_mergesort
+from data_structures.referential_array import ArrayR
+from data_structures.typed_array import ArrayI64
+
+SIZES = [10_000, 100_000, 1_000_000]
+MEMORY_SIZE = 100_000
+
+
+def seconds(sort, values: list, array_type=ArrayR) -> float:
+    """ Time taken to sort a new array of values with sort. """
+    array = array_type.from_list(values)
+    start = time.perf_counter()
+    sort(array)
+    return time.perf_counter() - start
+
+
+def peak_megabytes(sort, values: list) -> float:
+    """ Peak memory allocated while sorting a new ArrayR of values with sort. """
+    array = ArrayR.from_list(values)
+    tracemalloc.start()
+    sort(array)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 2 ** 20
+
+
+def nearly_sorted(size: int, rng: random.Random) -> list:
+    """ The ints from 0 to size - 1 in order, with 1% of them swapped with the next one. """
+    values = list(range(size))
+    for _ in range(size // 100):
+        i = rng.randrange(size - 1)
+        values[i], values[i + 1] = values[i + 1], values[i]
+    return values
+
+
+def record_key(record: str) -> int:
+    """ The second field of a comma separated record. """
+    return int(record.split(",")[1])
+
+
+def negate(value: int) -> int:
+    return -value
+
+
+def main(sizes=SIZES) -> None:
+    sorts = [
+        ("recursive", mergesort),
+        ("bottom-up", bottom_up_mergesort),
+        ("in place", lambda array, key=identity: bottom_up_mergesort(array, key, in_place=True)),
+        ("timsort", timsort),
+    ]
+    print(f"{'size':>10} " + " ".join(f"{name + ' (s)':>14} {'(MB)':>8}" for name, _ in sorts))
+    rng = random.Random(1008)
+    for size in sizes:
+        values = [rng.randrange(size) for _ in range(size)]
+        columns = []
+        for _, sort in sorts:
+            peak = f"{peak_megabytes(sort, values):.1f}" if size <= MEMORY_SIZE else "-"
+            columns.append(f"{seconds(sort, values):>14.2f} {peak:>8}")
+        print(f"{size:>10} " + " ".join(columns))
+
+    print("Nearly sorted")
+    print(f"{'size':>10} " + " ".join(f"{name + ' (s)':>14}" for name, _ in sorts))
+    for size in sizes:
+        print(f"{size:>10} " + " ".join(f"{seconds(sort, nearly_sorted(size, rng)):>14.2f}" for _, sort in sorts))
+
+    print("Records, with key=record_key")
+    print(f"{'size':>10} " + " ".join(f"{name + ' (s)':>14}" for name, _ in sorts))
+    for size in sizes:
+        records = [f"{i},{rng.randrange(size)},payload" for i in range(size)]
+        print(f"{size:>10} " + " ".join(f"{seconds(lambda array: sort(array, key=record_key), records):>14.2f}"
+                                        for _, sort in sorts))
+
+    worker_counts = [2 ** i for i in range((os.cpu_count() or 1).bit_length())]
+    print("parallel_mergesort, records in an ArrayR / ints in an ArrayI64")
+    print(f"{'size':>10} " + " ".join(f"{f'{workers} workers (s)':>22}" for workers in worker_counts))
+    for size in sizes:
+        records = [f"{i},{rng.randrange(size)},payload" for i in range(size)]
+        values = [rng.randrange(size) for _ in range(size)]
+        columns = []
+        for workers in worker_counts:
+            by_record = seconds(lambda array: parallel_mergesort(array, record_key, workers), records)
+            by_value = seconds(lambda array: parallel_mergesort(array, negate, workers), values, ArrayI64)
+            columns.append(f"{by_record:>10.2f} / {by_value:>9.2f}")
+        print(f"{size:>10} " + " ".join(columns))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or SIZES)
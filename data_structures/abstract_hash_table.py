@@ -1,6 +1,6 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import TypeVar, Generic, Tuple
+from typing import TypeVar, Generic, Tuple, Iterable
 from data_structures.referential_array import ArrayR
 
 K = TypeVar('K')
@@ -48,6 +48,41 @@ class HashTable(ABC, Generic[K, V]):
     def __delitem__(self, key: K) -> None:
         pass
 
+    def update(self, items: Iterable[Tuple[K, V]]) -> None:
+        """
+        Sets every (key, value) pair of items, as if by self[key] = value in order,
+        so the last value given for a key wins.
+        Implementations can override it to load many pairs faster, e.g. with at most one resize.
+        """
+        for key, value in items:
+            self[key] = value
+
+    def get_many(self, keys: Iterable[K]) -> ArrayR[V]:
+        """
+        Returns the values of all the given keys, in the same order.
+        :raises KeyError: when one of the keys doesn't exist.
+        """
+        keys = ArrayR.from_list(list(keys))
+        result = ArrayR(len(keys))
+        for i in range(len(keys)):
+            result[i] = self[keys[i]]
+        return result
+
+    def delete_many(self, keys: Iterable[K]) -> None:
+        """
+        Deletes all the given keys, as if by del self[key] in order.
+        Implementations can override it to delete many keys faster, e.g. by cleaning up once at the end.
+        """
+        for key in keys:
+            del self[key]
+
+    def reserve(self, n: int) -> None:
+        """
+        Hint that the table is about to hold n items, so it can make room for them at once
+        rather than growing step by step. Does nothing unless overridden.
+        """
+        pass
+
     @abstractmethod
     def is_empty(self) -> bool:
         return len(self) == 0
@@ -1,16 +1,23 @@
+from __future__ import annotations
 from data_structures.abstract_list import *
-from data_structures.referential_array import ArrayR
+from data_structures.referential_array import ArrayR, ArrayRView
+from data_structures.typed_array import TypedArray, ARRAY_TYPES
+from data_structures.serialization import StructureWriter, StructureReader
+from typing import BinaryIO
 
 
 class ArrayList(List[T]):
-    """ Implementation of a generic list with arrays. """
+    """ Implementation of a generic list with arrays.
+    The items are stored in an ArrayR, or, to store numbers compactly, in one of
+    the typed arrays of data_structures.typed_array given as array_type.
+    """
 
-    def __init__(self, initial_capacity: int = 1) -> None:
+    def __init__(self, initial_capacity: int = 1, array_type: type[ArrayR] | type[TypedArray] = ArrayR) -> None:
         if initial_capacity < 0:
             raise ValueError("Capacity cannot be negative.")
         
         List.__init__(self)
-        self.__array = ArrayR(initial_capacity)
+        self.__array = array_type(initial_capacity)
         self.__length = 0
 
     def __len__(self) -> int:
@@ -47,14 +54,23 @@ class ArrayList(List[T]):
             index = len(self) + index
         self.__array[index] = value
 
+    def view(self) -> ArrayRView[T]:
+        """ Returns a view of the items of the list in the array underneath,
+        without copying them (e.g. to sort the list in place). See ArrayRView.
+        The view should not be used after items are added or removed.
+        :complexity: O(1)
+        """
+        return self.__array.view(0, len(self))
+
     def __shuffle_right(self, index: int) -> None:
         """ Shuffles all the items to the right from index
         :complexity best: O(1) shuffle from the end of the list
         :complexity worst: O(N) shuffle from the start of the list
         where N is the number of items in the list
         """
-        for i in range(len(self), index, -1):
-            self.__array[i] = self.__array[i - 1]
+        if index < len(self):
+            # Appending moves nothing, so skip the block copy
+            self.__array.copy_from(self.__array, index, index + 1, len(self) - index)
 
     def __shuffle_left(self, index: int) -> None:
         """ Shuffles all the items to the left from index
@@ -62,8 +78,9 @@ class ArrayList(List[T]):
         :complexity worst: O(N) shuffle from the start of the list
         where N is the number of items in the list
         """
-        for i in range(index, len(self)):
-            self.__array[i] = self.__array[i + 1]
+        if index < len(self):
+            # Deleting the last item moves nothing, so skip the block copy
+            self.__array.copy_from(self.__array, index + 1, index, len(self) - index)
 
     def __resize(self) -> None:
         """
@@ -75,14 +92,40 @@ class ArrayList(List[T]):
         """
         if len(self) == len(self.__array):
             new_cap = int(2 * len(self.__array)) + 1
-            new_array = ArrayR(new_cap)
-            for i in range(len(self)):
-                new_array[i] = self.__array[i]
+            new_array = type(self.__array)(new_cap)
+            new_array.copy_from(self.__array, 0, 0, len(self))
             self.__array = new_array
         assert len(self) < len(
             self.__array
         ), "Capacity not greater than length after __resize."
 
+    def dump(self, fp: BinaryIO, compress: bool = False) -> None:
+        """ Writes the list, and its capacity, to the binary file fp (see data_structures.serialization)
+        :complexity: O(N) where N is the number of items in the list
+        """
+        writer = StructureWriter(fp, "ArrayList", compress)
+        writer.write(type(self.__array).__name__)
+        writer.write(len(self.__array))
+        writer.write(len(self))
+        for i in range(len(self)):
+            writer.write(self.__array[i])
+        writer.close()
+
+    @classmethod
+    def load(cls, fp: BinaryIO) -> ArrayList[T]:
+        """ Reads a list written by dump from the binary file fp, with the same capacity and type of array
+        :raises ValueError: if fp does not hold a dumped ArrayList
+        :complexity: O(C) where C is the capacity of the list
+        """
+        reader = StructureReader(fp, "ArrayList")
+        array_type = ARRAY_TYPES[reader.read()]
+        result = cls(reader.read(), array_type)
+        result.__length = reader.read()
+        for i in range(result.__length):
+            result.__array[i] = reader.read()
+        reader.close()
+        return result
+
     def is_full(self):
         """ Returns true if the list is full
         :complexity: O(1)
@@ -1,6 +1,8 @@
 from __future__ import annotations
 from data_structures.abstract_set import Set, T
 from data_structures.referential_array import ArrayR
+from data_structures.serialization import StructureWriter, StructureReader
+from typing import BinaryIO
 
 
 class ArraySet(Set[T]):
@@ -31,6 +33,33 @@ class ArraySet(Set[T]):
                 return True
         return False
 
+    def dump(self, fp: BinaryIO, compress: bool = False) -> None:
+        """
+        Writes the set, and its capacity, to the binary file fp (see data_structures.serialization).
+        :complexity: O(N) where N is the number of elements in the set.
+        """
+        writer = StructureWriter(fp, "ArraySet", compress)
+        writer.write(len(self.__array))
+        writer.write(self.__length)
+        for i in range(self.__length):
+            writer.write(self.__array[i])
+        writer.close()
+
+    @classmethod
+    def load(cls, fp: BinaryIO) -> ArraySet[T]:
+        """
+        Reads a set written by dump from the binary file fp, with the same capacity.
+        :raises ValueError: if fp does not hold a dumped ArraySet.
+        :complexity: O(C) where C is the capacity of the set.
+        """
+        reader = StructureReader(fp, "ArraySet")
+        result = cls(reader.read())
+        result.__length = reader.read()
+        for i in range(result.__length):
+            result.__array[i] = reader.read()
+        reader.close()
+        return result
+
     def clear(self) -> None:
         """ Makes the set empty. 
         We do this by simply setting the size to 0, which means the next items will
@@ -77,10 +106,7 @@ class ArraySet(Set[T]):
         Returns the elements of the set as an array.
         :complexity: O(N) where N is the number of items in the set.
         """
-        res = ArrayR(self.__length)
-        for i in range(self.__length):
-            res[i] = self.__array[i]
-        return res
+        return self.__array[:self.__length]
 
     def union(self, other: ArraySet[T]) -> ArraySet[T]:
         """
@@ -90,8 +116,7 @@ class ArraySet(Set[T]):
         """
         res = ArraySet(len(self.__array) + len(other.__array))
 
-        for i in range(len(self)):
-            res.__array[i] = self.__array[i]
+        res.__array.copy_from(self.__array, 0, 0, self.__length)
         res.__length = self.__length
 
         for j in range(len(other)):
@@ -1,14 +1,24 @@
+from __future__ import annotations
 from data_structures.referential_array import ArrayR
+from data_structures.typed_array import TypedArray, ARRAY_TYPES
+from data_structures.numpy_backend import numpy, as_numpy
 from data_structures.abstract_sorted_list import SortedList, T
+from data_structures.serialization import StructureWriter, StructureReader
+from typing import BinaryIO
 
 __author__ = 'Maria Garcia de la Banda and Brendon Taylor. Modified by Alexey Ignatiev'
 __docformat__ = 'reStructuredText'
 
 
 class ArraySortedList(SortedList[T]):
-    """ Array-based implementation of the Abstract Sorted List. """
-
-    def __init__(self, initial_capacity: int = 1) -> None:
+    """ Array-based implementation of the Abstract Sorted List.
+    The items are stored in an ArrayR, or, for numbers, in one of the typed
+    arrays of data_structures.typed_array given as array_type. With typed arrays,
+    the position of an item is found by NumPy when it is installed
+    (see data_structures.numpy_backend), and items are shifted with a single block copy.
+    """
+
+    def __init__(self, initial_capacity: int = 1, array_type: type[ArrayR] | type[TypedArray] = ArrayR) -> None:
         if initial_capacity < 0:
             raise ValueError("Capacity cannot be negative.")
 
@@ -19,7 +29,35 @@ class ArraySortedList(SortedList[T]):
         self.__length = 0
 
         # Create the internal array where the items will be stored
-        self.__array = ArrayR(initial_capacity)
+        self.__array = array_type(initial_capacity)
+
+    def dump(self, fp: BinaryIO, compress: bool = False) -> None:
+        """ Writes the list, and its capacity, to the binary file fp (see data_structures.serialization).
+        :complexity: O(N) where N is the number of items in the list.
+        """
+        writer = StructureWriter(fp, "ArraySortedList", compress)
+        writer.write(type(self.__array).__name__)
+        writer.write(len(self.__array))
+        writer.write(self.__length)
+        for i in range(self.__length):
+            writer.write(self.__array[i])
+        writer.close()
+
+    @classmethod
+    def load(cls, fp: BinaryIO) -> ArraySortedList[T]:
+        """ Reads a list written by dump from the binary file fp, with the same capacity and type of array.
+        The items are stored in order, so they are not compared again.
+        :raises ValueError: if fp does not hold a dumped ArraySortedList.
+        :complexity: O(C) where C is the capacity of the list.
+        """
+        reader = StructureReader(fp, "ArraySortedList")
+        array_type = ARRAY_TYPES[reader.read()]
+        result = cls(reader.read(), array_type)
+        result.__length = reader.read()
+        for i in range(result.__length):
+            result.__array[i] = reader.read()
+        reader.close()
+        return result
 
     def clear(self):
         """ Clear the list.
@@ -58,26 +96,23 @@ class ArraySortedList(SortedList[T]):
         """
         Shuffle items to the right up to a given position.
         """
-        for i in range(len(self), index, -1):
-            self.__array[i] = self.__array[i - 1]
+        self.__array.copy_from(self.__array, index, index + 1, len(self) - index)
 
     def __shuffle_left(self, index: int) -> None:
         """
         Shuffle items starting at the given position to the left.
         """
-        for i in range(index, len(self)):
-            self.__array[i] = self.__array[i + 1]
+        self.__array.copy_from(self.__array, index + 1, index, len(self) - index)
 
     def __resize(self) -> None:
         """ Resize the list.
         It only sizes up, so should only be called when adding new items.
         """
         # Double the size of the array
-        new_array = ArrayR(2 * len(self.__array) + 1)
+        new_array = type(self.__array)(2 * len(self.__array) + 1)
 
         # copying the contents
-        for i in range(self.__length):
-            new_array[i] = self.__array[i]
+        new_array.copy_from(self.__array, 0, 0, self.__length)
 
         # referring to the new array
         self.__array = new_array
@@ -135,6 +170,9 @@ class ArraySortedList(SortedList[T]):
             Comp - cost of comparision - can be assumed O(1) for simple types like numbers
             N - length of the list
         """
+        values = as_numpy(self.__array, len(self))
+        if values is not None:
+            return int(numpy.searchsorted(values, item))
 
         low = 0
         high = len(self) - 1
@@ -2,15 +2,24 @@ from __future__ import annotations
 from data_structures.referential_array import ArrayR
 from data_structures.abstract_set import Set, T
 from algorithms.mergesort import mergesort
+from data_structures.typed_array import TypedArray, ARRAY_TYPES
+from data_structures.numpy_backend import numpy, as_numpy, from_numpy, same_type
+from data_structures.serialization import StructureWriter, StructureReader
+from typing import BinaryIO
 
 __author__ = 'Maria Garcia de la Banda and Brendon Taylor. Modified by Alexey Ignatiev and Sean Silva'
 __docformat__ = 'reStructuredText'
 
 
 class ArraySortedSet(Set[T]):
-    """ Array-based sorted list implementation of the Abstract Set. """
+    """ Array-based sorted list implementation of the Abstract Set.
+    The elements are stored in an ArrayR, or, for numbers, in one of the typed
+    arrays of data_structures.typed_array given as array_type. With typed arrays,
+    searching and the union, intersection and difference of two sets of the same
+    type of array are done by NumPy when it is installed (see data_structures.numpy_backend).
+    """
 
-    def __init__(self, initial_capacity: int = 1) -> None:
+    def __init__(self, initial_capacity: int = 1, array_type: type[ArrayR] | type[TypedArray] = ArrayR) -> None:
         if initial_capacity <= 0:
             raise ValueError("Capacity should be larger than 0.")
 
@@ -21,7 +30,37 @@ class ArraySortedSet(Set[T]):
         self.__length = 0
 
         # Create the internal array where the items will be stored
-        self.__array = ArrayR(initial_capacity)
+        self.__array = array_type(initial_capacity)
+
+    def dump(self, fp: BinaryIO, compress: bool = False) -> None:
+        """
+        Writes the set, and its capacity, to the binary file fp (see data_structures.serialization).
+        :complexity: O(N) where N is the number of elements in the set.
+        """
+        writer = StructureWriter(fp, "ArraySortedSet", compress)
+        writer.write(type(self.__array).__name__)
+        writer.write(len(self.__array))
+        writer.write(self.__length)
+        for i in range(self.__length):
+            writer.write(self.__array[i])
+        writer.close()
+
+    @classmethod
+    def load(cls, fp: BinaryIO) -> ArraySortedSet[T]:
+        """
+        Reads a set written by dump from the binary file fp, with the same capacity and type of array.
+        The elements are stored in order, so they are not compared again.
+        :raises ValueError: if fp does not hold a dumped ArraySortedSet.
+        :complexity: O(C) where C is the capacity of the set.
+        """
+        reader = StructureReader(fp, "ArraySortedSet")
+        array_type = ARRAY_TYPES[reader.read()]
+        result = cls(reader.read(), array_type)
+        result.__length = reader.read()
+        for i in range(result.__length):
+            result.__array[i] = reader.read()
+        reader.close()
+        return result
 
     def clear(self):
         """ Clear the set.
@@ -38,7 +77,7 @@ class ArraySortedSet(Set[T]):
         :returns: True if the item is in the list, False otherwise.
         """
         index = self.__index_of_item(item)
-        return item == self.__array[index]
+        return index < len(self) and item == self.__array[index]
 
 
     def is_empty(self):
@@ -48,44 +87,40 @@ class ArraySortedSet(Set[T]):
         """
         Returns elements of the set as an array.
         """
-        res = ArrayR(len(self))
-        for i in range(len(self)):
-            res[i] = self.__array[i]
-        return res
+        return self.__array[:len(self)]
 
     def __shuffle_right(self, index: int) -> None:
         """
         Shuffle items to the right up to a given position.
         """
-        for i in range(len(self), index, -1):
-            self.__array[i] = self.__array[i - 1]
+        self.__array.copy_from(self.__array, index, index + 1, len(self) - index)
 
     def __shuffle_left(self, index: int) -> None:
         """
         Shuffle items starting at the given position to the left.
         """
-        for i in range(index, len(self)):
-            self.__array[i] = self.__array[i + 1]
+        self.__array.copy_from(self.__array, index + 1, index, len(self) - index)
 
     def __resize(self) -> None:
         """ Resize the set.
         It only sizes up, so should only be called when adding new items.
         """
         # Double the size of the array
-        new_array = ArrayR(2 * len(self.__array))
+        new_array = type(self.__array)(2 * len(self.__array))
 
         # copying the contents
-        for i in range(self.__length):
-            new_array[i] = self.__array[i]
+        new_array.copy_from(self.__array, 0, 0, self.__length)
 
         # referring to the new array
         self.__array = new_array
 
     def add(self, item: T) -> None:
-        """ Add new element to the set. """
+        """ Add new element to the set. An element already present in the set is not added again. """
+        index = self.__index_of_item(item)
+        if index < len(self) and self.__array[index] == item:
+            return
         if len(self) == len(self.__array):
             self.__resize()
-        index = self.__index_of_item(item)
         self.__shuffle_right(index)
         self.__array[index] = item
         self.__length += 1
@@ -99,11 +134,11 @@ class ArraySortedSet(Set[T]):
             n - size of the set
         """
         index = self.__index_of_item(item)
-        if not self.__array[index] == item:
+        if index == len(self) or not self.__array[index] == item:
             raise KeyError(item)
         #shuffle left to remove the item. Swapping with the last item would break sorted order.
+        self.__length -= 1
         self.__shuffle_left(index)
-        self.__length += -1 
 
     def __index_of_item(self, item: T) -> int:
         """
@@ -113,6 +148,9 @@ class ArraySortedSet(Set[T]):
             comp - cost of comparision
             n - size of the set
         """
+        values = as_numpy(self.__array, len(self))
+        if values is not None:
+            return int(numpy.searchsorted(values, item))
 
         low = 0
         high = len(self) - 1
@@ -132,6 +170,34 @@ class ArraySortedSet(Set[T]):
 
         return low
     
+    def __vectorised(self, other: Set[T], operation: str) -> ArraySortedSet[T] | None:
+        """
+        Returns the union, intersection or difference (the operation) of two sets holding
+        their elements in typed arrays of the same type, computed by NumPy on the sorted arrays.
+        :returns: None if the sets cannot be combined by NumPy, or it is not installed.
+        :complexity: O((n + m) * log(n + m))
+            n - size of self
+            m - size of other
+        """
+        if not isinstance(other, ArraySortedSet) or not same_type(self.__array, other.__array):
+            return None
+        mine = as_numpy(self.__array, len(self))
+        if mine is None:
+            return None
+        theirs = as_numpy(other.__array, len(other))
+        if operation == "union":
+            values = numpy.union1d(mine, theirs)
+        elif operation == "intersection":
+            values = numpy.intersect1d(mine, theirs, assume_unique=True)
+        else:
+            values = numpy.setdiff1d(mine, theirs, assume_unique=True)
+
+        res = ArraySortedSet(max(1, len(values)), type(self.__array))
+        if len(values) > 0:
+            res.__array = from_numpy(values, type(self.__array))
+        res.__length = len(values)
+        return res
+
     def difference(self, other:Set[T]) -> ArraySortedSet[T]:
         """
         Return the difference of two sets, returns a set with every item not in the other set.
@@ -139,7 +205,10 @@ class ArraySortedSet(Set[T]):
             n - size of self
             contains - complexity of in of other set
         """
-        res = ArraySortedSet(len(self))
+        res = self.__vectorised(other, "difference")
+        if res is not None:
+            return res
+        res = ArraySortedSet(max(1, len(self)), type(self.__array))
         for i in range(len(self)):
             item = self.__array[i]
             if item not in other:
@@ -155,7 +224,10 @@ class ArraySortedSet(Set[T]):
             n - size of self
             contains - complexity of in of other set
         """
-        res = ArraySortedSet(min(len(self), len(other)))
+        res = self.__vectorised(other, "intersection")
+        if res is not None:
+            return res
+        res = ArraySortedSet(max(1, min(len(self), len(other))), type(self.__array))
         for i in range(len(self)):
             item = self.__array[i]
             if item in other:
@@ -172,7 +244,10 @@ class ArraySortedSet(Set[T]):
             m - size of other
             comp - cost of comparison
         """
-        res = ArraySortedSet(len(self) + len(other))
+        res = self.__vectorised(other, "union")
+        if res is not None:
+            return res
+        res = ArraySortedSet(max(1, len(self) + len(other)), type(self.__array))
         other_values = other.values()
         sorted_values = mergesort(other_values)
 
@@ -198,13 +273,11 @@ class ArraySortedSet(Set[T]):
                 raise  ValueError(f"Comparison operator poorly implemented {i_value} and {j_value} cannot be compared.")
     
         if i < len(self):
-            for k in range(i, len(self)):
-                res.__array[res.__length] = self.__array[k]
-                res.__length += 1
+            res.__array.copy_from(self.__array, i, res.__length, len(self) - i)
+            res.__length += len(self) - i
         if j < len(sorted_values):
-            for k in range(j, len(sorted_values)):
-                res.__array[res.__length] = sorted_values[k]
-                res.__length += 1
+            res.__array.copy_from(sorted_values, j, res.__length, len(sorted_values) - j)
+            res.__length += len(sorted_values) - j
         
         return res
     
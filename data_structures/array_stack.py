@@ -1,5 +1,9 @@
+from __future__ import annotations
 from data_structures.abstract_stack import Stack
 from data_structures.referential_array import ArrayR, T
+from data_structures.typed_array import TypedArray, ARRAY_TYPES
+from data_structures.serialization import StructureWriter, StructureReader
+from typing import BinaryIO
 
 
 class ArrayStack(Stack[T]):
@@ -7,21 +11,50 @@ class ArrayStack(Stack[T]):
 
     Attributes:
          length (int): number of elements in the stack (inherited)
-         array (ArrayR[T]): array storing the elements of the queue
+         array (ArrayR[T] or TypedArray[T]): array storing the elements of the stack
     """
 
-    def __init__(self, max_capacity: int) -> None:
+    def __init__(self, max_capacity: int, array_type: type[ArrayR] | type[TypedArray] = ArrayR) -> None:
         """
         Constructor for the ArrayStack class.
         :param max_capacity: maximum capacity of the stack
+        :param array_type: ArrayR, or one of the typed arrays of data_structures.typed_array to store numbers compactly
         :complexity: O(max_capacity) due to the creation of the array
         """
         if max_capacity <= 0:
             raise ValueError("Capacity should be larger than 0.")
         Stack.__init__(self)
-        self.__array = ArrayR(max_capacity)
+        self.__array = array_type(max_capacity)
         self.__length = 0
 
+    def dump(self, fp: BinaryIO, compress: bool = False) -> None:
+        """ Writes the stack, and its capacity, to the binary file fp (see data_structures.serialization).
+        The elements are written from the bottom of the stack to the top.
+        :complexity: O(N) where N is the number of elements in the stack
+        """
+        writer = StructureWriter(fp, "ArrayStack", compress)
+        writer.write(type(self.__array).__name__)
+        writer.write(len(self.__array))
+        writer.write(self.__length)
+        for i in range(self.__length):
+            writer.write(self.__array[i])
+        writer.close()
+
+    @classmethod
+    def load(cls, fp: BinaryIO) -> ArrayStack[T]:
+        """ Reads a stack written by dump from the binary file fp, with the same capacity and type of array.
+        :raises ValueError: if fp does not hold a dumped ArrayStack
+        :complexity: O(C) where C is the capacity of the stack
+        """
+        reader = StructureReader(fp, "ArrayStack")
+        array_type = ARRAY_TYPES[reader.read()]
+        result = cls(reader.read(), array_type)
+        result.__length = reader.read()
+        for i in range(result.__length):
+            result.__array[i] = reader.read()
+        reader.close()
+        return result
+
     def is_full(self) -> bool:
         """ True if the stack is full and no element can be pushed. """
         return len(self) == len(self.__array)
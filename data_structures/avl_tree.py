@@ -0,0 +1,327 @@
+""" AVL Tree ADT.
+    Defines a self-balancing Binary Search Tree with linked nodes.
+    After every insertion and deletion the heights of the two subtrees of any
+    node differ by at most one, so the depth of the tree is O(log N) regardless
+    of the order in which the keys are inserted.
+    The height of each node is stored in the _size attribute of the BinaryNode.
+"""
+
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+from typing import TypeVar, Tuple, BinaryIO
+
+from data_structures.node import BinaryNode
+from data_structures.abstract_hash_table import HashTable
+from data_structures.referential_array import ArrayR
+from data_structures.binary_search_tree import (BSTInOrderIterator, BSTPreOrderIterator, BSTPostOrderIterator,
+                                                dump_nodes, load_nodes)
+from data_structures.serialization import StructureWriter, StructureReader
+
+# generic types
+K = TypeVar('K')
+V = TypeVar('V')
+
+
+class AVLTree(HashTable[K, V]):
+    """ Height balanced binary search tree.
+
+    Unless stated otherwise, CompK is the complexity of comparing the keys and
+    N is the number of nodes in the tree.
+    """
+
+    def __init__(self) -> None:
+        """
+            Initialises an empty AVL Tree
+            :complexity: O(1)
+        """
+
+        self.__root: BinaryNode[K, V] | None = None
+        self.__length = 0
+
+    def dump(self, fp: BinaryIO, compress: bool = False) -> None:
+        """
+            Writes the tree to the binary file fp (see data_structures.serialization),
+            keeping its shape and the heights of the nodes, see dump_nodes.
+            :complexity: O(N)
+        """
+        writer = StructureWriter(fp, "AVLTree", compress)
+        writer.write(self.__length)
+        dump_nodes(writer, self.__root)
+        writer.close()
+
+    @classmethod
+    def load(cls, fp: BinaryIO) -> AVLTree[K, V]:
+        """
+            Reads a tree written by dump from the binary file fp, with the same shape,
+            so it is balanced without any rotations. No keys are compared.
+            :raises ValueError: if fp does not hold a dumped AVLTree
+            :complexity: O(N)
+        """
+        reader = StructureReader(fp, "AVLTree")
+        tree = cls()
+        tree.__length = reader.read()
+        tree.__root = load_nodes(reader, tree.__length)
+        reader.close()
+        return tree
+
+    def is_empty(self) -> bool:
+        """
+            Checks to see if the tree is empty
+            :complexity: O(1)
+        """
+        return self.__root is None
+
+    def __len__(self) -> int:
+        """ Returns the number of nodes in the tree. """
+
+        return self.__length
+
+    def __contains__(self, key: K) -> bool:
+        """
+            Checks to see if the key is in the tree
+            :complexity: see __getitem__(self, key: K) -> V
+        """
+        try:
+            _ = self[key]
+        except KeyError:
+            return False
+        else:
+            return True
+
+    def __iter__(self) -> BSTInOrderIterator:
+        """ Create an in-order iterator. """
+        return BSTInOrderIterator(self.__root)
+
+    def post_iter(self) -> BSTPostOrderIterator:
+        return BSTPostOrderIterator(self.__root)
+
+    def pre_iter(self) -> BSTPreOrderIterator:
+        return BSTPreOrderIterator(self.__root)
+
+    def __getitem__(self, key: K) -> V:
+        """
+            Attempts to get an item in the tree, it uses the Key to attempt to find it
+            :complexity best: O(CompK) finds the item in the root of the tree
+            :complexity worst: O(CompK * log(N)) item is not found
+        """
+        return self.get_tree_node_by_key(key).item
+
+    def get_tree_node_by_key(self, key: K) -> BinaryNode:
+        """
+            Walks down the tree to find the node with the given key.
+            :raises KeyError: when the key is not in the tree.
+            :complexity: see __getitem__(self, key: K) -> V
+        """
+        current = self.__root
+        while current is not None:
+            if key == current.key:
+                return current
+            elif key < current.key:
+                current = current._left
+            else:  # key > current.key
+                current = current._right
+        raise KeyError(f'Key not found: {key}')
+
+    def __setitem__(self, key: K, item: V) -> None:
+        self.__root = self.insert_aux(self.__root, key, item)
+
+    def insert_aux(self, current: BinaryNode | None, key: K, item: V) -> BinaryNode:
+        """
+            Inserts (or updates) the key in the subtree rooted at current, rebalancing
+            every node on the way back up.
+            Returns the new root of the subtree.
+            :complexity: O(CompK * log(N)) as the depth of the tree is O(log(N)) and
+                each rebalance is O(1).
+        """
+        if current is None:  # base case: at the leaf
+            self.__length += 1
+            return BinaryNode(item, key, 1)
+        elif key < current.key:
+            current._left = self.insert_aux(current._left, key, item)
+        elif key > current.key:
+            current._right = self.insert_aux(current._right, key, item)
+        else:  # key == current.key
+            current.item = item
+            return current
+        return self.rebalance(current)
+
+    def __delitem__(self, key: K) -> None:
+        self.__root = self.delete_aux(self.__root, key)
+
+    def delete_aux(self, current: BinaryNode | None, key: K) -> BinaryNode | None:
+        """
+            Deletes the key from the subtree rooted at current, rebalancing
+            every node on the way back up.
+            Returns the new root of the subtree.
+            :raises ValueError: when the key is not in the tree, as for BinarySearchTree.
+            :complexity: O(CompK * log(N)) as the depth of the tree is O(log(N)) and
+                each rebalance is O(1).
+        """
+        if current is None:  # key not found
+            raise ValueError('Deleting non-existent item')
+        elif key < current.key:
+            current._left = self.delete_aux(current._left, key)
+        elif key > current.key:
+            current._right = self.delete_aux(current._right, key)
+        else:  # we found our key => do actual deletion
+            if current._left is None:
+                self.__length -= 1
+                return current._right
+            elif current._right is None:
+                self.__length -= 1
+                return current._left
+
+            # general case => replace with the successor and delete it from the right subtree
+            successor = self.get_successor(current)
+            current.key = successor.key
+            current.item = successor.item
+            current._right = self.delete_aux(current._right, successor.key)
+
+        return self.rebalance(current)
+
+    def get_height(self, current: BinaryNode | None) -> int:
+        """
+            Height of the subtree rooted at current. An empty tree has height 0.
+            :complexity: O(1)
+        """
+        if current is None:
+            return 0
+        return current._size
+
+    def update_height(self, current: BinaryNode) -> None:
+        """
+            Recomputes the height of current from the heights of its children.
+            :complexity: O(1)
+        """
+        current._size = 1 + max(self.get_height(current._left), self.get_height(current._right))
+
+    def get_balance(self, current: BinaryNode) -> int:
+        """
+            Balance factor of current: height of the left subtree minus the height of the right subtree.
+            Positive values mean the node is left heavy, negative values mean it is right heavy.
+            :complexity: O(1)
+        """
+        return self.get_height(current._left) - self.get_height(current._right)
+
+    def rotate_left(self, current: BinaryNode) -> BinaryNode:
+        """
+            Rotates the subtree rooted at current to the left, returning the new root.
+
+                current                 child
+               /       \\              /     \\
+              a        child   =>   current  c
+                      /     \\       /     \\
+                     b       c     a       b
+
+            :complexity: O(1)
+        """
+        child = current._right
+        current._right = child._left
+        child._left = current
+        self.update_height(current)
+        self.update_height(child)
+        return child
+
+    def rotate_right(self, current: BinaryNode) -> BinaryNode:
+        """
+            Rotates the subtree rooted at current to the right, returning the new root.
+
+                   current            child
+                  /       \\          /     \\
+               child       c  =>    a     current
+              /     \\                   /       \\
+             a       b                 b         c
+
+            :complexity: O(1)
+        """
+        child = current._left
+        current._left = child._right
+        child._right = current
+        self.update_height(current)
+        self.update_height(child)
+        return child
+
+    def rebalance(self, current: BinaryNode) -> BinaryNode:
+        """
+            Updates the height of current and, if its subtrees differ in height by more
+            than one, performs the single or double rotation that restores the AVL property.
+            Assumes both subtrees of current are already balanced.
+            Returns the new root of the subtree.
+            :complexity: O(1)
+        """
+        self.update_height(current)
+        balance = self.get_balance(current)
+        if balance > 1:
+            # Left heavy. Left-right case needs the left child rotated first.
+            if self.get_balance(current._left) < 0:
+                current._left = self.rotate_left(current._left)
+            return self.rotate_right(current)
+        elif balance < -1:
+            # Right heavy. Right-left case needs the right child rotated first.
+            if self.get_balance(current._right) > 0:
+                current._right = self.rotate_right(current._right)
+            return self.rotate_left(current)
+        return current
+
+    def get_successor(self, current: BinaryNode) -> BinaryNode | None:
+        """
+            Get successor of the current node.
+            It should be a node in the subtree rooted at current having the smallest key among all the
+            larger keys.
+            If no such node exists, then none should be returned.
+        """
+        if current is None:
+            return None
+        return self.get_minimal(current._right)
+
+    def get_minimal(self, current: BinaryNode) -> BinaryNode | None:
+        """
+            Get a node having the smallest key in the current sub-tree.
+        """
+        if current is None:
+            return None
+        while current._left:
+            current = current._left
+        return current
+
+    def get_maximal(self, current: BinaryNode) -> BinaryNode | None:
+        """
+            Get a node having the largest key in the current sub-tree.
+        """
+        if current is None:
+            return None
+        while current._right:
+            current = current._right
+        return current
+
+    @property
+    def height(self) -> int:
+        """ Height of the whole tree. """
+        return self.get_height(self.__root)
+
+    def items(self) -> ArrayR[Tuple[K, V]]:
+        """
+            Returns all (key, item) pairs in key order.
+            :complexity: O(N)
+        """
+        array = ArrayR(len(self))
+        for i, node in enumerate(self):
+            array[i] = (node.key, node.item)
+        return array
+
+    def __str__(self) -> str:
+        buffer = []
+        self.__str_aux(self.__root, buffer, prefix='', final='')
+        return '\n'.join(buffer)
+
+    def __str_aux(self, current: BinaryNode | None, buffer: list, prefix: str, final: str) -> None:
+        real_prefix = prefix[:-2] + final
+        if current is not None:
+            buffer.append(f'{real_prefix}{current.key}')
+            if current._left or current._right:
+                self.__str_aux(current._left, buffer, prefix=prefix + '\u2551 ', final='\u255f\u2550')
+                self.__str_aux(current._right, buffer, prefix=prefix + '  ', final='\u2559\u2550')
+        else:
+            buffer.append(f'{real_prefix}')
@@ -9,12 +9,15 @@ __author__ = 'Brendon Taylor, modified by Alexey Ignatiev, further modified by J
 __docformat__ = 'reStructuredText'
 
 import math
-from typing import TypeVar, Tuple
+from typing import TypeVar, Tuple, Iterable, BinaryIO
 
 from data_structures.linked_stack import LinkedStack
 from data_structures.node import BinaryNode
 from data_structures.abstract_hash_table import HashTable
 from data_structures.referential_array import ArrayR
+from data_structures.array_list import ArrayList
+from algorithms.mergesort import mergesort
+from data_structures.serialization import StructureWriter, StructureReader
 
 # generic types
 K = TypeVar('K')
@@ -123,8 +126,123 @@ class BSTPostOrderIterator:
                     self.stack.push((current._left, False))
 
 
+class BSTRangeIterator:
+    """ Bounded in-order iterator for the binary search tree.
+        Yields the nodes with lo <= key < hi in ascending order (or descending
+        order if reverse is True). A bound of None means the range is unbounded on that side.
+        Performs stack-based BST traversal, descending directly to the first key in the
+        range and stopping as soon as a key falls outside of it, so iterating over k keys
+        costs O(D + k) where D is the depth of the tree.
+    """
+
+    def __init__(self, root: BinaryNode[K, V] | None, lo: K | None = None, hi: K | None = None,
+                 reverse: bool = False) -> None:
+        """ Iterator initialiser. """
+
+        self.stack = LinkedStack[BinaryNode]()
+        self.lo = lo
+        self.hi = hi
+        self.reverse = reverse
+        self.push_spine(root)
+
+    def __iter__(self) -> BSTRangeIterator:
+        """ Standard __iter__() method for initialisers. Returns itself. """
+
+        return self
+
+    def push_spine(self, current: BinaryNode[K, V] | None) -> None:
+        """ Pushes the nodes on the path to the first key of the subtree (last key if reverse)
+            that is within the range, skipping over the subtrees that are out of range.
+        """
+
+        while current is not None:
+            if not self.reverse:
+                if self.lo is not None and current.key < self.lo:
+                    current = current._right
+                else:
+                    self.stack.push(current)
+                    current = current._left
+            else:
+                if self.hi is not None and not current.key < self.hi:
+                    current = current._left
+                else:
+                    self.stack.push(current)
+                    current = current._right
+
+    def __next__(self) -> BinaryNode[K, V]:
+        """ The main body of the iterator.
+            Returns nodes of the BST one by one respecting the (reverse) in-order, within the range.
+        """
+
+        if self.stack.is_empty():
+            raise StopIteration
+
+        result = self.stack.pop()
+        if not self.reverse:
+            if self.hi is not None and not result.key < self.hi:
+                self.stack.clear()
+                raise StopIteration
+            self.push_spine(result._right)
+        else:
+            if self.lo is not None and result.key < self.lo:
+                self.stack.clear()
+                raise StopIteration
+            self.push_spine(result._left)
+
+        return result
+
+
+# Flags written with every node by dump_nodes.
+HAS_LEFT = 1
+HAS_RIGHT = 2
+
+
+def dump_nodes(writer: StructureWriter, root: BinaryNode[K, V] | None) -> None:
+    """ Writes the nodes of a tree in pre-order, as (key, item, _size, flags) tuples where
+        the flags tell which children the node has, so that load_nodes can rebuild the
+        same shape without comparing any keys.
+        :complexity: O(N) where N is the number of nodes in the tree
+    """
+    for current in BSTPreOrderIterator(root):
+        flags = (HAS_LEFT if current._left is not None else 0) | (HAS_RIGHT if current._right is not None else 0)
+        writer.write((current.key, current.item, current._size, flags))
+
+
+def load_nodes(reader: StructureReader, count: int) -> BinaryNode[K, V] | None:
+    """ Reads count nodes written by dump_nodes and returns the root of the rebuilt tree.
+        Iterative, so that the depth of the tree is not limited by the recursion limit.
+        :complexity: O(N) where N is the number of nodes in the tree
+    """
+    root = None
+    parent = None
+    left = True
+    # Nodes whose right child has not been read yet, the most recent one on top.
+    waiting = LinkedStack[BinaryNode]()
+    for _ in range(count):
+        key, item, size, flags = reader.read()
+        current = BinaryNode(item, key, size)
+        if parent is None:
+            root = current
+        elif left:
+            parent._left = current
+        else:
+            parent._right = current
+
+        if flags & HAS_RIGHT:
+            waiting.push(current)
+        if flags & HAS_LEFT:
+            parent, left = current, True
+        elif not waiting.is_empty():
+            parent, left = waiting.pop(), False
+    return root
+
+
 class BinarySearchTree(HashTable[K,V]):
-    """ Basic binary search tree. """
+    """ Basic binary search tree.
+    The _size attribute of every node holds the number of nodes in its subtree,
+    which is kept up to date by insertion and deletion and is used to answer
+    order statistic queries (rank, select, percentile) in O(depth).
+    """
 
     def __init__(self) -> None:
         """
@@ -140,22 +258,194 @@ class BinarySearchTree(HashTable[K,V]):
         """
             Creates a binary search tree object from binary node.
             Useful if a bottom up construction of the tree can be done efficiently.
-            Length argument is not checked if passed in.
+            If length is passed in and matches the subtree size stored in the root, the
+            subtree sizes of the nodes are assumed to be correct. Otherwise they are recomputed.
             :complexity: 
-                :best: O(1) when length is passed
+                :best: O(1) when length matches the size of the root
                 :worst: O(N) where N is the number of nodes in the tree
         """
-        def len_aux(current: BinaryNode | None) -> int:
-            if current is None:
-                return 0
-            return 1 + len_aux(current._left) + len_aux(current._right)
-        
         if not isinstance(node, (BinaryNode, type(None))):
             raise TypeError(f"Cannot instantiate binary tree with node type: {type(node)}")
         tree = BinarySearchTree()
         tree.__root = node
-        tree.__length = length if length else len_aux(node)
+        if node is not None and node._size == length:
+            tree.__length = length
+        else:
+            for current in BSTPostOrderIterator(node):
+                current._size = 1 + tree.get_size(current._left) + tree.get_size(current._right)
+            tree.__length = tree.get_size(node)
+
+        return tree
+
+    @staticmethod
+    def from_sorted(items: ArrayR[Tuple[K, V]] | ArrayList[Tuple[K, V]] | Iterable[Tuple[K, V]]) -> BinarySearchTree[K, V]:
+        """
+            Creates a height balanced binary search tree from (key, item) pairs,
+            e.g. the result of items() on another tree.
+            The middle pair of every range becomes the root of its subtree, so no keys are compared.
+            :pre: the keys are sorted in increasing order and unique - this is not checked.
+            :complexity: O(N) where N is the number of pairs.
+        """
+        if not isinstance(items, (ArrayR, ArrayList)):
+            items = ArrayR.from_list(list(items))
+
+        def build_aux(lo: int, hi: int) -> BinaryNode[K, V] | None:
+            # Builds the subtree holding items[lo:hi]
+            if lo >= hi:
+                return None
+            mid = (lo + hi) // 2
+            key, item = items[mid]
+            current = BinaryNode(item, key, hi - lo)
+            current._left = build_aux(lo, mid)
+            current._right = build_aux(mid + 1, hi)
+            return current
+
+        return BinarySearchTree.from_node(build_aux(0, len(items)), len(items))
+
+    def rebalance(self) -> None:
+        """
+            Rebuilds the tree in place into a height balanced tree, reusing the existing nodes.
+            Useful after a sequence of insertions in (nearly) sorted order.
+            :complexity: O(N) where N is the number of nodes in the tree.
+        """
+        nodes = ArrayR(len(self))
+        for i, node in enumerate(self):
+            nodes[i] = node
+
+        def build_aux(lo: int, hi: int) -> BinaryNode[K, V] | None:
+            # Relinks nodes[lo:hi] into a balanced subtree
+            if lo >= hi:
+                return None
+            mid = (lo + hi) // 2
+            current = nodes[mid]
+            current._size = hi - lo
+            current._left = build_aux(lo, mid)
+            current._right = build_aux(mid + 1, hi)
+            return current
+
+        self.__root = build_aux(0, len(nodes))
+
+    def update(self, items: ArrayR[Tuple[K, V]] | ArrayList[Tuple[K, V]] | Iterable[Tuple[K, V]]) -> None:
+        """
+            Inserts or updates every (key, item) pair, the last item given for a key winning.
+            A batch at least as large as the tree is sorted by key with mergesort, merged with the
+            nodes of the tree and rebuilt into a height balanced tree (see from_sorted), so loading
+            many pairs never builds a degenerate tree, even if the keys come in sorted order.
+            Smaller batches are inserted one at a time.
+            :complexity: O(CompK * (M * log(M) + N)) for large batches, where M is the number of pairs
+                and N is the number of nodes in the tree. O(CompK * M * D) for small batches, where D is
+                the depth of the tree.
+        """
+        if not isinstance(items, (ArrayR, ArrayList)):
+            items = ArrayR.from_list(list(items))
+        if len(items) < len(self):
+            for i in range(len(items)):
+                key, item = items[i]
+                self[key] = item
+            return
+
+        # mergesort is stable, so pairs with the same key stay in the order they were given.
+        items = mergesort(items, key=lambda pair: pair[0])
+        merged = ArrayList(len(items) + len(self))
+        nodes = iter(self)
+        node = next(nodes, None)
+        for i in range(len(items)):
+            key, item = items[i]
+            while node is not None and node.key < key:
+                merged.append((node.key, node.item))
+                node = next(nodes, None)
+            if node is not None and node.key == key:
+                # Replaced by the new item.
+                node = next(nodes, None)
+            if len(merged) > 0 and merged[-1][0] == key:
+                merged[-1] = (key, item)
+            else:
+                merged.append((key, item))
+        while node is not None:
+            merged.append((node.key, node.item))
+            node = next(nodes, None)
+
+        tree = BinarySearchTree.from_sorted(merged)
+        self.__root = tree.__root
+        self.__length = len(tree)
+
+    def get_many(self, keys: ArrayR[K] | ArrayList[K] | Iterable[K]) -> ArrayR[V]:
+        """
+            Returns the items of all the given keys, in the same order.
+            :raises KeyError: when one of the keys is not in the tree.
+            :complexity: O(CompK * M * D) where M is the number of keys and D is the depth of the tree.
+        """
+        if not isinstance(keys, (ArrayR, ArrayList)):
+            keys = ArrayR.from_list(list(keys))
+        result = ArrayR(len(keys))
+        for i in range(len(keys)):
+            result[i] = self.get_tree_node_by_key_aux(self.__root, keys[i]).item
+        return result
+
+    def delete_many(self, keys: ArrayR[K] | ArrayList[K] | Iterable[K]) -> None:
+        """
+            Deletes all the given keys. Nothing is deleted if one of the keys is not in the tree,
+            or is given more than once.
+            The keys are sorted with mergesort. A batch at least half as large as the tree is then
+            deleted by rebuilding the tree, height balanced, from the nodes that are kept. Smaller
+            batches are checked first and then deleted one at a time.
+            :raises ValueError: when one of the keys is not in the tree, or is repeated.
+            :complexity: O(CompK * (M * log(M) + N)) for large batches, where M is the number of keys
+                and N is the number of nodes in the tree. O(CompK * M * (log(M) + D)) for small batches,
+                where D is the depth of the tree.
+        """
+        if not isinstance(keys, (ArrayR, ArrayList)):
+            keys = ArrayR.from_list(list(keys))
+        keys = mergesort(keys)
+        if 2 * len(keys) < len(self):
+            for i in range(len(keys)):
+                if (i > 0 and keys[i] == keys[i - 1]) or keys[i] not in self:
+                    raise ValueError('Deleting non-existent item')
+            for i in range(len(keys)):
+                del self[keys[i]]
+            return
+
+        kept = ArrayList(len(self))
+        i = 0
+        for node in self:
+            if i < len(keys) and keys[i] < node.key:
+                # Not in the tree, or a repeat of a key deleted already.
+                raise ValueError('Deleting non-existent item')
+            if i < len(keys) and keys[i] == node.key:
+                i += 1
+            else:
+                kept.append((node.key, node.item))
+        if i < len(keys):
+            raise ValueError('Deleting non-existent item')
+
+        tree = BinarySearchTree.from_sorted(kept)
+        self.__root = tree.__root
+        self.__length = len(tree)
 
+    def dump(self, fp: BinaryIO, compress: bool = False) -> None:
+        """
+            Writes the tree to the binary file fp (see data_structures.serialization),
+            keeping its shape and the subtree sizes, see dump_nodes.
+            :complexity: O(N) where N is the number of nodes in the tree
+        """
+        writer = StructureWriter(fp, "BinarySearchTree", compress)
+        writer.write(self.__length)
+        dump_nodes(writer, self.__root)
+        writer.close()
+
+    @classmethod
+    def load(cls, fp: BinaryIO) -> BinarySearchTree[K, V]:
+        """
+            Reads a tree written by dump from the binary file fp, with the same shape.
+            No keys are compared.
+            :raises ValueError: if fp does not hold a dumped BinarySearchTree
+            :complexity: O(N) where N is the number of nodes in the tree
+        """
+        reader = StructureReader(fp, "BinarySearchTree")
+        tree = cls()
+        tree.__length = reader.read()
+        tree.__root = load_nodes(reader, tree.__length)
+        reader.close()
         return tree
 
     def is_empty(self) -> bool:
@@ -192,6 +482,19 @@ class BinarySearchTree(HashTable[K,V]):
     def pre_iter(self) -> BSTPreOrderIterator:
         return BSTPreOrderIterator(self.__root)
 
+    def __reversed__(self) -> BSTRangeIterator:
+        """ Create a reverse (descending) in-order iterator. """
+        return BSTRangeIterator(self.__root, reverse=True)
+
+    def range_iter(self, lo: K | None = None, hi: K | None = None, reverse: bool = False) -> BSTRangeIterator:
+        """
+            Create an in-order iterator over the nodes with lo <= key < hi.
+            None for either bound leaves that side of the range open.
+            :complexity: O(CompK * D) to reach the first node, then O(1) amortised per node,
+                where D is the depth of the tree.
+        """
+        return BSTRangeIterator(self.__root, lo, hi, reverse)
+
     def __getitem__(self, key: K) -> V:
         """
             Attempts to get an item in the tree, it uses the Key to attempt to find it
@@ -205,14 +508,21 @@ class BinarySearchTree(HashTable[K,V]):
         return self.get_tree_node_by_key_aux(self.__root, key)
 
     def get_tree_node_by_key_aux(self, current: BinaryNode, key: K) -> BinaryNode:
-        if current is None:  # base case: empty
-            raise KeyError(f'Key not found: {key}')
-        elif key == current.key:  # base case: found
-            return current
-        elif key < current.key:
-            return self.get_tree_node_by_key_aux(current._left, key)
-        else:  # key > current.key
-            return self.get_tree_node_by_key_aux(current._right, key)
+        """
+            Walks down the subtree rooted at current to find the node with the given key.
+            Uses a loop rather than recursion, so deep (unbalanced) trees do not
+            raise a RecursionError.
+            :raises KeyError: when the key is not in the subtree.
+            :complexity: see __getitem__(self, key: K) -> V
+        """
+        while current is not None:
+            if key == current.key:  # found
+                return current
+            elif key < current.key:
+                current = current._left
+            else:  # key > current.key
+                current = current._right
+        raise KeyError(f'Key not found: {key}')
 
     def __setitem__(self, key: K, item: V) -> None:
         self.__root = self.insert_aux(self.__root, key, item, 1)
@@ -220,21 +530,37 @@ class BinarySearchTree(HashTable[K,V]):
     def insert_aux(self, current: BinaryNode, key: K, item: V, current_depth: int) -> BinaryNode:
         """
             Attempts to insert an item into the tree, it uses the Key to insert it
+            Walks down the subtree rooted at current with a loop and returns the
+            root of the subtree (current, or the new node if current is None).
             :complexity: 
                 :best: O(CompK) inserts the item at the root.
                 :worst: O(CompK * D) inserting at the bottom of the tree
             where D is the depth of the tree
             CompK is the complexity of comparing the keys
         """
-        if current is None:  # base case: at the leaf
-            current = BinaryNode(item, key)
+        if current is None:  # empty subtree: the new node is the root
             self.__length += 1
-        elif key < current.key:
-            current._left = self.insert_aux(current._left, key, item, current_depth + 1)
-        elif key > current.key:
-            current._right = self.insert_aux(current._right, key, item, current_depth + 1)
-        else:  # key == current.key
-            current.item = item
+            return BinaryNode(item, key, 1)
+
+        node = current
+        while True:
+            if key < node.key:
+                if node._left is None:
+                    node._left = BinaryNode(item, key, 0)
+                    break
+                node = node._left
+            elif key > node.key:
+                if node._right is None:
+                    node._right = BinaryNode(item, key, 0)
+                    break
+                node = node._right
+            else:  # key == node.key, an update leaves the sizes as they are
+                node.item = item
+                return current
+
+        # A new node: every node on the path, and the new node itself, gains one
+        self.__adjust_sizes(current, key, 1)
+        self.__length += 1
         return current
 
     def __delitem__(self, key: K) -> None:
@@ -244,33 +570,198 @@ class BinarySearchTree(HashTable[K,V]):
         """
             Attempts to delete an item from the tree, it uses the Key to
             determine the node to delete.
+            Walks down the subtree rooted at current with a loop and returns the
+            new root of the subtree.
+            :complexity: O(CompK * D) where D is the depth of the tree
         """
-
-        if current is None:  # key not found
+        parent = None
+        node = current
+        while node is not None:
+            # Every node on the path loses a descendant, unless the key does not exist.
+            node._size -= 1
+            if key < node.key:
+                parent = node
+                node = node._left
+            elif key > node.key:
+                parent = node
+                node = node._right
+            else:  # we found our key
+                break
+
+        if node is None:  # key not found
+            self.__adjust_sizes(current, key, 1)
             raise ValueError('Deleting non-existent item')
-        elif key < current.key:
-            current._left = self.delete_aux(current._left, key)
-        elif key > current.key:
-            current._right = self.delete_aux(current._right, key)
-        else:  # we found our key => do actual deletion
-            if self.is_leaf(current):
-                self.__length -= 1
-                return None
-            elif current._left is None:
-                self.__length -= 1
-                return current._right
-            elif current._right is None:
-                self.__length -= 1
-                return current._left
-
-            # general case => find a successor
-            successor = self.get_successor(current)
-            current.key = successor.key
-            current.item = successor.item
-            current._right = self.delete_aux(current._right, successor.key)
 
+        if node._left is not None and node._right is not None:
+            # general case => find a successor and splice it out of the right subtree
+            successor_parent = node
+            successor = node._right
+            while successor._left is not None:
+                successor._size -= 1
+                successor_parent = successor
+                successor = successor._left
+            node.key = successor.key
+            node.item = successor.item
+            if successor_parent is node:
+                node._right = successor._right
+            else:
+                successor_parent._left = successor._right
+        else:
+            # leaf or a single child => replace the node by its only child (if any)
+            child = node._left if node._left is not None else node._right
+            if parent is None:
+                current = child
+            elif parent._left is node:
+                parent._left = child
+            else:
+                parent._right = child
+
+        self.__length -= 1
         return current
 
+    def __adjust_sizes(self, current: BinaryNode | None, key: K, delta: int) -> None:
+        """
+            Adds delta to the subtree size of every node on the path from current
+            down to the node with the given key (inclusive), or to the bottom of the
+            tree if there is no such node.
+            Used to count a new node once it has been added, and to undo the size changes
+            of a deletion of a non-existent key.
+            :complexity: O(CompK * D) where D is the depth of the tree
+        """
+        while current is not None:
+            current._size += delta
+            if key < current.key:
+                current = current._left
+            elif key > current.key:
+                current = current._right
+            else:  # key == current.key
+                break
+
+    def get_size(self, current: BinaryNode | None) -> int:
+        """
+            Number of nodes in the subtree rooted at current.
+            :complexity: O(1)
+        """
+        if current is None:
+            return 0
+        return current._size
+
+    def rank(self, key: K) -> int:
+        """
+            Number of keys in the tree strictly smaller than the given key.
+            The key does not need to be in the tree.
+            :complexity: O(CompK * D) where D is the depth of the tree
+        """
+        result = 0
+        current = self.__root
+        while current is not None:
+            if key < current.key:
+                current = current._left
+            elif key > current.key:
+                result += self.get_size(current._left) + 1
+                current = current._right
+            else:  # key == current.key
+                result += self.get_size(current._left)
+                break
+        return result
+
+    def get_tree_node_by_rank(self, index: int) -> BinaryNode:
+        """
+            Get the node holding the key at position index (0-based) in sorted order.
+            :raises IndexError: when index is not between 0 and len(self) - 1.
+            :complexity: O(D) where D is the depth of the tree
+        """
+        if index < 0 or index >= len(self):
+            raise IndexError(f'Rank out of range: {index}')
+        current = self.__root
+        while True:
+            left_size = self.get_size(current._left)
+            if index < left_size:
+                current = current._left
+            elif index > left_size:
+                index -= left_size + 1
+                current = current._right
+            else:  # index == left_size
+                return current
+
+    def select(self, index: int) -> K:
+        """
+            Returns the key at position index (0-based) in sorted order, i.e. the key
+            with exactly index smaller keys in the tree.
+            :raises IndexError: when index is not between 0 and len(self) - 1.
+            :complexity: see get_tree_node_by_rank(self, index: int) -> BinaryNode
+        """
+        return self.get_tree_node_by_rank(index).key
+
+    def kth(self, k: int) -> K:
+        """
+            Returns the k-th smallest key in the tree, counting from 1.
+            :raises IndexError: when k is not between 1 and len(self).
+            :complexity: see get_tree_node_by_rank(self, index: int) -> BinaryNode
+        """
+        return self.select(k - 1)
+
+    def count_range(self, lo: K, hi: K) -> int:
+        """
+            Number of keys in the range [lo, hi), i.e. lo <= key < hi.
+            :complexity: O(CompK * D) where D is the depth of the tree
+        """
+        if not lo < hi:
+            return 0
+        return self.rank(hi) - self.rank(lo)
+
+    def percentile(self, p: float) -> K:
+        """
+            Returns the key at the p-th percentile (0 <= p <= 100) using the nearest-rank method,
+            e.g. percentile(50) is the median and percentile(99) the p99.
+            :raises ValueError: when p is out of range.
+            :raises IndexError: when the tree is empty.
+            :complexity: see get_tree_node_by_rank(self, index: int) -> BinaryNode
+        """
+        if p < 0 or p > 100:
+            raise ValueError(f'Percentile must be between 0 and 100: {p}')
+        return self.select(max(math.ceil(p / 100 * len(self)) - 1, 0))
+
+    def floor(self, key: K) -> K:
+        """
+            Returns the largest key in the tree that is smaller than or equal to the given key.
+            :raises KeyError: when every key in the tree is larger than the given key.
+            :complexity: O(CompK * D) where D is the depth of the tree
+        """
+        result = None
+        current = self.__root
+        while current is not None:
+            if key < current.key:
+                current = current._left
+            elif key > current.key:
+                result = current
+                current = current._right
+            else:  # key == current.key
+                return current.key
+        if result is None:
+            raise KeyError(f'No key smaller than or equal to: {key}')
+        return result.key
+
+    def ceiling(self, key: K) -> K:
+        """
+            Returns the smallest key in the tree that is larger than or equal to the given key.
+            :raises KeyError: when every key in the tree is smaller than the given key.
+            :complexity: O(CompK * D) where D is the depth of the tree
+        """
+        result = None
+        current = self.__root
+        while current is not None:
+            if key < current.key:
+                result = current
+                current = current._left
+            elif key > current.key:
+                current = current._right
+            else:  # key == current.key
+                return current.key
+        if result is None:
+            raise KeyError(f'No key larger than or equal to: {key}')
+        return result.key
+
     def get_successor(self, current: BinaryNode) -> BinaryNode:
         """
             Get successor of the current node.
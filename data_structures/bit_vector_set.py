@@ -1,6 +1,8 @@
 from __future__ import annotations
 from data_structures.abstract_set import Set
 from data_structures.referential_array import ArrayR
+from data_structures.serialization import StructureWriter, StructureReader
+from typing import BinaryIO
 
 class BitVectorSet(Set[int]):
     """
@@ -13,6 +15,29 @@ class BitVectorSet(Set[int]):
         Set.__init__(self)
         self.__elems = 0
 
+    def dump(self, fp: BinaryIO, compress: bool = False) -> None:
+        """
+        Writes the set to the binary file fp (see data_structures.serialization),
+        as the raw bytes of the bit vector.
+        :complexity: O(M) where M is the largest element of the set.
+        """
+        writer = StructureWriter(fp, "BitVectorSet", compress)
+        writer.write_bytes(self.__elems.to_bytes((self.__elems.bit_length() + 7) // 8, 'little'))
+        writer.close()
+
+    @classmethod
+    def load(cls, fp: BinaryIO) -> BitVectorSet:
+        """
+        Reads a set written by dump from the binary file fp.
+        :raises ValueError: if fp does not hold a dumped BitVectorSet.
+        :complexity: O(M) where M is the largest element of the set.
+        """
+        reader = StructureReader(fp, "BitVectorSet")
+        result = cls()
+        result.__elems = int.from_bytes(reader.read_bytes(), 'little')
+        reader.close()
+        return result
+
     def clear(self) -> None:
         """ Makes the set empty. """
         self.__elems = 0
@@ -1,5 +1,9 @@
+from __future__ import annotations
 from data_structures.abstract_queue import Queue, T
 from data_structures.referential_array import ArrayR
+from data_structures.typed_array import TypedArray, ARRAY_TYPES
+from data_structures.serialization import StructureWriter, StructureReader
+from typing import BinaryIO
 
 
 class CircularQueue(Queue[T]):
@@ -9,13 +13,14 @@ class CircularQueue(Queue[T]):
          length (int): number of elements in the stack (inherited)
          front (int): index of the element at the front of the queue
          rear (int): index of the first empty space at the back of the queue
-         array (ArrayR[T]): array storing the elements of the queue
+         array (ArrayR[T] or TypedArray[T]): array storing the elements of the queue
     """
 
-    def __init__(self, max_capacity: int) -> None:
+    def __init__(self, max_capacity: int, array_type: type[ArrayR] | type[TypedArray] = ArrayR) -> None:
         """
         Constructor for the CircularQueue class.
         :param max_capacity: maximum capacity of the queue
+        :param array_type: ArrayR, or one of the typed arrays of data_structures.typed_array to store numbers compactly
         :complexity: O(max_capacity) due to the creation of the array
         """
         if max_capacity <= 0:
@@ -25,7 +30,37 @@ class CircularQueue(Queue[T]):
         self.__front = 0
         self.__rear = 0
         self.__length = 0
-        self.__array = ArrayR(max_capacity)
+        self.__array = array_type(max_capacity)
+
+    def dump(self, fp: BinaryIO, compress: bool = False) -> None:
+        """ Writes the queue, and its capacity, to the binary file fp (see data_structures.serialization).
+        The elements are written from the front of the queue to the rear.
+        :complexity: O(N) where N is the number of elements in the queue
+        """
+        writer = StructureWriter(fp, "CircularQueue", compress)
+        writer.write(type(self.__array).__name__)
+        writer.write(len(self.__array))
+        writer.write(self.__length)
+        for i in range(self.__length):
+            writer.write(self.__array[(self.__front + i) % len(self.__array)])
+        writer.close()
+
+    @classmethod
+    def load(cls, fp: BinaryIO) -> CircularQueue[T]:
+        """ Reads a queue written by dump from the binary file fp, with the same capacity and type of array.
+        The front of the loaded queue is at the start of its array.
+        :raises ValueError: if fp does not hold a dumped CircularQueue
+        :complexity: O(C) where C is the capacity of the queue
+        """
+        reader = StructureReader(fp, "CircularQueue")
+        array_type = ARRAY_TYPES[reader.read()]
+        result = cls(reader.read(), array_type)
+        result.__length = reader.read()
+        for i in range(result.__length):
+            result.__array[i] = reader.read()
+        result.__rear = result.__length % len(result.__array)
+        reader.close()
+        return result
 
     def append(self, item: T) -> None:
         """ Adds an element to the rear of the queue.
@@ -1,16 +1,49 @@
 from __future__ import annotations
-from typing import TypeVar, Tuple
+from array import array
+from typing import TypeVar, Tuple, Callable, Iterable, BinaryIO
 from data_structures.abstract_hash_table import HashTable
 from data_structures.referential_array import ArrayR
+from data_structures.array_list import ArrayList
+from data_structures.hashing import default_hash
+from data_structures.serialization import StructureWriter, StructureReader, qualified_name
 
+K = TypeVar('K')
 V = TypeVar('V')
 
 
-class LinearProbeTable(HashTable[str, V]):
+class LinearProbeTable(HashTable[K, V]):
     """
     Linear Probe Table.
     Defines a Hash Table using Linear Probing for conflict resolution.
-    If you want to use this with a different key type, you should override the hash function.
+    Keys can be of any type supported by the hasher, which by default picks a hash function
+    suited to the type of each key (see data_structures.hashing.default_hash).
+
+    The hasher returns a full width hash of the key (see data_structures.hashing), which is
+    stored next to every entry. Resizing the table then only needs to reduce the stored hashes
+    modulo the new size, and probing can skip any entry whose stored hash differs without
+    comparing the keys.
+
+    Entries are stored in three parallel arrays (columns) indexed by position: the keys, the
+    values and the hashes. Updating the value of a key only writes to the values array, without
+    allocating a (key, value) tuple, and the hashes are kept as unboxed 64 bit integers, which
+    takes less memory than a tuple and an int object per entry. The hasher must therefore return
+    hashes below 2^64, as all the hashers in data_structures.hashing do, and None cannot be a key,
+    as it marks the empty positions of the keys array.
+
+    Other probe strategies can be selected with the probe argument of the constructor:
+        - QUADRATIC_PROBING: tries home + 1, home + 4, home + 9, ... from the home position.
+        - DOUBLE_HASHING: steps through the table by a key dependent amount (see hash2).
+        - ROBIN_HOOD: linear probing where an insertion takes the slot of any entry that is closer
+          to its own home position, which keeps probe lengths short even at high load factors.
+          Lookups stop as soon as they pass where the key would have been placed.
+    The table grows once more than max_load_factor of its slots are in use (including tombstones).
+
+    Deletion either rehashes the rest of the cluster (the default), or, when the table is
+    created with tombstones=True, leaves a tombstone marker in the slot. Tombstones are skipped
+    by lookups and reused by insertions, and are cleared by rebuilding the table in place once
+    they take up more than TOMBSTONE_RATIO of it, making deletion O(K) amortised.
+    Quadratic probing and double hashing always use tombstones, as rehashing the cluster only
+    works for linear probing. Robin Hood hashing shifts the following entries back one slot instead.
     
     Type Arguments:
         - V:    Value Type.
@@ -18,41 +51,93 @@ class LinearProbeTable(HashTable[str, V]):
     Unless stated otherwise, all methods have O(1) complexity.
     """
 
-    # No test case should exceed 1 million entries.
-    TABLE_SIZES = [5, 13, 29, 53, 97, 193, 389, 769, 1543, 3079, 6151, 12289, 24593, 49157, 98317, 196613, 393241, 786433, 1572869]
-    HASH_BASE = 31
+    # No test case should exceed 1 million entries (which needs a table of over 2 million slots at the default load factor).
+    TABLE_SIZES = [5, 13, 29, 53, 97, 193, 389, 769, 1543, 3079, 6151, 12289, 24593, 49157, 98317, 196613, 393241,
+                   786433, 1572869, 3145739, 6291469]
+    TOMBSTONE_RATIO = 0.25
 
-    def __init__(self, sizes = None) -> None:
+    LINEAR_PROBING = "linear"
+    QUADRATIC_PROBING = "quadratic"
+    DOUBLE_HASHING = "double"
+    ROBIN_HOOD = "robin_hood"
+    PROBE_STRATEGIES = (LINEAR_PROBING, QUADRATIC_PROBING, DOUBLE_HASHING, ROBIN_HOOD)
+
+    # Marker left in the array by deletions when using tombstones.
+    __TOMBSTONE = object()
+
+    def __init__(self, sizes = None, tombstones: bool = False, probe: str = LINEAR_PROBING,
+                 max_load_factor: float = 0.5, hasher: Callable[[K], int] = default_hash) -> None:
         """
         Constructor for the LinearProbeTable class.
         :param sizes: Optional list of sizes to use for the hash table.
                       If not provided, a default list of sizes will be used.
+                      Quadratic probing and double hashing need the sizes to be prime.
+        :param tombstones: Whether deletions should leave tombstones instead of
+                      rehashing the rest of the cluster.
+        :param probe: One of PROBE_STRATEGIES.
+        :param max_load_factor: Fraction of the table that can be used before it grows.
+                      Must be at most 0.5 for quadratic probing, which is only guaranteed to find
+                      a free slot in a half full table.
+        :param hasher: Function returning a non-negative full width hash of a key.
+        :raises ValueError: if the combination of arguments is not supported.
         :complexity: O(1) - Assuming the default sizes are used, we can assume the array is created in O(1) time.
             If you use this function in any way that passes some variable input for the sizes, then the complexity
             needs to change accordingly.
         """
+        if probe not in self.PROBE_STRATEGIES:
+            raise ValueError(f"Unknown probe strategy: {probe}")
+        if not 0 < max_load_factor < 1:
+            raise ValueError("Load factor should be between 0 and 1.")
+        if probe == self.QUADRATIC_PROBING and max_load_factor > 0.5:
+            raise ValueError("Quadratic probing needs a load factor of at most 0.5.")
+        if probe == self.ROBIN_HOOD and tombstones:
+            raise ValueError("Robin Hood hashing deletes by shifting entries and does not use tombstones.")
         if sizes is not None:
             self.TABLE_SIZES = sizes
 
         self.__size_index = 0
-        self.__array: ArrayR[tuple[str, V]] = ArrayR(self.TABLE_SIZES[self.__size_index])
+        self.__keys: ArrayR[K] = ArrayR(self.TABLE_SIZES[self.__size_index])
+        self.__values: ArrayR[V] = ArrayR(self.table_size)
+        self.__hashes = self.__new_hashes(self.table_size)
+        self.__hasher = hasher
         self.__length = 0
+        self.__probe_strategy = probe
+        self.__max_load_factor = max_load_factor
+        self.__use_tombstones = tombstones or probe in (self.QUADRATIC_PROBING, self.DOUBLE_HASHING)
+        self.__tombstones = 0
 
-    def hash(self, key: str) -> int:
+    def hash(self, key: K) -> int:
         """
         Hash a key for insert/retrieve/update into the hashtable.
         :complexity: O(K) where K is the length of the key.
         """
-        value = 0
-        a = 31415
-        for char in key:
-            value = (ord(char) + a * value) % self.table_size
-            a = a * self.HASH_BASE % (self.table_size - 1)
-        return value
+        return self.__hasher(key) % self.table_size
+
+    def hash2(self, key: K) -> int:
+        """
+        Secondary hash, used as the step between positions for double hashing.
+        It uses the bits of the full width hash that are not used by hash().
+        :returns: a step between 1 and table_size - 1, so that every position
+            is visited when the table size is prime.
+        :complexity: O(K) where K is the length of the key.
+        """
+        return self.__step(self.__hasher(key))
+
+    def __step(self, key_hash: int) -> int:
+        """ Step for double hashing from a full width hash. See hash2. """
+        return 1 + key_hash // self.table_size % (self.table_size - 1)
+
+    @staticmethod
+    def __new_hashes(size: int) -> array:
+        """
+        Returns an array of size unsigned 64 bit integers, to hold the full width hashes of the keys.
+        :complexity: O(size)
+        """
+        return array('Q', bytes(8 * size))
 
     @property
     def table_size(self) -> int:
-        return len(self.__array)
+        return len(self.__keys)
 
     def __len__(self) -> int:
         """
@@ -60,40 +145,135 @@ class LinearProbeTable(HashTable[str, V]):
         """
         return self.__length
 
-    def __linear_probe(self, key: str, is_insert: bool) -> int:
+    def __probe(self, key: K, key_hash: int, is_insert: bool) -> int:
         """
-        Find the correct position for this key in the hash table using linear probing.
+        Find the correct position for this key in the hash table using the probe strategy of the table.
+        key_hash is the full width hash of the key.
         :complexity: 
-            Best: O(K) happens when we hash the key and the position is empty.
-            Worst: O(N + K) happens when we hash the key but the position is taken and we have to
+            Best: O(1) happens when the position is empty.
+            Worst: O(N + K) happens when the position is taken and we have to
                 search the entire table.
             N is the number of items in the table.
             K is the length of the key.
         :raises KeyError: When the key is not in the table, but is_insert is False.
         :raises FullError: When a table is full and cannot be inserted.
         """
-        # Initial position
-        position = self.hash(key)
-
+        if self.__probe_strategy == self.QUADRATIC_PROBING:
+            return self.__quadratic_probe(key, key_hash, is_insert)
+        if self.__probe_strategy == self.ROBIN_HOOD:
+            return self.__robin_hood_probe(key, key_hash, is_insert)
+        step = self.__step(key_hash) if self.__probe_strategy == self.DOUBLE_HASHING else 1
+        return self.__step_probe(key, key_hash, is_insert, step)
+
+    def __step_probe(self, key: K, key_hash: int, is_insert: bool, step: int) -> int:
+        """
+        Probe for linear probing (step 1) and double hashing (a step depending on the key), see __probe.
+        Tombstones are skipped, and the first one on the way is reused by an insertion of a new key.
+        """
+        position = key_hash % self.table_size
+        first_tombstone = None
         for _ in range(self.table_size):
-            if self.__array[position] is None:
-                # Empty spot. Am I upserting or retrieving?
-                if is_insert:
-                    return position
-                else:
-                    raise KeyError(key)
-            elif self.__array[position][0] == key:
+            current = self.__keys[position]
+            if current is None:
+                return self.__not_found(key, is_insert, position if first_tombstone is None else first_tombstone)
+            elif current is self.__TOMBSTONE:
+                if first_tombstone is None:
+                    first_tombstone = position
+            elif self.__hashes[position] == key_hash and current == key:
                 return position
-            else:
-                # Taken by something else. Time to linear probe.
-                position = (position + 1) % self.table_size
+            position = (position + step) % self.table_size
+        return self.__not_found(key, is_insert, first_tombstone)
+
+    def __quadratic_probe(self, key: K, key_hash: int, is_insert: bool) -> int:
+        """
+        Probe for quadratic probing, trying home + 1, home + 4, home + 9, ..., see __probe and __step_probe.
+        """
+        position = key_hash % self.table_size
+        first_tombstone = None
+        for distance in range(self.table_size):
+            current = self.__keys[position]
+            if current is None:
+                return self.__not_found(key, is_insert, position if first_tombstone is None else first_tombstone)
+            elif current is self.__TOMBSTONE:
+                if first_tombstone is None:
+                    first_tombstone = position
+            elif self.__hashes[position] == key_hash and current == key:
+                return position
+            # Consecutive squares differ by consecutive odd numbers.
+            position = (position + 2 * distance + 1) % self.table_size
+        return self.__not_found(key, is_insert, first_tombstone)
+
+    def __robin_hood_probe(self, key: K, key_hash: int, is_insert: bool) -> int:
+        """
+        Probe for Robin Hood hashing: linear probing, in a table without tombstones, that stops as
+        soon as it reaches an entry closer to its home position than the key would be, as the key
+        would have taken that slot when it was inserted. See __probe and __robin_hood_insert.
+        """
+        position = key_hash % self.table_size
+        for distance in range(self.table_size):
+            current = self.__keys[position]
+            if current is None:
+                return self.__not_found(key, is_insert, position)
+            elif self.__hashes[position] == key_hash and current == key:
+                return position
+            elif self.__probe_distance(position) < distance:
+                raise KeyError(key)
+            position = (position + 1) % self.table_size
+        return self.__not_found(key, is_insert, None)
 
-        if is_insert:
+    @staticmethod
+    def __not_found(key: K, is_insert: bool, free: int | None) -> int:
+        """
+        Result of a probe that did not find the key: the free position for an insertion
+        (the first tombstone on the way, or else the empty position that ended the probe).
+        :raises KeyError: When is_insert is False.
+        :raises RuntimeError: When inserting and there is no free position.
+        """
+        if not is_insert:
+            raise KeyError(key)
+        if free is None:
             raise RuntimeError("Table is full!")
+        return free
+
+    def __probe_distance(self, position: int) -> int:
+        """
+        How many positions away from its home position the entry at position is stored, when using linear probing.
+        """
+        return (position - self.__hashes[position]) % self.table_size
+
+    def __robin_hood_insert(self, key: K, data: V, key_hash: int) -> None:
+        """
+        Insert a (key, value) pair using Robin Hood hashing.
+        The pair being inserted swaps places with any entry that is closer to its home
+        position than the pair is to its own, after which the displaced entry continues
+        probing in its place.
+        :complexity: Same as probe.
+        """
+        try:
+            position = self.__probe(key, key_hash, False)
+        except KeyError:
+            pass
         else:
-            raise KeyError(key)
+            self.__values[position] = data
+            return
+
+        distance = 0
+        position = key_hash % self.table_size
+        while self.__keys[position] is not None:
+            entry_distance = self.__probe_distance(position)
+            if entry_distance < distance:
+                key, self.__keys[position] = self.__keys[position], key
+                data, self.__values[position] = self.__values[position], data
+                key_hash, self.__hashes[position] = self.__hashes[position], key_hash
+                distance = entry_distance
+            position = (position + 1) % self.table_size
+            distance += 1
+        self.__keys[position] = key
+        self.__values[position] = data
+        self.__hashes[position] = key_hash
+        self.__length += 1
 
-    def items(self) -> ArrayR[Tuple[str, V]]:
+    def items(self) -> ArrayR[Tuple[K, V]]:
         """
         Returns all keys in the hash table.
         :complexity: O(N) where N is the table size.
@@ -101,12 +281,12 @@ class LinearProbeTable(HashTable[str, V]):
         res = ArrayR(self.__length)
         i = 0
         for x in range(self.table_size):
-            if self.__array[x] is not None:
-                res[i] = self.__array[x]
+            if self.__keys[x] is not None and self.__keys[x] is not self.__TOMBSTONE:
+                res[i] = (self.__keys[x], self.__values[x])
                 i += 1
         return res
 
-    def keys(self) -> ArrayR[str]:
+    def keys(self) -> ArrayR[K]:
         """
         Returns all keys in the hash table.
         :complexity: O(N) where N is the table size.
@@ -114,8 +294,8 @@ class LinearProbeTable(HashTable[str, V]):
         res = ArrayR(self.__length)
         i = 0
         for x in range(self.table_size):
-            if self.__array[x] is not None:
-                res[i] = self.__array[x][0]
+            if self.__keys[x] is not None and self.__keys[x] is not self.__TOMBSTONE:
+                res[i] = self.__keys[x]
                 i += 1
         return res
 
@@ -128,16 +308,16 @@ class LinearProbeTable(HashTable[str, V]):
         res = ArrayR(self.__length)
         i = 0
         for x in range(self.table_size):
-            if self.__array[x] is not None:
-                res[i] = self.__array[x][1]
+            if self.__keys[x] is not None and self.__keys[x] is not self.__TOMBSTONE:
+                res[i] = self.__values[x]
                 i += 1
         return res
 
-    def __contains__(self, key: str) -> bool:
+    def __contains__(self, key: K) -> bool:
         """
         Checks to see if the given key is in the Hash Table
 
-        :complexity: See linear probe.
+        :complexity: See probe.
         """
         try:
             _ = self[key]
@@ -146,37 +326,62 @@ class LinearProbeTable(HashTable[str, V]):
         else:
             return True
 
-    def __getitem__(self, key: str) -> V:
+    def __getitem__(self, key: K) -> V:
         """
         Get the value at a certain key
 
-        :complexity: See linear probe.
+        :complexity: See probe.
         :raises KeyError: when the key doesn't exist.
         """
-        position = self.__linear_probe(key, False)
-        return self.__array[position][1]
+        position = self.__probe(key, self.__hasher(key), False)
+        return self.__values[position]
 
-    def __setitem__(self, key: str, data: V) -> None:
+    def __setitem__(self, key: K, data: V) -> None:
         """
         Set an (key, value) pair in our hash table.
 
         :complexity:
-            Best: Same as linear probe, when no rehashing is needed.
+            Best: Same as probe, when no rehashing is needed.
             Worst: Same as __rehash.
         :raises FullError: when the table cannot be resized further.
+        :raises ValueError: when the key is None.
         """
+        if key is None:
+            raise ValueError("None cannot be used as a key.")
+        self.__insert(key, data, self.__hasher(key))
 
-        position = self.__linear_probe(key, True)
-
-        if self.__array[position] is None:
-            self.__length += 1
-
-        self.__array[position] = (key, data)
+    def __insert(self, key: K, data: V, key_hash: int) -> None:
+        """
+        Set a (key, value) pair, given the full width hash of the key.
+        :complexity: See __setitem__, without the cost of hashing the key.
+        """
+        if self.__probe_strategy == self.ROBIN_HOOD:
+            self.__robin_hood_insert(key, data, key_hash)
+        else:
+            position = self.__probe(key, key_hash, True)
 
-        if len(self) > self.table_size / 2:
-            self.__rehash()
+            if self.__keys[position] is None:
+                self.__length += 1
+            elif self.__keys[position] is self.__TOMBSTONE:
+                self.__length += 1
+                self.__tombstones -= 1
+            else:
+                # Updating an existing key only needs the new value.
+                self.__values[position] = data
+                return
+
+            self.__keys[position] = key
+            self.__values[position] = data
+            self.__hashes[position] = key_hash
+
+        if len(self) + self.__tombstones > self.table_size * self.__max_load_factor:
+            if len(self) <= self.__tombstones:
+                # Mostly tombstones, clearing them frees enough space.
+                self.__compact()
+            else:
+                self.__rehash()
 
-    def __delitem__(self, key: str) -> None:
+    def __delitem__(self, key: K) -> None:
         """
         Deletes a (key, value) pair in our hash table.
 
@@ -185,25 +390,192 @@ class LinearProbeTable(HashTable[str, V]):
             Worst: O(N * (N + K)) when the key is at the beginning of a large cluster and we have to effectively
                 rehash all elements. And each element has to linear probe over all (or a factor of) other elements currently
                 in the table. This is assuming K here is representing an average key length.
+            With tombstones: same as probe, plus O(N * K) amortised over the deletions
+                whenever the table is compacted.
+            With Robin Hood hashing: same as probe, plus O(1) for each entry shifted back.
             N is the number of items in the table.
             K is the length of the key.
 
         :raises KeyError: when the key doesn't exist.
         """
-        position = self.__linear_probe(key, False)
-        # Remove the element
-        self.__array[position] = None
+        position = self.__probe(key, self.__hasher(key), False)
         self.__length -= 1
+        self.__values[position] = None
+        if self.__use_tombstones:
+            self.__keys[position] = self.__TOMBSTONE
+            self.__tombstones += 1
+            if self.__tombstones > self.table_size * self.TOMBSTONE_RATIO:
+                self.__compact()
+            return
+
+        if self.__probe_strategy == self.ROBIN_HOOD:
+            # Shift the rest of the cluster back by one, up to the first entry in its home position.
+            next_position = (position + 1) % self.table_size
+            while self.__keys[next_position] is not None and self.__probe_distance(next_position) > 0:
+                self.__keys[position] = self.__keys[next_position]
+                self.__values[position] = self.__values[next_position]
+                self.__hashes[position] = self.__hashes[next_position]
+                position = next_position
+                next_position = (next_position + 1) % self.table_size
+            self.__keys[position] = None
+            self.__values[position] = None
+            return
+
+        # Remove the element
+        self.__keys[position] = None
         # Start moving over the cluster
         position = (position + 1) % self.table_size
-        while self.__array[position] is not None:
-            key2, value = self.__array[position]
-            self.__array[position] = None
+        while self.__keys[position] is not None:
+            key2 = self.__keys[position]
+            value = self.__values[position]
+            key2_hash = self.__hashes[position]
+            self.__keys[position] = None
+            self.__values[position] = None
             # Reinsert.
-            newpos = self.__linear_probe(key2, True)
-            self.__array[newpos] = (key2, value)
+            newpos = self.__probe(key2, key2_hash, True)
+            self.__keys[newpos] = key2
+            self.__values[newpos] = value
+            self.__hashes[newpos] = key2_hash
             position = (position + 1) % self.table_size
 
+    def reserve(self, n: int) -> None:
+        """
+        Grows the table, rebuilding it once, to the smallest size that holds n entries
+        without exceeding the maximum load factor. Never shrinks the table.
+        :complexity: Same as __rehash if the table grows, O(1) otherwise.
+        """
+        size_index = self.__size_index
+        while n > self.TABLE_SIZES[size_index] * self.__max_load_factor and size_index + 1 < len(self.TABLE_SIZES):
+            size_index += 1
+        if size_index != self.__size_index:
+            self.__size_index = size_index
+            self.__reinsert_all(self.TABLE_SIZES[size_index])
+
+    def update(self, items: ArrayR[Tuple[K, V]] | ArrayList[Tuple[K, V]] | Iterable[Tuple[K, V]]) -> None:
+        """
+        Sets every (key, value) pair of items. The table is grown for all of them first,
+        so it is resized at most once.
+        :complexity: O(M) plus the cost of probing for every key, where M is the number of pairs,
+            plus the cost of __rehash if the table grows.
+        :raises ValueError: when one of the keys is None.
+        """
+        if not isinstance(items, (ArrayR, ArrayList)):
+            items = ArrayR.from_list(list(items))
+        self.reserve(len(self) + len(items))
+        hasher = self.__hasher
+        for i in range(len(items)):
+            key, data = items[i]
+            if key is None:
+                raise ValueError("None cannot be used as a key.")
+            self.__insert(key, data, hasher(key))
+
+    def get_many(self, keys: ArrayR[K] | ArrayList[K] | Iterable[K]) -> ArrayR[V]:
+        """
+        Returns the values of all the given keys, in the same order.
+        :complexity: O(M) plus the cost of probing for every key, where M is the number of keys.
+        :raises KeyError: when one of the keys doesn't exist.
+        """
+        if not isinstance(keys, (ArrayR, ArrayList)):
+            keys = ArrayR.from_list(list(keys))
+        result = ArrayR(len(keys))
+        hasher = self.__hasher
+        for i in range(len(keys)):
+            key = keys[i]
+            result[i] = self.__values[self.__probe(key, hasher(key), False)]
+        return result
+
+    def delete_many(self, keys: ArrayR[K] | ArrayList[K] | Iterable[K]) -> None:
+        """
+        Deletes all the given keys.
+        Every key is replaced by a tombstone, and, unless the table uses tombstones anyway,
+        the table is then rebuilt once, rather than rehashing a cluster after every deletion.
+        Small batches (compared to the number of entries) are deleted one at a time instead,
+        as rebuilding the whole table would cost more.
+        :complexity: O(M) plus the cost of probing for every key, where M is the number of keys,
+            plus the cost of __compact.
+        :raises KeyError: when one of the keys doesn't exist. The keys before it are still deleted.
+        """
+        if not isinstance(keys, (ArrayR, ArrayList)):
+            keys = ArrayR.from_list(list(keys))
+        if not self.__use_tombstones and len(keys) < len(self) * self.TOMBSTONE_RATIO:
+            for i in range(len(keys)):
+                del self[keys[i]]
+            return
+
+        hasher = self.__hasher
+        try:
+            for i in range(len(keys)):
+                key = keys[i]
+                position = self.__probe(key, hasher(key), False)
+                self.__keys[position] = self.__TOMBSTONE
+                self.__values[position] = None
+                self.__length -= 1
+                self.__tombstones += 1
+        finally:
+            if self.__tombstones > 0 and \
+                    (not self.__use_tombstones or self.__tombstones > self.table_size * self.TOMBSTONE_RATIO):
+                self.__compact()
+
+    def dump(self, fp: BinaryIO, compress: bool = False) -> None:
+        """
+        Writes the table to the binary file fp (see data_structures.serialization), including
+        its settings and the position and stored hash of every entry, so that loading it
+        does not hash or compare any keys. The hasher is recorded by name only.
+        :complexity: O(S) where S is the table size.
+        """
+        writer = StructureWriter(fp, "LinearProbeTable", compress)
+        writer.write(list(self.TABLE_SIZES))
+        writer.write((self.__size_index, self.__probe_strategy, self.__use_tombstones, self.__max_load_factor))
+        writer.write(qualified_name(self.__hasher))
+        writer.write((self.__length, self.__tombstones))
+        writer.write_bytes(self.__hashes.tobytes())
+        # Kind of every slot: 0 when empty, 1 for an entry and 2 for a tombstone.
+        kinds = bytearray(self.table_size)
+        for position in range(self.table_size):
+            key = self.__keys[position]
+            if key is self.__TOMBSTONE:
+                kinds[position] = 2
+            elif key is not None:
+                kinds[position] = 1
+        writer.write_bytes(kinds)
+        for position in range(self.table_size):
+            if kinds[position] == 1:
+                writer.write(self.__keys[position])
+                writer.write(self.__values[position])
+        writer.close()
+
+    @classmethod
+    def load(cls, fp: BinaryIO, hasher: Callable[[K], int] = default_hash) -> LinearProbeTable[K, V]:
+        """
+        Reads a table written by dump from the binary file fp, with the same size and layout.
+        :param hasher: The hasher the table was dumped with.
+        :raises ValueError: if fp does not hold a dumped LinearProbeTable, or it was dumped
+            with a different hasher.
+        :complexity: O(S) where S is the table size.
+        """
+        reader = StructureReader(fp, "LinearProbeTable")
+        sizes = reader.read()
+        size_index, probe, use_tombstones, max_load_factor = reader.read()
+        dumped_hasher = reader.read()
+        if dumped_hasher != qualified_name(hasher):
+            raise ValueError(f"The table was dumped with the hasher {dumped_hasher}.")
+        table = cls(sizes, use_tombstones and probe != cls.ROBIN_HOOD, probe, max_load_factor, hasher)
+        table.__size_index = size_index
+        table.__length, table.__tombstones = reader.read()
+        table.__hashes = cls.__new_hashes(0)
+        table.__hashes.frombytes(reader.read_bytes())
+        kinds = reader.read_bytes()
+        table.__keys = ArrayR(len(kinds))
+        table.__values = ArrayR(len(kinds))
+        for position in range(len(kinds)):
+            if kinds[position] == 1:
+                table.__keys[position] = reader.read()
+                table.__values[position] = reader.read()
+            elif kinds[position] == 2:
+                table.__keys[position] = cls.__TOMBSTONE
+        reader.close()
+        return table
+
     def is_empty(self) -> bool:
         return self.__length == 0
 
@@ -211,9 +583,10 @@ class LinearProbeTable(HashTable[str, V]):
         """
         Need to resize table and reinsert all values
 
+        The keys are not hashed again, their stored full width hashes are reduced modulo the new size.
+
         :complexity: 
-            Best: O(N * K) happens when all items can be inserted immediately after being hashed
-                with no probing needed.
+            Best: O(N) happens when all items can be inserted immediately with no probing needed.
             Worst: O(N * (N + K)) happens when all items need maximum probing to be inserted in the new table.
                 This is assuming K here is representing an average key length.
             
@@ -223,17 +596,36 @@ class LinearProbeTable(HashTable[str, V]):
                 cost of creating a new table is constant. This assumption can be extended to any table size
                 as long as the sizes are growing by a constant factor (e.g. each table size is almost double the previous one).
         """
-        old_array = self.__array
-        self.__size_index += 1
-        if self.__size_index == len(self.TABLE_SIZES):
+        if self.__size_index + 1 == len(self.TABLE_SIZES):
             # Cannot be resized further.
             return
-        self.__array = ArrayR(self.TABLE_SIZES[self.__size_index])
+        self.__size_index += 1
+        self.__reinsert_all(self.TABLE_SIZES[self.__size_index])
+
+    def __compact(self) -> None:
+        """
+        Reinserts all values into a new table of the same size, clearing all tombstones.
+
+        :complexity: Same as __rehash.
+        """
+        self.__reinsert_all(self.table_size)
+
+    def __reinsert_all(self, new_size: int) -> None:
+        """
+        Moves all entries to new empty columns of new_size positions, reusing their stored hashes.
+        :complexity: Same as __rehash.
+        """
+        old_keys = self.__keys
+        old_values = self.__values
+        old_hashes = self.__hashes
+        self.__keys = ArrayR(new_size)
+        self.__values = ArrayR(new_size)
+        self.__hashes = self.__new_hashes(new_size)
         self.__length = 0
-        for item in old_array:
-            if item is not None:
-                key, value = item
-                self[key] = value
+        self.__tombstones = 0
+        for i in range(len(old_keys)):
+            if old_keys[i] is not None and old_keys[i] is not self.__TOMBSTONE:
+                self.__insert(old_keys[i], old_values[i], old_hashes[i])
 
     def __str__(self) -> str:
         """
@@ -241,8 +633,8 @@ class LinearProbeTable(HashTable[str, V]):
         order).
         """
         result = ""
-        for item in self.__array:
-            if item is not None:
-                (key, value) = item
-                result += "(" + str(key) + "," + str(value) + ")\n"
+        for i in range(self.table_size):
+            key = self.__keys[i]
+            if key is not None and key is not self.__TOMBSTONE:
+                result += "(" + str(key) + "," + str(self.__values[i]) + ")\n"
         return result
@@ -0,0 +1,285 @@
+from __future__ import annotations
+import mmap
+import os
+import pickle
+import struct
+from array import array
+from typing import BinaryIO, TypeVar, Tuple, Callable, Iterable
+from data_structures.abstract_hash_table import HashTable
+from data_structures.hash_table_linear_probing import LinearProbeTable
+from data_structures.referential_array import ArrayR
+from data_structures.array_list import ArrayList
+from data_structures.hashing import default_hash
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+
+class MmapLinearProbeTable(HashTable[K, V]):
+    """
+    Read only Linear Probe Table stored in a file, which is memory mapped rather than loaded.
+
+    A table is written once with build(), after which opening it only maps the file into memory,
+    no matter how many entries it has, and the operating system shares the mapped pages between
+    all the processes that open the same file. Lookups read the slots straight from the mapping.
+
+    File layout (all integers little endian):
+        - Header: MAGIC, the table size and the number of entries.
+        - Slots: table size fixed size records of the full width hash of the key, the offset of the
+          entry in the file, and the lengths of the serialised key and value (EMPTY as the key
+          length for an empty slot). Entries are placed with linear probing, as in LinearProbeTable.
+        - Arena: the key and value of every entry serialised with pickle, one after the other.
+    Keys are only deserialised when their stored hash matches, and values when they are returned.
+
+    The hasher must give the same hashes in every process (default_hash does for strings, integers,
+    bytes and tuples of those, but not for other objects), and the same hasher must be used to build
+    and to open a table. As with pickle, only open files from a trusted source.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    MAGIC = b"LPTMMAP1"
+    HEADER = struct.Struct('<8sQQ')
+    SLOT = struct.Struct('<QQII')
+    EMPTY = 0xFFFFFFFF
+
+    def __init__(self, path: str | os.PathLike, hasher: Callable[[K], int] = default_hash) -> None:
+        """
+        Opens a table written by build().
+        :raises ValueError: if the file is not a table written by build().
+        :complexity: O(1), the file is mapped rather than read.
+        """
+        self.__hasher = hasher
+        self.__file = open(path, 'rb')
+        try:
+            self.__map = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.__file.close()
+            raise ValueError(f"Not a memory mapped hash table: {path}")
+        if len(self.__map) < self.HEADER.size or self.__map[:len(self.MAGIC)] != self.MAGIC:
+            self.__map.close()
+            self.__file.close()
+            raise ValueError(f"Not a memory mapped hash table: {path}")
+        self.__view = memoryview(self.__map)
+        _, self.__table_size, self.__length = self.HEADER.unpack_from(self.__map, 0)
+
+    @staticmethod
+    def build(path: str | os.PathLike, items: ArrayR[Tuple[K, V]] | ArrayList[Tuple[K, V]] | Iterable[Tuple[K, V]],
+              hasher: Callable[[K], int] = default_hash, max_load_factor: float = 0.5) -> MmapLinearProbeTable[K, V]:
+        """
+        Writes the (key, value) pairs of items (the last value given for a key winning) to a new
+        table file at path, and opens it.
+        The table size is the smallest of LinearProbeTable.TABLE_SIZES that keeps the load factor
+        at most max_load_factor.
+        :raises ValueError: if the load factor is not between 0 and 1, or a key is None.
+        :raises RuntimeError: if the pairs do not fit in the largest table size.
+        :complexity: O(N * K) plus the cost of probing, where N is the number of pairs and
+            K is the cost of hashing and serialising a pair.
+        """
+        if not 0 < max_load_factor < 1:
+            raise ValueError("Load factor should be between 0 and 1.")
+        if not isinstance(items, (ArrayR, ArrayList)):
+            items = ArrayR.from_list(list(items))
+
+        sizes = LinearProbeTable.TABLE_SIZES
+        size_index = 0
+        while len(items) > sizes[size_index] * max_load_factor:
+            size_index += 1
+            if size_index == len(sizes):
+                raise RuntimeError("Table is full!")
+        table_size = sizes[size_index]
+
+        slots, hashes, length = MmapLinearProbeTable.__layout(items, hasher, table_size)
+        header = MmapLinearProbeTable.HEADER
+        with open(path, 'wb') as file:
+            file.write(header.pack(MmapLinearProbeTable.MAGIC, table_size, length))
+            records = MmapLinearProbeTable.__write_arena(file, items, slots, hashes)
+            file.seek(header.size)
+            file.write(records)
+        return MmapLinearProbeTable(path, hasher)
+
+    @staticmethod
+    def __layout(items: ArrayR[Tuple[K, V]] | ArrayList[Tuple[K, V]], hasher: Callable[[K], int],
+                 table_size: int) -> Tuple[array, array, int]:
+        """
+        Places the pairs of items in a table of table_size slots with linear probing, as numbers
+        into items, so that repeated keys are found (the last value given for a key winning).
+        :returns: the position in items of the pair in each slot (-1 for an empty slot), the full
+            width hash of the key in each slot, and the number of distinct keys.
+        :raises ValueError: if a key is None.
+        :complexity: O(N * K) plus the cost of probing, where N is the number of pairs and
+            K is the cost of hashing a key.
+        """
+        hashes = array('Q', bytes(8 * table_size))
+        slots = array('q', [-1]) * table_size
+        length = 0
+        for i in range(len(items)):
+            key = items[i][0]
+            if key is None:
+                raise ValueError("None cannot be used as a key.")
+            key_hash = hasher(key)
+            position = key_hash % table_size
+            while slots[position] >= 0 and not (hashes[position] == key_hash and items[slots[position]][0] == key):
+                position = (position + 1) % table_size
+            if slots[position] < 0:
+                length += 1
+            slots[position] = i
+            hashes[position] = key_hash
+        return slots, hashes, length
+
+    @staticmethod
+    def __write_arena(file: BinaryIO, items: ArrayR[Tuple[K, V]] | ArrayList[Tuple[K, V]], slots: array,
+                      hashes: array) -> bytearray:
+        """
+        Writes the pickled key and value of the pair in every slot to the arena of file, which
+        starts after the header and the slot records, and fills in the slot records.
+        :returns: the slot records, to be written after the header.
+        :complexity: O(N * K + S) where N is the number of pairs, K is the cost of pickling a pair
+            and S is the number of slots.
+        """
+        slot = MmapLinearProbeTable.SLOT
+        records = bytearray(slot.size * len(slots))
+        offset = MmapLinearProbeTable.HEADER.size + len(records)
+        file.seek(offset)
+        for position in range(len(slots)):
+            if slots[position] < 0:
+                slot.pack_into(records, position * slot.size, 0, 0, MmapLinearProbeTable.EMPTY, 0)
+                continue
+            key, value = items[slots[position]]
+            key_bytes = pickle.dumps(key, pickle.HIGHEST_PROTOCOL)
+            value_bytes = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            slot.pack_into(records, position * slot.size, hashes[position], offset, len(key_bytes), len(value_bytes))
+            file.write(key_bytes)
+            file.write(value_bytes)
+            offset += len(key_bytes) + len(value_bytes)
+        return records
+
+    def close(self) -> None:
+        """ Unmaps and closes the file. The table cannot be used afterwards. """
+        if self.__view is not None:
+            self.__view.release()
+            self.__view = None
+        self.__map.close()
+        self.__file.close()
+
+    def __enter__(self) -> MmapLinearProbeTable[K, V]:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def table_size(self) -> int:
+        return self.__table_size
+
+    def __len__(self) -> int:
+        """
+        Returns the number of elements in the hash table
+        """
+        return self.__length
+
+    def is_empty(self) -> bool:
+        return self.__length == 0
+
+    def hash(self, key: K) -> int:
+        """
+        Hash a key to its home slot.
+        :complexity: O(K) where K is the length of the key.
+        """
+        return self.__hasher(key) % self.__table_size
+
+    def __slot(self, position: int) -> Tuple[int, int, int, int]:
+        """ Returns the (hash, offset, key length, value length) record of the slot at position. """
+        return self.SLOT.unpack_from(self.__map, self.HEADER.size + position * self.SLOT.size)
+
+    def __probe(self, key: K) -> Tuple[int, int, int, int]:
+        """
+        Finds the record of the slot holding key, with linear probing.
+        :raises KeyError: When the key is not in the table.
+        :complexity:
+            Best: O(K) happens when the position is empty.
+            Worst: O(N * K) happens when we have to probe over every entry and their hashes match.
+            N is the number of entries in the table.
+            K is the cost of hashing or deserialising the key.
+        """
+        key_hash = self.__hasher(key)
+        position = key_hash % self.__table_size
+        for _ in range(self.__table_size):
+            record = self.__slot(position)
+            if record[2] == self.EMPTY:
+                break
+            if record[0] == key_hash and pickle.loads(self.__view[record[1]:record[1] + record[2]]) == key:
+                return record
+            position = (position + 1) % self.__table_size
+        raise KeyError(key)
+
+    def __contains__(self, key: K) -> bool:
+        """
+        Checks to see if the given key is in the Hash Table
+        :complexity: See probe.
+        """
+        try:
+            self.__probe(key)
+        except KeyError:
+            return False
+        else:
+            return True
+
+    def __getitem__(self, key: K) -> V:
+        """
+        Get the value at a certain key
+        :complexity: See probe, plus deserialising the value.
+        :raises KeyError: when the key doesn't exist.
+        """
+        _, offset, key_length, value_length = self.__probe(key)
+        start = offset + key_length
+        return pickle.loads(self.__view[start:start + value_length])
+
+    def __setitem__(self, key: K, data: V) -> None:
+        """ :raises TypeError: always, the table is read only. Use build() to write a new one. """
+        raise TypeError("Memory mapped hash tables are read only.")
+
+    def __delitem__(self, key: K) -> None:
+        """ :raises TypeError: always, the table is read only. Use build() to write a new one. """
+        raise TypeError("Memory mapped hash tables are read only.")
+
+    def items(self) -> ArrayR[Tuple[K, V]]:
+        """
+        Returns all (key, value) pairs in the hash table.
+        :complexity: O(S + N * K) where S is the table size, N the number of entries
+            and K the cost of deserialising a pair.
+        """
+        res = ArrayR(self.__length)
+        i = 0
+        for position in range(self.__table_size):
+            _, offset, key_length, value_length = self.__slot(position)
+            if key_length != self.EMPTY:
+                start = offset + key_length
+                res[i] = (pickle.loads(self.__view[offset:start]), pickle.loads(self.__view[start:start + value_length]))
+                i += 1
+        return res
+
+    def keys(self) -> ArrayR[K]:
+        """
+        Returns all keys in the hash table, without deserialising the values.
+        :complexity: O(S + N * K) where S is the table size, N the number of entries
+            and K the cost of deserialising a key.
+        """
+        res = ArrayR(self.__length)
+        i = 0
+        for position in range(self.__table_size):
+            _, offset, key_length, _ = self.__slot(position)
+            if key_length != self.EMPTY:
+                res[i] = pickle.loads(self.__view[offset:offset + key_length])
+                i += 1
+        return res
+
+    def __str__(self) -> str:
+        """
+        Returns all they key/value pairs in our hash table (no particular
+        order).
+        """
+        result = ""
+        for key, value in self.items():
+            result += "(" + str(key) + "," + str(value) + ")\n"
+        return result
@@ -0,0 +1,367 @@
+from __future__ import annotations
+from array import array
+from typing import TypeVar, Tuple, Callable, Iterator, BinaryIO
+from data_structures.abstract_hash_table import HashTable
+from data_structures.referential_array import ArrayR
+from data_structures.hashing import default_hash
+from data_structures.serialization import StructureWriter, StructureReader, qualified_name
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+
+class OrderedHashTable(HashTable[K, V]):
+    """
+    Insertion Ordered Hash Table.
+    Defines a Hash Table that remembers the order in which the keys were first inserted,
+    laid out like the dictionaries of CPython:
+        - The entries are appended, in insertion order, to dense parallel arrays holding
+          the keys, the values and the full width hashes (see data_structures.hashing).
+        - A separate sparse index array, probed with linear probing, maps each position to the
+          number of the entry stored there, EMPTY, or DELETED for a removed entry.
+
+    Iterating over the table only scans the dense arrays, so it is O(N) in the number of
+    entries rather than in the size of the index, and iter_keys, iter_values and iter_items
+    yield the entries lazily without building an ArrayR.
+    Updating the value of an existing key keeps its position in the order.
+
+    Deleting an entry leaves a hole (a None key) in the dense arrays. Both the index and
+    the entries are rebuilt once the dense arrays are full, or once holes outnumber the entries,
+    which keeps iteration O(N) and deletion O(1) amortised.
+    None cannot be a key, as it marks the holes, and the hasher must return hashes below 2^64.
+
+    The table should not be modified while iterating over it.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    TABLE_SIZES = [5, 13, 29, 53, 97, 193, 389, 769, 1543, 3079, 6151, 12289, 24593, 49157, 98317, 196613, 393241,
+                   786433, 1572869, 3145739, 6291469]
+
+    # Markers stored in the index array.
+    EMPTY = -1
+    DELETED = -2
+
+    def __init__(self, sizes = None, max_load_factor: float = 0.5, hasher: Callable[[K], int] = default_hash) -> None:
+        """
+        :param sizes: Optional list of sizes to use for the index array.
+        :param max_load_factor: Fraction of the index array that can be used by entries (including holes)
+            before the table is rebuilt.
+        :param hasher: Function returning a non-negative full width hash of a key.
+        :raises ValueError: if the load factor is not between 0 and 1.
+        :complexity: O(1) when the default sizes are used.
+        """
+        if not 0 < max_load_factor < 1:
+            raise ValueError("Load factor should be between 0 and 1.")
+        if sizes is not None:
+            self.TABLE_SIZES = sizes
+
+        self.__hasher = hasher
+        self.__max_load_factor = max_load_factor
+        self.__length = 0
+        self.__build(0)
+
+    def __capacity(self, table_size: int) -> int:
+        """ Number of entries that fit in the dense arrays for an index of table_size positions. """
+        return max(1, int(table_size * self.__max_load_factor))
+
+    def __build(self, size_index: int) -> None:
+        """
+        Creates an empty index of TABLE_SIZES[size_index] positions and empty dense arrays.
+        :complexity: O(S) where S is the new table size.
+        """
+        self.__size_index = size_index
+        table_size = self.TABLE_SIZES[size_index]
+        capacity = self.__capacity(table_size)
+        self.__indices = array('q', [self.EMPTY]) * table_size
+        self.__keys: ArrayR[K] = ArrayR(capacity)
+        self.__values: ArrayR[V] = ArrayR(capacity)
+        self.__hashes = array('Q', bytes(8 * capacity))
+        # Number of entries appended to the dense arrays, including holes.
+        self.__used = 0
+
+    @property
+    def table_size(self) -> int:
+        return len(self.__indices)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of elements in the hash table
+        """
+        return self.__length
+
+    def is_empty(self) -> bool:
+        return self.__length == 0
+
+    def hash(self, key: K) -> int:
+        """
+        Hash a key for insert/retrieve/update into the index.
+        :complexity: O(K) where K is the length of the key.
+        """
+        return self.__hasher(key) % self.table_size
+
+    def __probe(self, key: K, key_hash: int) -> int:
+        """
+        Finds the position of the index holding the entry for key, or, if the key is not in the
+        table, the position where it should be inserted (the first DELETED position on the way,
+        otherwise the EMPTY position that ended the search).
+        The index always has EMPTY positions, as there are fewer entries (including holes) than positions.
+        :complexity:
+            Best: O(K) happens when the position is empty.
+            Worst: O(N + K) happens when we have to probe over every entry.
+            N is the number of entries in the table, including holes.
+            K is the length of the key.
+        """
+        position = key_hash % self.table_size
+        first_deleted = None
+        while True:
+            entry = self.__indices[position]
+            if entry == self.EMPTY:
+                return position if first_deleted is None else first_deleted
+            elif entry == self.DELETED:
+                if first_deleted is None:
+                    first_deleted = position
+            elif self.__hashes[entry] == key_hash and self.__keys[entry] == key:
+                return position
+            position = (position + 1) % self.table_size
+
+    def __find(self, key: K) -> int:
+        """
+        Returns the number of the entry for key.
+        :raises KeyError: when the key doesn't exist.
+        :complexity: See __probe.
+        """
+        entry = self.__indices[self.__probe(key, self.__hasher(key))]
+        if entry < 0:
+            raise KeyError(key)
+        return entry
+
+    def __contains__(self, key: K) -> bool:
+        """
+        Checks to see if the given key is in the Hash Table
+        :complexity: See __probe.
+        """
+        try:
+            _ = self[key]
+        except KeyError:
+            return False
+        else:
+            return True
+
+    def __getitem__(self, key: K) -> V:
+        """
+        Get the value at a certain key
+        :complexity: See __probe.
+        :raises KeyError: when the key doesn't exist.
+        """
+        return self.__values[self.__find(key)]
+
+    def __setitem__(self, key: K, data: V) -> None:
+        """
+        Set a (key, value) pair in our hash table.
+        A new key is added at the end of the order, while an existing key keeps its place.
+        :complexity:
+            Best: Same as __probe, when no rebuilding is needed.
+            Worst: Same as __rebuild.
+        :raises ValueError: when the key is None.
+        """
+        if key is None:
+            raise ValueError("None cannot be used as a key.")
+        key_hash = self.__hasher(key)
+        position = self.__probe(key, key_hash)
+        entry = self.__indices[position]
+        if entry >= 0:
+            self.__values[entry] = data
+            return
+
+        if self.__used == len(self.__keys):
+            self.__rebuild(self.__length + 1)
+            position = self.__probe(key, key_hash)
+
+        self.__indices[position] = self.__used
+        self.__keys[self.__used] = key
+        self.__values[self.__used] = data
+        self.__hashes[self.__used] = key_hash
+        self.__used += 1
+        self.__length += 1
+
+    def __delitem__(self, key: K) -> None:
+        """
+        Deletes a (key, value) pair in our hash table, leaving a hole in the dense arrays.
+        :complexity: Same as __probe, plus the cost of __rebuild amortised over the deletions
+            since the previous rebuild.
+        :raises KeyError: when the key doesn't exist.
+        """
+        position = self.__probe(key, self.__hasher(key))
+        entry = self.__indices[position]
+        if entry < 0:
+            raise KeyError(key)
+        self.__indices[position] = self.DELETED
+        self.__keys[entry] = None
+        self.__values[entry] = None
+        self.__length -= 1
+
+        if self.__used - self.__length > self.__length:
+            self.__rebuild(self.__length)
+
+    def reserve(self, n: int) -> None:
+        """
+        Rebuilds the table once, if needed, so that n entries fit without rebuilding it again.
+        :complexity: Same as __rebuild if the table is too small, O(1) otherwise.
+        """
+        if len(self.__keys) - self.__used < n - self.__length:
+            self.__rebuild(n)
+
+    def __rebuild(self, count: int) -> None:
+        """
+        Moves the entries, in order and without holes, to a table sized for count entries
+        with room to add half as many again, growing or shrinking the index as needed.
+        The stored hashes are reused, so no key is hashed again.
+        :raises RuntimeError: when no table size is large enough for count entries.
+        :complexity: O(S + N) where S is the new table size and N is the number of entries,
+            including holes. Since the table sizes grow by a constant factor, S is O(N).
+        """
+        size_index = 0
+        while self.__capacity(self.TABLE_SIZES[size_index]) < count + count // 2:
+            size_index += 1
+            if size_index == len(self.TABLE_SIZES):
+                if self.__capacity(self.TABLE_SIZES[-1]) < count:
+                    raise RuntimeError("Table is full!")
+                size_index -= 1
+                break
+
+        old_keys = self.__keys
+        old_values = self.__values
+        old_hashes = self.__hashes
+        old_used = self.__used
+        self.__build(size_index)
+        for i in range(old_used):
+            key = old_keys[i]
+            if key is not None:
+                key_hash = old_hashes[i]
+                position = key_hash % self.table_size
+                while self.__indices[position] != self.EMPTY:
+                    position = (position + 1) % self.table_size
+                self.__indices[position] = self.__used
+                self.__keys[self.__used] = key
+                self.__values[self.__used] = old_values[i]
+                self.__hashes[self.__used] = key_hash
+                self.__used += 1
+
+    def dump(self, fp: BinaryIO, compress: bool = False) -> None:
+        """
+        Writes the table to the binary file fp (see data_structures.serialization): its settings,
+        the index and stored hashes as raw bytes, and the entries in order (holes included),
+        so that loading it does not hash or compare any keys. The hasher is recorded by name only.
+        :complexity: O(S + N) where S is the table size and N the number of entries, including holes.
+        """
+        writer = StructureWriter(fp, "OrderedHashTable", compress)
+        writer.write(list(self.TABLE_SIZES))
+        writer.write(self.__max_load_factor)
+        writer.write(qualified_name(self.__hasher))
+        writer.write((self.__size_index, self.__length, self.__used))
+        writer.write_bytes(self.__indices.tobytes())
+        writer.write_bytes(self.__hashes[:self.__used].tobytes())
+        for i in range(self.__used):
+            writer.write(self.__keys[i])
+            writer.write(self.__values[i])
+        writer.close()
+
+    @classmethod
+    def load(cls, fp: BinaryIO, hasher: Callable[[K], int] = default_hash) -> OrderedHashTable[K, V]:
+        """
+        Reads a table written by dump from the binary file fp, with the same size and order.
+        :param hasher: The hasher the table was dumped with.
+        :raises ValueError: if fp does not hold a dumped OrderedHashTable, or it was dumped
+            with a different hasher.
+        :complexity: O(S + N) where S is the table size and N the number of entries, including holes.
+        """
+        reader = StructureReader(fp, "OrderedHashTable")
+        sizes = reader.read()
+        max_load_factor = reader.read()
+        dumped_hasher = reader.read()
+        if dumped_hasher != qualified_name(hasher):
+            raise ValueError(f"The table was dumped with the hasher {dumped_hasher}.")
+        table = cls(sizes, max_load_factor, hasher)
+        size_index, table.__length, used = reader.read()
+        table.__build(size_index)
+        table.__indices = array('q', reader.read_bytes())
+        table.__hashes[:used] = array('Q', reader.read_bytes())
+        for i in range(used):
+            table.__keys[i] = reader.read()
+            table.__values[i] = reader.read()
+        table.__used = used
+        reader.close()
+        return table
+
+    def iter_keys(self) -> Iterator[K]:
+        """
+        Lazily yields the keys in insertion order.
+        :complexity: O(N) in total, where N is the number of entries in the table.
+        """
+        for i in range(self.__used):
+            key = self.__keys[i]
+            if key is not None:
+                yield key
+
+    def iter_values(self) -> Iterator[V]:
+        """
+        Lazily yields the values in the insertion order of their keys.
+        :complexity: O(N) in total, where N is the number of entries in the table.
+        """
+        for i in range(self.__used):
+            if self.__keys[i] is not None:
+                yield self.__values[i]
+
+    def iter_items(self) -> Iterator[Tuple[K, V]]:
+        """
+        Lazily yields the (key, value) pairs in insertion order.
+        :complexity: O(N) in total, where N is the number of entries in the table.
+        """
+        for i in range(self.__used):
+            key = self.__keys[i]
+            if key is not None:
+                yield key, self.__values[i]
+
+    def __iter__(self) -> Iterator[K]:
+        """ Iterates over the keys in insertion order, see iter_keys. """
+        return self.iter_keys()
+
+    def items(self) -> ArrayR[Tuple[K, V]]:
+        """
+        Returns all (key, value) pairs in insertion order.
+        :complexity: O(N) where N is the number of entries in the table.
+        """
+        res = ArrayR(self.__length)
+        for i, item in enumerate(self.iter_items()):
+            res[i] = item
+        return res
+
+    def keys(self) -> ArrayR[K]:
+        """
+        Returns all keys in insertion order.
+        :complexity: O(N) where N is the number of entries in the table.
+        """
+        res = ArrayR(self.__length)
+        for i, key in enumerate(self.iter_keys()):
+            res[i] = key
+        return res
+
+    def values(self) -> ArrayR[V]:
+        """
+        Returns all values in the insertion order of their keys.
+        :complexity: O(N) where N is the number of entries in the table.
+        """
+        res = ArrayR(self.__length)
+        for i, value in enumerate(self.iter_values()):
+            res[i] = value
+        return res
+
+    def __str__(self) -> str:
+        """
+        Returns all they key/value pairs in our hash table, in insertion order.
+        """
+        result = ""
+        for key, value in self.iter_items():
+            result += "(" + str(key) + "," + str(value) + ")\n"
+        return result
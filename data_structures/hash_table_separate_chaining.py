@@ -1,36 +1,212 @@
+from __future__ import annotations
+import math
+from array import array
 from data_structures.abstract_hash_table import HashTable
 from data_structures.referential_array import ArrayR
-from data_structures.linked_list import LinkedList
-from typing import TypeVar, Tuple
+from data_structures.array_list import ArrayList
+from data_structures.hashing import default_hash
+from data_structures.serialization import StructureWriter, StructureReader, qualified_name
+from typing import TypeVar, Tuple, Callable, Generic, Iterator, Iterable, BinaryIO
 
+K = TypeVar('K')
 V = TypeVar('V')
 
-class HashTableSeparateChaining(HashTable[str, V]):
+
+class Buckets(Generic[K, V]):
+    """
+    A fixed number of chains of (key, value, hash) entries, used as the table of HashTableSeparateChaining.
+
+    The first entry of every chain is stored inline, at the position of the chain in three
+    parallel arrays holding the keys, the values and the hashes, so a chain of a single entry
+    needs no allocation at all. Any further entries are stored one after the other, ENTRY_SIZE
+    positions each, in a tuple kept at the position of the chain in the overflow array.
+    A tuple is the most compact sequence of objects (an ArrayR of the same length also holds a
+    ctypes array and a dictionary keeping its objects alive), and has no spare room, so adding,
+    removing or updating one of those entries builds a new tuple, which is cheap as chains are
+    short on average.
+    An empty chain has None as its inline key.
+
+    Entries of a chain are referred to by number: 0 for the inline entry and i > 0 for the
+    i-th entry of the overflow array.
     """
-    Separate Chaining Hash Table Implementation using a Linked List.
-    It currently rehashes the primary cluster to handle deletion.
+
+    ENTRY_SIZE = 3
+
+    def __init__(self, size: int) -> None:
+        """
+        Creates size empty chains.
+        :complexity: O(size)
+        """
+        self.__keys: ArrayR[K] = ArrayR(size)
+        self.__values: ArrayR[V] = ArrayR(size)
+        self.__hashes = array('Q', bytes(8 * size))
+        self.__overflow: ArrayR[tuple | None] = ArrayR(size)
+
+    def __len__(self) -> int:
+        """ Returns the number of chains. """
+        return len(self.__keys)
+
+    def find(self, position: int, key: K, key_hash: int) -> int:
+        """
+        Returns the number of the entry for key in the chain at position, or -1 if it is not there.
+        The stored hashes are compared first, so keys are only compared when their hashes match.
+        :complexity: O(L * CompK) where L is the length of the chain.
+        """
+        if self.__keys[position] is None:
+            return -1
+        if self.__hashes[position] == key_hash and self.__keys[position] == key:
+            return 0
+        overflow = self.__overflow[position]
+        if overflow is not None:
+            for index in range(0, len(overflow), self.ENTRY_SIZE):
+                if overflow[index + 2] == key_hash and overflow[index] == key:
+                    return index // self.ENTRY_SIZE + 1
+        return -1
+
+    def get_value(self, position: int, entry: int) -> V:
+        """ Returns the value of the given entry of the chain at position. """
+        if entry == 0:
+            return self.__values[position]
+        return self.__overflow[position][(entry - 1) * self.ENTRY_SIZE + 1]
+
+    def set_value(self, position: int, entry: int, data: V) -> None:
+        """ Overwrites the value of the given entry of the chain at position (in a new tuple for an overflow entry). """
+        if entry == 0:
+            self.__values[position] = data
+        else:
+            overflow = self.__overflow[position]
+            index = (entry - 1) * self.ENTRY_SIZE + 1
+            self.__overflow[position] = overflow[:index] + (data,) + overflow[index + 1:]
+
+    def add(self, position: int, key: K, data: V, key_hash: int) -> None:
+        """
+        Adds an entry to the chain at position. The key should not be in the chain already.
+        :complexity: O(1) if the chain is empty, O(L) otherwise, where L is the length of the chain.
+        """
+        if self.__keys[position] is None:
+            self.__keys[position] = key
+            self.__values[position] = data
+            self.__hashes[position] = key_hash
+            return
+
+        overflow = self.__overflow[position]
+        if overflow is None:
+            self.__overflow[position] = (key, data, key_hash)
+        else:
+            self.__overflow[position] = overflow + (key, data, key_hash)
+
+    def remove(self, position: int, entry: int) -> None:
+        """
+        Removes the given entry from the chain at position.
+        When removing the inline entry, the first overflow entry (if any) takes its place.
+        :complexity: O(1) if the chain has a single entry, O(L) otherwise, where L is the length of the chain.
+        """
+        overflow = self.__overflow[position]
+        if entry == 0:
+            if overflow is None:
+                self.__keys[position] = None
+                self.__values[position] = None
+                return
+            self.__keys[position] = overflow[0]
+            self.__values[position] = overflow[1]
+            self.__hashes[position] = overflow[2]
+            entry = 1
+
+        removed = (entry - 1) * self.ENTRY_SIZE
+        if len(overflow) == self.ENTRY_SIZE:
+            self.__overflow[position] = None
+            return
+        self.__overflow[position] = overflow[:removed] + overflow[removed + self.ENTRY_SIZE:]
+
+    def clear(self, position: int) -> None:
+        """ Removes all the entries of the chain at position. """
+        self.__keys[position] = None
+        self.__values[position] = None
+        self.__overflow[position] = None
+
+    def entries(self, position: int) -> Iterator[Tuple[K, V, int]]:
+        """
+        Yields the (key, value, hash) entries of the chain at position.
+        :complexity: O(L) in total, where L is the length of the chain.
+        """
+        key = self.__keys[position]
+        if key is None:
+            return
+        yield key, self.__values[position], self.__hashes[position]
+        overflow = self.__overflow[position]
+        if overflow is not None:
+            for index in range(0, len(overflow), self.ENTRY_SIZE):
+                yield overflow[index], overflow[index + 1], overflow[index + 2]
+
+
+class HashTableSeparateChaining(HashTable[K, V]):
+    """
+    Separate Chaining Hash Table Implementation.
+    Each chain holds (key, value, hash) entries, where hash is the full width hash of the key
+    returned by the hasher (see data_structures.hashing). The chains are stored in Buckets,
+    which keep the first entry of every chain inline and the rest in a small tuple, so an
+    insertion into an empty chain allocates nothing and updating the value of the first key
+    of a chain overwrites it in place.
+    None cannot be a key, as it marks the empty chains, and the hasher must return hashes below 2^64.
+
+    The table grows (to 2 * size + 1 chains) when the number of items exceeds max_load_factor
+    times the number of chains, and, if min_load_factor is not 0, shrinks (never below the
+    initial size) when it drops below min_load_factor times the number of chains.
+    Resizing is incremental: the old chains are kept and every following insertion or deletion
+    moves MIGRATION_STEP of them into the new table, so no single operation has to move every item.
+    Until a chain has been moved, the keys that hash to it are looked up, inserted and deleted
+    in the old table.
 
     constants:
         DEFAULT_TABLE_SIZE: default table size used in the __init__
-        DEFAULT_HASH_TABLE: default hash base used for the hash function
+        DEFAULT_MAX_LOAD_FACTOR: default load factor above which the table grows
+        MIGRATION_STEP: number of old chains moved to the new table on each insertion/deletion
 
     attributes:
         length: number of elements in the hash table
-        array: used to represent our internal array
+        table: chains of the hash table
+        old_table: chains of the table being resized, or None when not resizing
+        migrated: number of chains of the old table already moved to the new table
     """
 
     DEFAULT_TABLE_SIZE = 17
-    DEFAULT_HASH_BASE = 31
+    DEFAULT_MAX_LOAD_FACTOR = 1.0
+    MIGRATION_STEP = 4
 
-    def __init__(self, table_size: int = DEFAULT_TABLE_SIZE) -> None:
+    def __init__(self, table_size: int = DEFAULT_TABLE_SIZE, hasher: Callable[[K], int] = default_hash,
+                 max_load_factor: float = DEFAULT_MAX_LOAD_FACTOR, min_load_factor: float = 0) -> None:
         """
+        :param hasher: Function returning a non-negative full width hash of a key.
+        :param max_load_factor: Average chain length above which the table grows.
+        :param min_load_factor: Average chain length below which the table shrinks, 0 to never shrink.
+            Should be well below max_load_factor to avoid growing and shrinking back and forth.
+        :raises ValueError: if the table size or the load factors are not valid.
         :complexity: O(N) where N is the table size.
         """
         if table_size <= 0:
             raise ValueError("Table size should be larger than 0.")
-        
+        if max_load_factor <= 0:
+            raise ValueError("Maximum load factor should be larger than 0.")
+        if not 0 <= min_load_factor <= max_load_factor / 4:
+            raise ValueError("Minimum load factor should be between 0 and a quarter of the maximum load factor.")
+
         self.__length = 0
-        self.__table:ArrayR[LinkedList | None] = ArrayR(table_size)
+        self.__table: Buckets[K, V] = Buckets(table_size)
+        self.__old_table: Buckets[K, V] | None = None
+        self.__migrated = 0
+        self.__hasher = hasher
+        self.__initial_size = table_size
+        self.__max_load_factor = max_load_factor
+        self.__min_load_factor = min_load_factor
+
+    @property
+    def table_size(self) -> int:
+        """ Number of chains in the table (the new table while resizing). """
+        return len(self.__table)
+
+    def is_resizing(self) -> bool:
+        """ Whether there are still chains left to move from the old table. """
+        return self.__old_table is not None
 
     def __len__(self) -> int:
         """
@@ -38,57 +214,226 @@ class HashTableSeparateChaining(HashTable[str, V]):
         """
         return self.__length
 
-    def __delitem__(self, key: str) -> None:
+    def __locate(self, key_hash: int) -> Tuple[Buckets[K, V], int]:
+        """
+        Returns the table and the position within it of the chain for a key with the given hash.
+        This is the old table while the chain the key hashes to there has not been moved yet.
+        :complexity: O(1)
+        """
+        if self.__old_table is not None:
+            position = key_hash % len(self.__old_table)
+            if position >= self.__migrated:
+                return self.__old_table, position
+        return self.__table, key_hash % len(self.__table)
+
+    def __delitem__(self, key: K) -> None:
         """
         Deletes an item from our hash table
         :raises KeyError: when the key doesn't exist
         :complexity:
-            Best: O(K) where K is the length of the key (for hashing). Happens when the chain (linked list) does
+            Best: O(K) where K is the length of the key (for hashing). Happens when the chain does
                 not have many elements.
             Worst: O(N + K) where N is the number of items in the hash table and K is the length of the key.
-                Happens when the position has many elements and we have to traverse the linked list.
+                Happens when the position has many elements and we have to traverse and copy the chain.
+            Both cases include moving MIGRATION_STEP chains when resizing, which is O(1) amortised.
         """
-        position = self.hash(key)
-        if self.__table[position] is None:
-            raise KeyError(key)
+        self.__delete(key)
+        self.__shrink()
 
-        for index, item in enumerate(self.__table[position]):
-            if item[0] == key:
-                if len(self.__table[position]) <= 1:
-                    self.__table[position] = None
-                else:
-                    self.__table[position].delete_at_index(index)
+    def __delete(self, key: K) -> None:
+        """
+        Deletes an item, without shrinking the table.
+        :raises KeyError: when the key doesn't exist
+        :complexity: See __delitem__.
+        """
+        key_hash = self.__hasher(key)
+        table, position = self.__locate(key_hash)
+        entry = table.find(position, key, key_hash)
+        if entry < 0:
+            raise KeyError(key)
+        table.remove(position, entry)
 
-                self.__length -= 1
-                return
+        self.__length -= 1
+        self.__migrate(self.MIGRATION_STEP)
 
-        raise KeyError(key)
+    def __shrink(self) -> None:
+        """
+        Starts shrinking the table, if there are fewer than min_load_factor items per chain,
+        to the largest of the sizes obtained by repeatedly halving it that has enough items per chain
+        (but not below the initial size).
+        :complexity: See __start_resize, or O(1) if the table does not shrink.
+        """
+        new_size = len(self.__table)
+        while self.__length < self.__min_load_factor * new_size and new_size > self.__initial_size:
+            new_size = max((new_size - 1) // 2, self.__initial_size)
+        if new_size != len(self.__table):
+            self.__start_resize(new_size)
 
-    def __setitem__(self, key: str, data: V) -> None:
+    def __setitem__(self, key: K, data: V) -> None:
         """
         Set a (key, data) pair in our hash table
+        :raises ValueError: when the key is None.
         :complexity:
             Best: O(K) where K is the length of the key (for hashing). Happens when the position is empty.
             Worst: O(N + K) where N is the number of items in the hash table and K is the length of the key.
-                Happens when the position is not empty and we have to traverse the linked list.
-        """
-        position = self.hash(key)
-        if self.__table[position] is None:
-            self.__table[position] = LinkedList()
-
-        # Attempt to find the key in our linked list
-        if len(self.__table[position]) > 0:
-            for index, item in enumerate(self.__table[position]):
-                if item[0] == key:
-                    # If found update the data
-                    self.__table[position][index] = (key, data)
-                    return
-                
-        # Insert at the beginning for better time complexity
-        self.__table[position].insert(0, (key, data))
+                Happens when the position is not empty and we have to traverse and copy the chain.
+            Both cases include moving MIGRATION_STEP chains when resizing, which is O(1) amortised.
+        """
+        if key is None:
+            raise ValueError("None cannot be used as a key.")
+        key_hash = self.__hasher(key)
+        self.__migrate(self.MIGRATION_STEP)
+        table, position = self.__locate(key_hash)
+
+        # Attempt to find the key in the chain
+        entry = table.find(position, key, key_hash)
+        if entry >= 0:
+            # If found update the data
+            table.set_value(position, entry, data)
+            return
+
+        table.add(position, key, data, key_hash)
         self.__length += 1
 
-    def __contains__(self, key: str) -> bool:
+        if self.__length > self.__max_load_factor * len(self.__table):
+            self.__start_resize(2 * len(self.__table) + 1)
+
+    def reserve(self, n: int) -> None:
+        """
+        Resizes the table, moving every item at once, so that it can hold n items without
+        exceeding the maximum load factor. Never shrinks the table.
+        :complexity: O(N + S) where N is the number of items and S is the new size, or O(1)
+            if the table is already large enough.
+        """
+        needed = math.ceil(n / self.__max_load_factor)
+        if needed > len(self.__table):
+            self.__start_resize(max(needed, 2 * len(self.__table) + 1))
+            self.__migrate(len(self.__old_table))
+
+    def update(self, items: ArrayR[Tuple[K, V]] | ArrayList[Tuple[K, V]] | Iterable[Tuple[K, V]]) -> None:
+        """
+        Sets every (key, value) pair of items. The table is resized for all of them first,
+        so it is resized at most once.
+        :complexity: O(M) plus the cost of setting every pair, where M is the number of pairs,
+            plus the cost of reserve.
+        :raises ValueError: when one of the keys is None.
+        """
+        if not isinstance(items, (ArrayR, ArrayList)):
+            items = ArrayR.from_list(list(items))
+        self.reserve(len(self) + len(items))
+        for i in range(len(items)):
+            key, data = items[i]
+            self[key] = data
+
+    def get_many(self, keys: ArrayR[K] | ArrayList[K] | Iterable[K]) -> ArrayR[V]:
+        """
+        Returns the values of all the given keys, in the same order.
+        :complexity: O(M) plus the cost of looking up every key, where M is the number of keys.
+        :raises KeyError: when one of the keys doesn't exist.
+        """
+        if not isinstance(keys, (ArrayR, ArrayList)):
+            keys = ArrayR.from_list(list(keys))
+        result = ArrayR(len(keys))
+        hasher = self.__hasher
+        for i in range(len(keys)):
+            key = keys[i]
+            key_hash = hasher(key)
+            table, position = self.__locate(key_hash)
+            entry = table.find(position, key, key_hash)
+            if entry < 0:
+                raise KeyError(key)
+            result[i] = table.get_value(position, entry)
+        return result
+
+    def delete_many(self, keys: ArrayR[K] | ArrayList[K] | Iterable[K]) -> None:
+        """
+        Deletes all the given keys. The table is only checked for shrinking once, at the end,
+        so it is resized at most once.
+        :complexity: O(M) plus the cost of deleting every key, where M is the number of keys.
+        :raises KeyError: when one of the keys doesn't exist. The keys before it are still deleted.
+        """
+        try:
+            for key in keys:
+                self.__delete(key)
+        finally:
+            self.__shrink()
+
+    def dump(self, fp: BinaryIO, compress: bool = False) -> None:
+        """
+        Writes the table to the binary file fp (see data_structures.serialization): its settings,
+        its size and every (key, value, hash) entry, so that loading it does not hash or compare
+        any keys. A table in the middle of a resize is written as if the resize had finished.
+        The hasher is recorded by name only.
+        :complexity: O(N + S) where N is the number of items and S is the table size.
+        """
+        writer = StructureWriter(fp, "HashTableSeparateChaining", compress)
+        writer.write((self.__initial_size, self.__max_load_factor, self.__min_load_factor))
+        writer.write(qualified_name(self.__hasher))
+        writer.write((len(self.__table), self.__length))
+        for key, value, key_hash in self.__entries():
+            writer.write(key)
+            writer.write(value)
+            writer.write(key_hash)
+        writer.close()
+
+    @classmethod
+    def load(cls, fp: BinaryIO, hasher: Callable[[K], int] = default_hash) -> HashTableSeparateChaining[K, V]:
+        """
+        Reads a table written by dump from the binary file fp, with the same size.
+        :param hasher: The hasher the table was dumped with.
+        :raises ValueError: if fp does not hold a dumped HashTableSeparateChaining, or it was dumped
+            with a different hasher.
+        :complexity: O(N + S) where N is the number of items and S is the table size.
+        """
+        reader = StructureReader(fp, "HashTableSeparateChaining")
+        initial_size, max_load_factor, min_load_factor = reader.read()
+        dumped_hasher = reader.read()
+        if dumped_hasher != qualified_name(hasher):
+            raise ValueError(f"The table was dumped with the hasher {dumped_hasher}.")
+        table = cls(initial_size, hasher, max_load_factor, min_load_factor)
+        table_size, table.__length = reader.read()
+        table.__table = Buckets(table_size)
+        for _ in range(table.__length):
+            key = reader.read()
+            value = reader.read()
+            key_hash = reader.read()
+            table.__table.add(key_hash % table_size, key, value, key_hash)
+        reader.close()
+        return table
+
+    def __start_resize(self, new_size: int) -> None:
+        """
+        Starts moving the items to a table with new_size chains.
+        If a previous resize is still in progress, it is finished first.
+        :complexity: O(S) where S is the new size, plus the cost of finishing a previous resize.
+        """
+        if self.__old_table is not None:
+            self.__migrate(len(self.__old_table))
+        self.__old_table = self.__table
+        self.__table = Buckets(new_size)
+        self.__migrated = 0
+
+    def __migrate(self, count: int) -> None:
+        """
+        Moves up to count chains of the old table into the new table.
+        The stored hashes are reused, so no key is hashed again.
+        :complexity: O(count + M) where M is the number of items in the moved chains.
+        """
+        old_table = self.__old_table
+        if old_table is None:
+            return
+        old_size = len(old_table)
+        new_size = len(self.__table)
+        while count > 0 and self.__migrated < old_size:
+            for key, value, key_hash in old_table.entries(self.__migrated):
+                self.__table.add(key_hash % new_size, key, value, key_hash)
+            old_table.clear(self.__migrated)
+            self.__migrated += 1
+            count -= 1
+        if self.__migrated == old_size:
+            self.__old_table = None
+
+    def __contains__(self, key: K) -> bool:
         """
         Checks to see if the given key is in the Hash Table
         """
@@ -99,7 +444,7 @@ class HashTableSeparateChaining(HashTable[str, V]):
         else:
             return True
 
-    def __getitem__(self, key: str) -> V:
+    def __getitem__(self, key: K) -> V:
         """
         Get the data associated with a key
         :raises KeyError: when the key doesn't exist
@@ -109,14 +454,12 @@ class HashTableSeparateChaining(HashTable[str, V]):
             Worst: O(N + K) where N is the number of items in the hash table and K is the length of the key.
                 Happens when we have to traverse a long chain to find the key.
         """
-        position = self.hash(key)
-        if self.__table[position] is None:
+        key_hash = self.__hasher(key)
+        table, position = self.__locate(key_hash)
+        entry = table.find(position, key, key_hash)
+        if entry < 0:
             raise KeyError(key)
-        for item in self.__table[position]:
-            if item[0] == key:
-                return item[1]
-
-        raise KeyError(key)
+        return table.get_value(position, entry)
 
     def is_empty(self):
         """
@@ -125,84 +468,78 @@ class HashTableSeparateChaining(HashTable[str, V]):
         """
         return self.__length == 0
 
-    def hash(self, key: str) -> int:
+    def hash(self, key: K) -> int:
         """
-        Universal Hash function
+        Hash function
         :returns: a valid position (0 <= value < table_size) in the hash table
         :complexity: O(K) where K is the length of the key
         """
-        value = 0
-        a = 31415
-        for char in key:
-            value = (ord(char) + a * value) % len(self.__table)
-            a = a * HashTableSeparateChaining.DEFAULT_HASH_BASE % (len(self.__table) - 1)
-        return value
+        return self.__hasher(key) % len(self.__table)
 
-    def insert(self, key: str, data: V) -> None:
+    def insert(self, key: K, data: V) -> None:
         """
         Utility method to call our setitem method
         """
         self[key] = data
 
+    def __entries(self) -> Iterator[Tuple[K, V, int]]:
+        """
+        Iterates over all the (key, value, hash) entries, in both tables while resizing.
+        :complexity: O(N + S) where N is the number of items and S is the table size (of both tables).
+        """
+        for table in (self.__old_table, self.__table):
+            if table is not None:
+                for position in range(len(table)):
+                    yield from table.entries(position)
+
     def __iter__(self):
         """
         Returns an iterator for the hash table
         :complexity: O(N) where N n is the number of items in our hash table
         """
-        for list in self.__table:
-            if list is not None:
-                for item in list:
-                    yield item[1]
+        for entry in self.__entries():
+            yield entry[1]
 
-    def items(self) -> ArrayR[Tuple[str, V]]:
+    def items(self) -> ArrayR[Tuple[K, V]]:
         """
         Returns all keys in the hash table
         :complexity: O(N + S) where N is the number of items in our hash table
-        and S is the table size. Depending on how the table is created, if the table size
-        is not variable (e.g. it's always using the default size), then S can be ignored as
-        a constant, simplifying the complexity to O(N).
+        and S is the table size. Since the table grows with the number of items,
+        S is O(N) (unless it was created with a large initial size), simplifying the complexity to O(N).
         """
         res = ArrayR(self.__length)
         i = 0
-        for list in self.__table:
-            if list is not None:
-                for item in list:
-                    res[i] = item
-                    i += 1
+        for entry in self.__entries():
+            res[i] = (entry[0], entry[1])
+            i += 1
         return res
-    
-    def keys(self) -> ArrayR[str]:
+
+    def keys(self) -> ArrayR[K]:
         """
         Returns all keys in the hash table
         :complexity: O(N + S) where N is the number of items in our hash table
-        and S is the table size. Depending on how the table is created, if the table size
-        is not variable (e.g. it's always using the default size), then S can be ignored as
-        a constant, simplifying the complexity to O(N).
+        and S is the table size. Since the table grows with the number of items,
+        S is O(N) (unless it was created with a large initial size), simplifying the complexity to O(N).
         """
         res = ArrayR(self.__length)
         i = 0
-        for list in self.__table:
-            if list is not None:
-                for item in list:
-                    res[i] = item[0]
-                    i += 1
+        for entry in self.__entries():
+            res[i] = entry[0]
+            i += 1
         return res
 
     def values(self) -> ArrayR[V]:
         """
         Returns all values in the hash table
         :complexity: O(N + S) where N is the number of items in our hash table
-        and S is the table size. Depending on how the table is created, if the table size
-        is not variable (e.g. it's always using the default size), then S can be ignored as
-        a constant, simplifying the complexity to O(N).
+        and S is the table size. Since the table grows with the number of items,
+        S is O(N) (unless it was created with a large initial size), simplifying the complexity to O(N).
         """
         res = ArrayR(self.__length)
         i = 0
-        for list in self.__table:
-            if list is not None:
-                for item in list:
-                    res[i] = item[1]
-                    i += 1
+        for entry in self.__entries():
+            res[i] = entry[1]
+            i += 1
         return res
 
     def __str__(self) -> str:
@@ -211,17 +548,17 @@ class HashTableSeparateChaining(HashTable[str, V]):
         :complexity: O(N) where N is the number of items in our hash table
         """
         result = ""
-        for list in self.__table:
-            if list is not None:
-                first = True
-                for item in list:
-                    if not first:
-                        result += ' -> '
-                    (key, value) = item
-                    result += "(" + str(key) + "," + str(value) + ")"
-                    first = False
-                result += '\n'
+        for table in (self.__old_table, self.__table):
+            if table is not None:
+                for position in range(len(table)):
+                    chain = ""
+                    for key, value, _ in table.entries(position):
+                        if chain:
+                            chain += ' -> '
+                        chain += "(" + str(key) + "," + str(value) + ")"
+                    if chain:
+                        result += chain + '\n'
         return result
-    
+
     def __repr__(self) -> str:
         return str(self)
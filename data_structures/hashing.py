@@ -0,0 +1,101 @@
+"""
+Hash functions used by the hash tables.
+
+The functions here return a "full width" hash: a non-negative integer that does not
+depend on the size of the table. Tables reduce it modulo their size to get a position,
+so they can store the full hash next to each entry and, when resizing, compute the new
+position of every entry without hashing its key again.
+"""
+
+__docformat__ = 'reStructuredText'
+
+# Largest prime below 2^64, so all hashes fit in 64 bits.
+# A Mersenne prime would be cheaper to reduce by, but powers of 256 repeat modulo 2^61 - 1
+# every 61 bytes, which makes periodic strings such as 'x' * 10 and 'x' * 71 collide.
+HASH_MODULUS = (1 << 64) - 59
+HASH_BASE = 31
+
+
+def polynomial_hash(key: str) -> int:
+    """
+    Polynomial rolling hash of the characters of the key, computed with Horner's rule:
+    (c0 * B^(K-1) + c1 * B^(K-2) + ... + c(K-1)) mod HASH_MODULUS.
+    :complexity: O(K) where K is the length of the key, with K Python level loop iterations.
+    """
+    value = 0
+    for char in key:
+        value = (value * HASH_BASE + ord(char)) % HASH_MODULUS
+    return value
+
+
+def string_hash(key: str) -> int:
+    """
+    Fast string hash. The key is encoded to bytes and read as a single base 256 number,
+    which is then reduced modulo HASH_MODULUS.
+    This is also a polynomial hash (with base 256), but all the arithmetic happens inside
+    int.from_bytes and the modulo of Python integers, rather than once per character in Python.
+    :complexity: O(K) where K is the length of the key, but with a very small constant.
+    """
+    return int.from_bytes(key.encode(), 'little') % HASH_MODULUS
+
+
+# Odd 64-bit constant (2^64 divided by the golden ratio), used to spread out integer keys.
+INT_MULTIPLIER = 0x9E3779B97F4A7C15
+
+
+def int_hash(key: int) -> int:
+    """
+    Hash of an integer (or bool) key. The key is multiplied by a large odd constant,
+    so consecutive integers are spread over the table rather than landing in consecutive
+    positions, and the high bits used as the double hashing step differ between them.
+    :complexity: O(1) for integers that fit in a machine word.
+    """
+    return key * INT_MULTIPLIER % HASH_MODULUS
+
+
+def bytes_hash(key: bytes) -> int:
+    """
+    Hash of a bytes key, read as a single base 256 number. See string_hash.
+    :complexity: O(K) where K is the length of the key, but with a very small constant.
+    """
+    return int.from_bytes(key, 'little') % HASH_MODULUS
+
+
+def tuple_hash(key: tuple) -> int:
+    """
+    Hash of a tuple key, combining the default_hash of its elements as a polynomial,
+    so that the order of the elements matters.
+    :complexity: O(sum of the cost of hashing each element)
+    """
+    value = 1
+    for item in key:
+        value = (value * HASH_BASE + default_hash(item)) % HASH_MODULUS
+    return value
+
+
+def object_hash(key) -> int:
+    """
+    Fallback hash for any other hashable key, based on its __hash__ method and spread
+    out like int_hash.
+    Note that Python randomises the built in hash of strings and bytes every run, which
+    is one of the reasons they have their own hashers.
+    :complexity: the complexity of key.__hash__()
+    """
+    return hash(key) * INT_MULTIPLIER % HASH_MODULUS
+
+
+def default_hash(key) -> int:
+    """
+    Picks the hasher for the type of the key: string_hash for strings, int_hash for integers,
+    bytes_hash for bytes, tuple_hash for tuples and object_hash for anything else.
+    :complexity: the complexity of the selected hasher.
+    """
+    if isinstance(key, str):
+        return string_hash(key)
+    elif isinstance(key, int):
+        return int_hash(key)
+    elif isinstance(key, bytes):
+        return bytes_hash(key)
+    elif isinstance(key, tuple):
+        return tuple_hash(key)
+    return object_hash(key)
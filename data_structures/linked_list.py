@@ -1,5 +1,8 @@
+from __future__ import annotations
 from data_structures.abstract_list import List, T
 from data_structures.node import Node
+from data_structures.serialization import StructureWriter, StructureReader
+from typing import BinaryIO
 
 
 class LinkedListIterator:
@@ -139,6 +142,29 @@ class LinkedList(List[T]):
 
         self.__length += 1
 
+    def dump(self, fp: BinaryIO, compress: bool = False) -> None:
+        """ Writes the list to the binary file fp (see data_structures.serialization).
+        :complexity: O(N) where N is the number of items in the list.
+        """
+        writer = StructureWriter(fp, "LinkedList", compress)
+        writer.write(len(self))
+        for item in self:
+            writer.write(item)
+        writer.close()
+
+    @classmethod
+    def load(cls, fp: BinaryIO) -> LinkedList[T]:
+        """ Reads a list written by dump from the binary file fp.
+        :raises ValueError: if fp does not hold a dumped LinkedList.
+        :complexity: O(N) where N is the number of items in the list.
+        """
+        reader = StructureReader(fp, "LinkedList")
+        result = cls()
+        for _ in range(reader.read()):
+            result.append(reader.read())
+        reader.close()
+        return result
+
     def is_empty(self) -> bool:
         """ Check if the list is empty. """
         return len(self) == 0
@@ -1,8 +1,10 @@
+from __future__ import annotations
 
-from typing import TypeVar
+from typing import BinaryIO, TypeVar
 
 from data_structures.node import Node
 from data_structures.abstract_queue import Queue
+from data_structures.serialization import StructureWriter, StructureReader
 
 T = TypeVar("T")
 
@@ -26,6 +28,32 @@ class LinkedQueue(Queue[T]):
         """ Returns the number of elements in the queue. """
         return self.__length
     
+    def dump(self, fp: BinaryIO, compress: bool = False) -> None:
+        """ Writes the queue to the binary file fp (see data_structures.serialization).
+        The elements are written from the front of the queue to the rear.
+        :complexity: O(N) where N is the number of elements in the queue
+        """
+        writer = StructureWriter(fp, "LinkedQueue", compress)
+        writer.write(self.__length)
+        current = self.__front
+        while current is not None:
+            writer.write(current.item)
+            current = current.link
+        writer.close()
+
+    @classmethod
+    def load(cls, fp: BinaryIO) -> LinkedQueue[T]:
+        """ Reads a queue written by dump from the binary file fp.
+        :raises ValueError: if fp does not hold a dumped LinkedQueue
+        :complexity: O(N) where N is the number of elements in the queue
+        """
+        reader = StructureReader(fp, "LinkedQueue")
+        result = cls()
+        for _ in range(reader.read()):
+            result.append(reader.read())
+        reader.close()
+        return result
+
     def append(self, item: T) -> None:
         """ Adds an element to the rear of the queue.
         :raises Exception: if the queueu is full.
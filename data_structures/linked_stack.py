@@ -1,5 +1,8 @@
+from __future__ import annotations
 from data_structures.node import Node
 from data_structures.abstract_stack import Stack, T
+from data_structures.serialization import StructureWriter, StructureReader
+from typing import BinaryIO
 
 
 class LinkedStack(Stack[T]):
@@ -22,6 +25,40 @@ class LinkedStack(Stack[T]):
         """
         return self.__length
 
+    def dump(self, fp: BinaryIO, compress: bool = False) -> None:
+        """ Writes the stack to the binary file fp (see data_structures.serialization).
+        The elements are written from the top of the stack to the bottom.
+        :complexity: O(N) where N is the number of elements in the stack
+        """
+        writer = StructureWriter(fp, "LinkedStack", compress)
+        writer.write(self.__length)
+        current = self.__top
+        while current is not None:
+            writer.write(current.item)
+            current = current.link
+        writer.close()
+
+    @classmethod
+    def load(cls, fp: BinaryIO) -> LinkedStack[T]:
+        """ Reads a stack written by dump from the binary file fp.
+        The nodes are linked from the top down, in the order they were written.
+        :raises ValueError: if fp does not hold a dumped LinkedStack
+        :complexity: O(N) where N is the number of elements in the stack
+        """
+        reader = StructureReader(fp, "LinkedStack")
+        result = cls()
+        result.__length = reader.read()
+        last = None
+        for _ in range(result.__length):
+            node = Node(reader.read())
+            if last is None:
+                result.__top = node
+            else:
+                last.link = node
+            last = node
+        reader.close()
+        return result
+
     def is_full(self) -> bool:
         """ Returns whether the stack is full
         The linked implementation is never full.
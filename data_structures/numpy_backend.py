@@ -0,0 +1,87 @@
+"""
+Optional NumPy backend for the typed arrays (see data_structures.typed_array).
+
+The values of a typed array are stored in an array.array, which NumPy can read
+and write in place, so the algorithms and structures that hold typed arrays
+(mergesort, binary_search, ArraySortedList and ArraySortedSet) hand their bulk
+work to NumPy when it is installed: sorting, merging, searching for the
+position of a value and the union, intersection and difference of sorted sets.
+An ArrayList holding a typed array is handled through a view of its items.
+NumPy is not required. When it is missing, or the data is not in a typed array
+(e.g. an ArrayR, which holds arbitrary objects), as_numpy returns None and the
+callers fall back to their pure Python code, with the same results.
+
+Shifting items on insertion and deletion does not need NumPy, as copy_from on a
+typed array is a single block copy.
+"""
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+from typing import Any
+
+from data_structures.referential_array import ArrayRView
+from data_structures.typed_array import TypedArray
+from data_structures.array_list import ArrayList
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# NumPy type of the values of each typed array, by array.array type code.
+DTYPES = {'q': 'int64', 'd': 'float64', 'B': 'uint8'}
+
+
+def as_numpy(values: Any, length: int | None = None) -> numpy.ndarray | None:
+    """
+    Returns a NumPy array sharing the storage of the first length (by default
+    all) values of a typed array, a view of one or an ArrayList holding one,
+    without copying them.
+    Writing to the NumPy array writes to the typed array.
+    The NumPy array should not be kept, as the typed array cannot change size
+    while it exists (so no items can be added to the ArrayList).
+    :returns: None if NumPy is not installed or values is not a typed array.
+    :complexity: O(1)
+    """
+    if numpy is None:
+        return None
+    if isinstance(values, ArrayList):
+        values = values.view()
+    start = 0
+    if isinstance(values, ArrayRView):
+        start = values.start
+        if length is None:
+            length = len(values)
+        values = values.base
+    if not isinstance(values, TypedArray) or values.TYPECODE not in DTYPES:
+        return None
+    if length is None:
+        length = len(values) - start
+    return numpy.frombuffer(values.array, dtype=DTYPES[values.TYPECODE], count=length, offset=start * values.array.itemsize)
+
+
+def from_numpy(values: numpy.ndarray, array_type: type[TypedArray]) -> TypedArray:
+    """
+    Returns a new typed array of the given type holding a copy of the values of a NumPy array.
+    :complexity: O(n) where n is the number of values
+    """
+    result = array_type(0)
+    result.array.frombytes(numpy.ascontiguousarray(values, dtype=DTYPES[array_type.TYPECODE]).tobytes())
+    return result
+
+
+def same_type(first: Any, second: Any) -> bool:
+    """
+    True if both are typed arrays (or views of one, or ArrayLists holding one)
+    of the same type, which NumPy can combine without converting the values.
+    """
+    if isinstance(first, ArrayList):
+        first = first.view()
+    if isinstance(second, ArrayList):
+        second = second.view()
+    if isinstance(first, ArrayRView):
+        first = first.base
+    if isinstance(second, ArrayRView):
+        second = second.base
+    return isinstance(first, TypedArray) and type(first) is type(second)
@@ -12,6 +12,19 @@ would be a type called py_object_Array_5). Then (length *
 ctypes.py_object)() is equivalent to the initialisation in MIPS of the
 space to hold the references.
 
+The new array holds NULL references, which cannot be read, so __init__
+sets every position to None. Rather than assigning a list of length
+Nones, it sets the first position and then doubles the initialised prefix
+with memmove, which copies the raw references without creating any
+Python objects. This is only safe for None: ctypes does not count the
+references held by the array itself (it keeps the objects stored in it
+alive in a separate dictionary), and None is never freed.
+
+Storing None does not update that dictionary either, so the object that was
+in the position would stay alive. Storing None in a position (or filling
+positions with None) also removes the entries of those positions from the
+dictionary, so the objects they held can be freed.
+
 Note that while I do check the precondition in __init__ (noone else
 would), I do not check that of getitem or setitem, since that is already
 checked by self.array[index].
@@ -20,13 +33,17 @@ checked by self.array[index].
 __author__ = "Julian Garcia for the __init__ code, Maria Garcia de la Banda for the rest"
 __docformat__ = 'reStructuredText'
 
-from ctypes import py_object
-from typing import Generic, Union, TypeVar
+from ctypes import py_object, memmove, addressof, sizeof
+from typing import Generic, Union, TypeVar, BinaryIO, Sequence, Iterator
+from data_structures.serialization import StructureWriter, StructureReader
 
 T = TypeVar('T')
 
 
 class ArrayR(Generic[T]):
+    # Below this length, assigning a tuple of Nones is faster than the memmove calls.
+    MEMMOVE_THRESHOLD = 256
+
     def __init__(self, length: int) -> None:
         """
         Creates an array of references to objects of the given length
@@ -36,7 +53,40 @@ class ArrayR(Generic[T]):
         if length < 0:
             raise ValueError("Array length cannot be negative.")
         self.array = (length * py_object)()  # initialises the space
-        self.array[:] = [None for _ in range(length)]
+        self.__fill_none(0, length)
+
+    def __fill_none(self, start: int, end: int) -> None:
+        """ Sets positions start to end - 1 of a new array, which hold no objects yet,
+        to None, see the module documentation.
+        :complexity: O(end - start), with O(log(end - start)) memmove calls
+        """
+        n = end - start
+        if n < self.MEMMOVE_THRESHOLD:
+            self.array[start:end] = (None,) * n
+            return
+        self.array[start] = None
+        width = sizeof(py_object)
+        address = addressof(self.array) + start * width
+        done = 1
+        while done < n:
+            step = min(done, n - done)
+            memmove(address + done * width, address, step * width)
+            done += step
+
+    def __release(self, start: int, end: int) -> None:
+        """ Drops the references ctypes keeps to the objects that were stored in
+        positions start to end - 1, which now hold None, see the module documentation.
+        :complexity: O(end - start)
+        """
+        # ctypes keys each object by its position, written in hexadecimal.
+        kept = self.array._objects
+        if not kept:
+            return
+        if start == 0 and end == len(self):
+            kept.clear()
+        else:
+            for position in range(start, end):
+                kept.pop(format(position, 'x'), None)
 
     def __len__(self) -> int:
         """ Returns the length of the array
@@ -44,26 +94,98 @@ class ArrayR(Generic[T]):
         """
         return len(self.array)
 
-    def __getitem__(self, index: int) -> T:
-        """ Returns the object in position index.
-        :complexity: O(1)
+    def __getitem__(self, index: int | slice) -> T | ArrayR[T]:
+        """ Returns the object in position index, or a new array holding
+        the objects in a slice of positions.
+        :complexity: O(1) for an index, O(n) for a slice of n positions
         :pre: index in between 0 and length - self.array[] checks it
         """
+        # Single positions are by far the most common, so they are checked first
+        if type(index) is int:
+            return self.array[index]
+        if isinstance(index, slice):
+            return ArrayR.from_list(self.array[index])
         return self.array[index]
 
-    def __setitem__(self, index: int, value: T) -> None:
-        """ Sets the object in position index to value
-        :complexity: O(1)
+    def __setitem__(self, index: int | slice, value: T | ArrayR[T] | Sequence[T]) -> None:
+        """ Sets the object in position index to value, or the objects in a
+        slice of positions to the items of an array or sequence of the same length.
+        :raises ValueError: if the slice and the items have different lengths
+        :complexity: O(1) for an index, O(n) for a slice of n positions
         :pre: index in between 0 and length - self.array[] checks it
         """
+        if type(index) is int and value is not None:
+            self.array[index] = value
+            return
+        if isinstance(index, slice):
+            self.__set_slice(index, value)
+            return
+        self.array[index] = value
+        if value is None:
+            position = index + len(self) if index < 0 else index
+            self.__release(position, position + 1)
+
+    def __set_slice(self, index: slice, value: ArrayR[T] | ArrayRView[T] | Sequence[T]) -> None:
+        """ Sets the objects in a slice of positions to the items of an array or sequence, see __setitem__. """
+        if isinstance(value, (ArrayR, ArrayRView)):
+            value = value.to_list()
         self.array[index] = value
 
+    def __iter__(self) -> Iterator[T]:
+        """ Iterates over the objects of the array, without copying them.
+        :complexity: O(1) to create, O(n) to iterate over n objects
+        """
+        return iter(self.array)
+
+    def view(self, start: int = 0, stop: int | None = None) -> ArrayRView[T]:
+        """ Returns a view of positions start to stop - 1 (by default all
+        of them) of the array, without copying them. See ArrayRView.
+        :raises IndexError: if the range is out of bounds
+        :complexity: O(1)
+        """
+        return ArrayRView(self, start, stop)
+
+    def copy_from(self, src: ArrayR[T] | ArrayRView[T], src_start: int = 0, dst_start: int = 0,
+                  n: int | None = None) -> None:
+        """ Copies n objects from positions src_start onwards of src (an
+        array or a view of one) to positions dst_start onwards of this
+        array, in a single block copy.
+        Like memmove, the ranges may overlap (e.g. to shift the items of
+        an array), as the objects are read before any is written.
+        :param n: number of objects to copy, by default the rest of src
+        :raises IndexError: if either range is out of bounds
+        :complexity: O(n)
+        """
+        if n is None:
+            n = len(src) - src_start
+        if n < 0 or src_start < 0 or dst_start < 0 or src_start + n > len(src) or dst_start + n > len(self):
+            raise IndexError("Copy out of bounds of the array.")
+        if isinstance(src, ArrayRView):
+            src_start += src.start
+            src = src.base
+        self.array[dst_start:dst_start + n] = src.array[src_start:src_start + n]
+
+    def fill(self, value: T = None, start: int = 0, end: int | None = None) -> None:
+        """ Sets positions start to end - 1 (by default all of them) to value.
+        :raises IndexError: if the range is out of bounds
+        :complexity: O(end - start)
+        """
+        if end is None:
+            end = len(self)
+        if start < 0 or end > len(self) or start > end:
+            raise IndexError("Fill out of bounds of the array.")
+        self.array[start:end] = (value,) * (end - start)
+        if value is None:
+            self.__release(start, end)
+
     @classmethod
     def from_list(cls, lst: list) -> ArrayR:
         """ Creates an ArrayR from a list
+        The array is not filled with None first, as every position is assigned.
         :complexity: O(n) where n is the length of the list
         """
-        new_array = cls(len(lst))
+        new_array = cls.__new__(cls)
+        new_array.array = (len(lst) * py_object)()
         new_array.array[:] = lst
         return new_array
 
@@ -71,16 +193,167 @@ class ArrayR(Generic[T]):
         """ Returns a list representation of the array
         :complexity: O(n) where n is the length of the array
         """
-        return [self.array[i] for i in range(len(self))]
+        return self.array[:]
+
+    def dump(self, fp: BinaryIO, compress: bool = False) -> None:
+        """ Writes the array to the binary file fp (see data_structures.serialization)
+        :complexity: O(n) where n is the length of the array
+        """
+        writer = StructureWriter(fp, "ArrayR", compress)
+        writer.write(len(self))
+        for i in range(len(self)):
+            writer.write(self.array[i])
+        writer.close()
+
+    @classmethod
+    def load(cls, fp: BinaryIO) -> ArrayR:
+        """ Reads an array written by dump from the binary file fp
+        :raises ValueError: if fp does not hold a dumped array
+        :complexity: O(n) where n is the length of the array
+        """
+        reader = StructureReader(fp, "ArrayR")
+        new_array = cls(reader.read())
+        for i in range(len(new_array)):
+            new_array.array[i] = reader.read()
+        reader.close()
+        return new_array
 
     def __str__(self) -> str:
         """ Returns a string representation of the array
         :complexity: O(n) where n is the length of the array
         """
-        return str([self.array[i] for i in range(len(self))])
+        return str(self.array[:])
 
     def __repr__(self) -> str:
         """ Returns a string representation of the array for debugging purposes
         :complexity: O(n) where n is the length of the array
         """
         return str(self)
+
+
+class ArrayRView(Generic[T]):
+    """
+    A window over positions start to stop - 1 of an ArrayR, sharing its
+    storage, so a sub-range can be handed to a function (e.g. each half in
+    mergesort) without copying it. Positions are numbered from 0 within the
+    view, and writing to the view writes to the array underneath.
+    Slicing a view with a step of 1 gives another view of the same array.
+
+    The view does not change size with the array, so it should not outlive
+    a resize of the structure the array belongs to.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    def __init__(self, array: ArrayR[T] | ArrayRView[T], start: int = 0, stop: int | None = None) -> None:
+        """ Creates a view of positions start to stop - 1 of array (by
+        default all of them). A view of a view refers to the same ArrayR.
+        :raises IndexError: if the range is out of bounds
+        """
+        if stop is None:
+            stop = len(array)
+        if not 0 <= start <= stop <= len(array):
+            raise IndexError("View out of bounds of the array.")
+        if isinstance(array, ArrayRView):
+            start += array.__start
+            stop += array.__start
+            array = array.__base
+        self.__base = array
+        self.__start = start
+        self.__length = stop - start
+
+    @property
+    def base(self) -> ArrayR[T]:
+        """ The array the view refers to. """
+        return self.__base
+
+    @property
+    def start(self) -> int:
+        """ Position in the base array of the first position of the view. """
+        return self.__start
+
+    def __len__(self) -> int:
+        """ Returns the length of the view. """
+        return self.__length
+
+    def __position(self, index: int) -> int:
+        """ Position in the base array of index, which can be negative as for lists.
+        :raises IndexError: if index is out of bounds
+        """
+        if index < 0:
+            index += self.__length
+        if not 0 <= index < self.__length:
+            raise IndexError("Out of bounds access in array view.")
+        return self.__start + index
+
+    def __slice(self, index: slice) -> range:
+        """ Range of positions of the view selected by a slice with a step of 1.
+        :raises ValueError: if the slice has a different step
+        """
+        start, stop, step = index.indices(self.__length)
+        if step != 1:
+            raise ValueError("Array views only support slices with a step of 1.")
+        return range(start, max(start, stop))
+
+    def __getitem__(self, index: int | slice) -> T | ArrayRView[T]:
+        """ Returns the object in position index of the view, or a view of a slice of it.
+        :raises IndexError: if index is out of bounds
+        """
+        if isinstance(index, slice):
+            positions = self.__slice(index)
+            return ArrayRView(self, positions.start, positions.stop)
+        return self.__base.array[self.__position(index)]
+
+    def __setitem__(self, index: int | slice, value: T | ArrayR[T] | ArrayRView[T] | Sequence[T]) -> None:
+        """ Sets the object in position index of the view to value, or the
+        objects in a slice of it to the items of an array, view or sequence
+        of the same length.
+        :raises IndexError: if index is out of bounds
+        :raises ValueError: if the slice and the items have different lengths
+        :complexity: O(1) for an index, O(n) for a slice of n positions
+        """
+        if isinstance(index, slice):
+            positions = self.__slice(index)
+            self.__base[self.__start + positions.start:self.__start + positions.stop] = value
+        else:
+            self.__base.array[self.__position(index)] = value
+
+    def __iter__(self) -> Iterator[T]:
+        """ Iterates over the objects of the view, without copying them.
+        :complexity: O(1) to create, O(n) to iterate over n objects
+        """
+        array = self.__base.array
+        for position in range(self.__start, self.__start + self.__length):
+            yield array[position]
+
+    def view(self, start: int = 0, stop: int | None = None) -> ArrayRView[T]:
+        """ Returns a view of positions start to stop - 1 of this view.
+        :raises IndexError: if the range is out of bounds
+        """
+        return ArrayRView(self, start, stop)
+
+    def copy(self) -> ArrayR[T]:
+        """ Returns a new ArrayR holding the objects of the view.
+        :complexity: O(n) where n is the length of the view
+        """
+        return self.__base[self.__start:self.__start + self.__length]
+
+    def to_list(self) -> list:
+        """ Returns a list of the objects of the view.
+        :complexity: O(n) where n is the length of the view
+        """
+        items = self.__base.array[self.__start:self.__start + self.__length]
+        # A typed array (see data_structures.typed_array) gives an array.array rather than a list.
+        return items if isinstance(items, list) else items.tolist()
+
+    def __str__(self) -> str:
+        """ Returns a string representation of the view
+        :complexity: O(n) where n is the length of the view
+        """
+        return str(self.to_list())
+
+    def __repr__(self) -> str:
+        """ Returns a string representation of the view for debugging purposes
+        :complexity: O(n) where n is the length of the view
+        """
+        return str(self)
@@ -0,0 +1,195 @@
+"""
+Binary format used by the dump(fp) and load(fp) methods of the data structures.
+
+A dumped structure is a header followed by a stream of frames:
+    - Header: MAGIC, FORMAT_VERSION, a flags byte (FLAG_COMPRESSED) and the name of the
+      structure, so loading a file into the wrong type of structure fails early.
+    - Frames: a kind byte, the length of the payload as a varint (LEB128) and the payload.
+      VALUES frames hold a pickled list of up to CHUNK_SIZE values, BYTES frames hold raw bytes
+      (e.g. the contents of an array.array), and an END frame with no payload closes the structure.
+When compressed, every payload is compressed with zlib on its own, so frames can still be read
+one at a time and several structures can be dumped one after the other to the same file.
+
+Each structure writes its contents together with its shape (e.g. the topology of a tree, or the
+size of a hash table and the position of every entry), so loading it does not need to hash or
+compare any keys. Values are pickled in batches, which is much faster than pickling each value on
+its own (or the ctypes arrays underneath an ArrayR, which cannot be pickled).
+As with pickle, only load files from a trusted source.
+"""
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+import pickle
+import zlib
+from typing import Any, BinaryIO, Iterator
+
+MAGIC = b"F108"
+FORMAT_VERSION = 1
+FLAG_COMPRESSED = 1
+
+VALUES = b"V"
+BYTES = b"B"
+END = b"E"
+
+
+def write_varint(fp: BinaryIO, value: int) -> None:
+    """
+    Writes a non-negative integer using 7 bits per byte, the high bit set on all but the last byte.
+    :complexity: O(log(value))
+    """
+    data = bytearray()
+    while value >= 0x80:
+        data.append(value & 0x7F | 0x80)
+        value >>= 7
+    data.append(value)
+    fp.write(data)
+
+
+def read_varint(fp: BinaryIO) -> int:
+    """
+    Reads an integer written by write_varint.
+    :raises ValueError: if the file ends before the integer does.
+    :complexity: O(log(value))
+    """
+    value = 0
+    shift = 0
+    while True:
+        byte = fp.read(1)
+        if not byte:
+            raise ValueError("Unexpected end of file.")
+        value |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            return value
+        shift += 7
+
+
+def qualified_name(function: Any) -> str:
+    """
+    Name identifying a function, such as the hasher of a hash table, in a dumped structure.
+    Functions cannot be stored with their structure, so loading checks that it is given the same one.
+    """
+    return f"{getattr(function, '__module__', None)}.{getattr(function, '__qualname__', type(function).__qualname__)}"
+
+
+class StructureWriter:
+    """
+    Writes the contents of one structure to a binary file, see the module documentation.
+    Values are buffered and written CHUNK_SIZE at a time, and close() must be called at the end.
+    """
+
+    CHUNK_SIZE = 4096
+
+    def __init__(self, fp: BinaryIO, name: str, compress: bool = False) -> None:
+        """ Writes the header for a structure of the given name. """
+        self.__fp = fp
+        self.__compress = compress
+        self.__pending = []
+        encoded_name = name.encode()
+        fp.write(MAGIC + bytes([FORMAT_VERSION, FLAG_COMPRESSED if compress else 0]))
+        write_varint(fp, len(encoded_name))
+        fp.write(encoded_name)
+
+    def __frame(self, kind: bytes, payload: bytes) -> None:
+        if self.__compress and payload:
+            payload = zlib.compress(payload)
+        self.__fp.write(kind)
+        write_varint(self.__fp, len(payload))
+        self.__fp.write(payload)
+
+    def __flush(self) -> None:
+        if self.__pending:
+            self.__frame(VALUES, pickle.dumps(self.__pending, pickle.HIGHEST_PROTOCOL))
+            self.__pending = []
+
+    def write(self, value: Any) -> None:
+        """
+        Writes a single value (anything that can be pickled).
+        :complexity: O(1) amortised, plus the cost of pickling the value.
+        """
+        self.__pending.append(value)
+        if len(self.__pending) == self.CHUNK_SIZE:
+            self.__flush()
+
+    def write_bytes(self, data: bytes) -> None:
+        """
+        Writes a block of raw bytes, e.g. from array.tobytes().
+        :complexity: O(len(data))
+        """
+        self.__flush()
+        self.__frame(BYTES, bytes(data))
+
+    def close(self) -> None:
+        """ Writes any buffered values and the end of the structure. Does not close the file. """
+        self.__flush()
+        self.__frame(END, b"")
+
+
+class StructureReader:
+    """
+    Reads back the contents of one structure written by a StructureWriter, in the same order.
+    """
+
+    def __init__(self, fp: BinaryIO, name: str) -> None:
+        """
+        Reads the header of a structure.
+        :raises ValueError: if the file does not hold a dumped structure of the given name.
+        """
+        self.__fp = fp
+        header = fp.read(len(MAGIC) + 2)
+        if len(header) < len(MAGIC) + 2 or header[:len(MAGIC)] != MAGIC:
+            raise ValueError("Not a dumped data structure.")
+        if header[len(MAGIC)] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported format version: {header[len(MAGIC)]}")
+        self.__compressed = bool(header[len(MAGIC) + 1] & FLAG_COMPRESSED)
+        found = fp.read(read_varint(fp)).decode()
+        if found != name:
+            raise ValueError(f"Expected a dumped {name}, found a dumped {found}.")
+        self.__values: Iterator[Any] = iter(())
+
+    def __frame(self) -> tuple[bytes, bytes]:
+        kind = self.__fp.read(1)
+        if not kind:
+            raise ValueError("Unexpected end of file.")
+        length = read_varint(self.__fp)
+        payload = self.__fp.read(length)
+        if len(payload) < length:
+            raise ValueError("Unexpected end of file.")
+        if self.__compressed and payload:
+            payload = zlib.decompress(payload)
+        return kind, payload
+
+    def read(self) -> Any:
+        """
+        Reads the next value written with StructureWriter.write.
+        :raises ValueError: if the next thing in the file is not a value.
+        :complexity: O(1) amortised, plus the cost of unpickling the value.
+        """
+        for value in self.__values:
+            return value
+        kind, payload = self.__frame()
+        if kind != VALUES:
+            raise ValueError("Expected a value in the dumped structure.")
+        self.__values = iter(pickle.loads(payload))
+        return next(self.__values)
+
+    def read_bytes(self) -> bytes:
+        """
+        Reads the next block of bytes written with StructureWriter.write_bytes.
+        :raises ValueError: if the next thing in the file is not a block of bytes.
+        """
+        kind, payload = self.__frame()
+        if kind != BYTES:
+            raise ValueError("Expected a block of bytes in the dumped structure.")
+        return payload
+
+    def close(self) -> None:
+        """
+        Reads the end of the structure, leaving the file just after it.
+        :raises ValueError: if the structure has more contents left.
+        """
+        for _ in self.__values:
+            raise ValueError("Unexpected value at the end of the dumped structure.")
+        kind, _ = self.__frame()
+        if kind != END:
+            raise ValueError("Expected the end of the dumped structure.")
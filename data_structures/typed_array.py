@@ -0,0 +1,218 @@
+"""
+Arrays of primitive values, with the same interface as ArrayR.
+
+An ArrayR holds references, so every value it stores is a separate Python
+object: an int takes 28 bytes on top of the 8 byte reference (and ctypes keeps
+another entry per stored object to keep it alive). The arrays here store the
+raw values instead, in an array.array of a fixed C type, so each value takes
+only the size of that type:
+    - ArrayI64: signed 64 bit integers, 8 bytes each.
+    - ArrayF64: double precision floats, 8 bytes each.
+    - ArrayU8: unsigned bytes (integers from 0 to 255), 1 byte each.
+New arrays hold zeroes rather than None, which cannot be stored, and storing a
+value of the wrong type, or out of range, raises TypeError or OverflowError.
+Values are converted to Python objects when they are read.
+
+The array based structures (ArrayList, ArrayStack, CircularQueue) take the type
+of array to use as an argument, and mergesort and binary_search accept any of
+these arrays.
+"""
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+import sys
+from array import array
+from typing import Generic, TypeVar, BinaryIO, Sequence, Iterator
+
+from data_structures.referential_array import ArrayR, ArrayRView
+from data_structures.serialization import StructureWriter, StructureReader
+
+T = TypeVar('T')
+
+
+class TypedArray(Generic[T]):
+    """
+    Base class of the typed arrays, see the module documentation.
+    Subclasses only set TYPECODE, the array.array type code of the values.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    TYPECODE = ''
+
+    def __init__(self, length: int) -> None:
+        """
+        Creates an array of the given length, holding zeroes.
+        :raises ValueError: if the length is negative
+        :complexity: O(length), but without creating any Python objects
+        """
+        if length < 0:
+            raise ValueError("Array length cannot be negative.")
+        self.array = array(self.TYPECODE, bytes(length * array(self.TYPECODE).itemsize))
+
+    @classmethod
+    def from_list(cls, lst: Sequence[T]) -> TypedArray[T]:
+        """
+        Creates an array holding the values of a list (or any other sequence).
+        :raises TypeError: if a value has the wrong type
+        :complexity: O(n) where n is the length of the list
+        """
+        new_array = cls.__new__(cls)
+        new_array.array = array(cls.TYPECODE, lst)
+        return new_array
+
+    def __len__(self) -> int:
+        """ Returns the length of the array. """
+        return len(self.array)
+
+    def __getitem__(self, index: int | slice) -> T | TypedArray[T]:
+        """
+        Returns the value in position index, or a new array of the same type
+        holding the values in a slice of positions.
+        :complexity: O(1) for an index, O(n) for a slice of n positions
+        """
+        if isinstance(index, slice):
+            new_array = type(self).__new__(type(self))
+            new_array.array = self.array[index]
+            return new_array
+        return self.array[index]
+
+    def __setitem__(self, index: int | slice, value: T | TypedArray[T] | ArrayR[T] | Sequence[T]) -> None:
+        """
+        Sets the value in position index, or the values in a slice of positions
+        to the values of an array or sequence of the same length.
+        :raises TypeError: if a value has the wrong type
+        :raises ValueError: if the slice and the values have different lengths
+        :complexity: O(1) for an index, O(n) for a slice of n positions
+        """
+        if isinstance(index, slice):
+            values = self.__as_array(value)
+            if len(range(*index.indices(len(self)))) != len(values):
+                raise ValueError("Can only assign a sequence of the same size.")
+            self.array[index] = values
+        else:
+            self.array[index] = value
+
+    def __as_array(self, values: TypedArray[T] | ArrayR[T] | ArrayRView[T] | Sequence[T]) -> array:
+        """ The values as an array.array of the type of this array, copied only if needed. """
+        if isinstance(values, TypedArray) and values.TYPECODE == self.TYPECODE:
+            return values.array
+        if isinstance(values, (ArrayR, ArrayRView)):
+            values = values.to_list()
+        return array(self.TYPECODE, values)
+
+    def __iter__(self) -> Iterator[T]:
+        """
+        Iterates over the values of the array.
+        :complexity: O(1) to create, O(n) to iterate over n values
+        """
+        return iter(self.array)
+
+    def view(self, start: int = 0, stop: int | None = None) -> ArrayRView[T]:
+        """
+        Returns a view of positions start to stop - 1 (by default all of them)
+        of the array, without copying them. See ArrayRView.
+        :raises IndexError: if the range is out of bounds
+        """
+        return ArrayRView(self, start, stop)
+
+    def copy_from(self, src: TypedArray[T] | ArrayR[T] | ArrayRView[T], src_start: int = 0, dst_start: int = 0,
+                  n: int | None = None) -> None:
+        """
+        Copies n values from positions src_start onwards of src to positions
+        dst_start onwards of this array, in a single block copy. See ArrayR.copy_from.
+        :raises IndexError: if either range is out of bounds
+        :raises TypeError: if a value has the wrong type
+        :complexity: O(n)
+        """
+        if n is None:
+            n = len(src) - src_start
+        if n < 0 or src_start < 0 or dst_start < 0 or src_start + n > len(src) or dst_start + n > len(self):
+            raise IndexError("Copy out of bounds of the array.")
+        if isinstance(src, ArrayRView):
+            src_start += src.start
+            src = src.base
+        values = src.array[src_start:src_start + n]
+        if not isinstance(src, TypedArray) or src.TYPECODE != self.TYPECODE:
+            values = array(self.TYPECODE, values)
+        self.array[dst_start:dst_start + n] = values
+
+    def fill(self, value: T = 0, start: int = 0, end: int | None = None) -> None:
+        """
+        Sets positions start to end - 1 (by default all of them) to value.
+        :raises IndexError: if the range is out of bounds
+        :complexity: O(end - start)
+        """
+        if end is None:
+            end = len(self)
+        if start < 0 or end > len(self) or start > end:
+            raise IndexError("Fill out of bounds of the array.")
+        self.array[start:end] = array(self.TYPECODE, [value]) * (end - start)
+
+    def to_list(self) -> list:
+        """
+        Returns a list of the values of the array.
+        :complexity: O(n) where n is the length of the array
+        """
+        return self.array.tolist()
+
+    def dump(self, fp: BinaryIO, compress: bool = False) -> None:
+        """
+        Writes the array to the binary file fp (see data_structures.serialization),
+        as the raw bytes of the values.
+        :complexity: O(n) where n is the length of the array
+        """
+        writer = StructureWriter(fp, type(self).__name__, compress)
+        writer.write(sys.byteorder)
+        writer.write_bytes(self.array.tobytes())
+        writer.close()
+
+    @classmethod
+    def load(cls, fp: BinaryIO) -> TypedArray[T]:
+        """
+        Reads an array written by dump from the binary file fp.
+        :raises ValueError: if fp does not hold a dumped array of this type
+        :complexity: O(n) where n is the length of the array
+        """
+        reader = StructureReader(fp, cls.__name__)
+        byteorder = reader.read()
+        new_array = cls(0)
+        new_array.array.frombytes(reader.read_bytes())
+        if byteorder != sys.byteorder:
+            new_array.array.byteswap()
+        reader.close()
+        return new_array
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the array
+        :complexity: O(n) where n is the length of the array
+        """
+        return str(self.array.tolist())
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the array for debugging purposes
+        :complexity: O(n) where n is the length of the array
+        """
+        return str(self)
+
+
+class ArrayI64(TypedArray[int]):
+    """ Array of signed 64 bit integers. """
+    TYPECODE = 'q'
+
+
+class ArrayF64(TypedArray[float]):
+    """ Array of double precision floats. """
+    TYPECODE = 'd'
+
+
+class ArrayU8(TypedArray[int]):
+    """ Array of unsigned bytes, integers from 0 to 255. """
+    TYPECODE = 'B'
+
+
+# Types of array the array based structures can use, by name (used when loading them).
+ARRAY_TYPES = {array_type.__name__: array_type for array_type in (ArrayR, ArrayI64, ArrayF64, ArrayU8)}
@@ -0,0 +1,199 @@
+from unittest import TestCase
+import gc
+import io
+import weakref
+
+from data_structures.referential_array import ArrayR, ArrayRView
+from data_structures.typed_array import ArrayI64, ArrayF64, ArrayU8
+
+
+class TestArrayR(TestCase):
+    def test_init(self):
+        for length in [0, 1, 5, ArrayR.MEMMOVE_THRESHOLD, 1000, 4097]:
+            array = ArrayR(length)
+            self.assertEqual(len(array), length)
+            self.assertEqual(array.to_list(), [None] * length)
+        self.assertRaises(ValueError, ArrayR, -1)
+
+    def test_slices(self):
+        array = ArrayR.from_list(list(range(10)))
+        part = array[2:5]
+        self.assertIsInstance(part, ArrayR)
+        self.assertEqual(part.to_list(), [2, 3, 4])
+        self.assertEqual(array[::3].to_list(), [0, 3, 6, 9])
+        part[0] = "changed"
+        self.assertEqual(array[2], 2)
+
+        array[0:3] = ArrayR.from_list(["a", "b", "c"])
+        array[7:] = [7.0, 8.0, 9.0]
+        self.assertEqual(array.to_list(), ["a", "b", "c", 3, 4, 5, 6, 7.0, 8.0, 9.0])
+        self.assertRaises(ValueError, array.__setitem__, slice(0, 3), [1])
+
+    def test_copy_from(self):
+        source = ArrayR.from_list(list(range(5)))
+        array = ArrayR(8)
+        array.copy_from(source, 1, 2, 3)
+        self.assertEqual(array.to_list(), [None, None, 1, 2, 3, None, None, None])
+        array.copy_from(source)
+        self.assertEqual(array.to_list(), [0, 1, 2, 3, 4, None, None, None])
+
+        # Overlapping ranges within the same array, in both directions.
+        array.copy_from(array, 0, 1, 5)
+        self.assertEqual(array.to_list(), [0, 0, 1, 2, 3, 4, None, None])
+        array.copy_from(array, 2, 0, 4)
+        self.assertEqual(array.to_list(), [1, 2, 3, 4, 3, 4, None, None])
+        array.copy_from(source, 0, 8, 0)
+
+        self.assertRaises(IndexError, array.copy_from, source, 0, 4, 5)
+        self.assertRaises(IndexError, array.copy_from, source, 3, 0, 3)
+        self.assertRaises(IndexError, array.copy_from, source, -1, 0, 1)
+
+    def test_fill(self):
+        array = ArrayR.from_list(list(range(1000)))
+        array.fill(None, 10, 990)
+        self.assertEqual(array.to_list(), list(range(10)) + [None] * 980 + list(range(990, 1000)))
+        array.fill("x", 0, 3)
+        self.assertEqual(array[:4].to_list(), ["x", "x", "x", 3])
+        array.fill(0)
+        self.assertEqual(array.to_list(), [0] * 1000)
+        self.assertRaises(IndexError, array.fill, None, 0, 1001)
+        self.assertRaises(IndexError, array.fill, None, 5, 4)
+
+    def test_release(self):
+        class Item:
+            pass
+
+        items = [Item() for _ in range(1000)]
+        references = [weakref.ref(item) for item in items]
+        array = ArrayR.from_list(items)
+        del items
+        array.fill(None, 0, 500)
+        array[500] = None
+        array[-1] = None
+        gc.collect()
+        alive = [i for i, reference in enumerate(references) if reference() is not None]
+        self.assertEqual(alive, list(range(501, 999)))
+        self.assertIsNone(array[0])
+        array.fill(None)
+        gc.collect()
+        self.assertTrue(all(reference() is None for reference in references))
+        self.assertEqual(array.to_list(), [None] * 1000)
+
+    def test_iter(self):
+        self.assertEqual(list(ArrayR.from_list([3, 1, 2])), [3, 1, 2])
+        self.assertEqual(list(ArrayR(2)), [None, None])
+        self.assertEqual(list(ArrayR(0)), [])
+
+
+class TestArrayRView(TestCase):
+    def setUp(self):
+        self.array = ArrayR.from_list(list(range(10)))
+
+    def test_view(self):
+        view = self.array.view(2, 7)
+        self.assertIsInstance(view, ArrayRView)
+        self.assertEqual(len(view), 5)
+        self.assertEqual(view[0], 2)
+        self.assertEqual(view[-1], 6)
+        self.assertEqual(list(view), [2, 3, 4, 5, 6])
+        self.assertEqual(view.to_list(), [2, 3, 4, 5, 6])
+        self.assertEqual(str(view), "[2, 3, 4, 5, 6]")
+        self.assertRaises(IndexError, view.__getitem__, 5)
+        self.assertRaises(IndexError, view.__getitem__, -6)
+        self.assertRaises(IndexError, self.array.view, 3, 11)
+        self.assertRaises(IndexError, self.array.view, 5, 4)
+        self.assertEqual(len(self.array.view(10)), 0)
+        self.assertEqual(len(self.array.view()), 10)
+
+    def test_shares_storage(self):
+        view = self.array.view(2, 7)
+        view[0] = "two"
+        self.assertEqual(self.array[2], "two")
+        self.array[6] = "six"
+        self.assertEqual(view[4], "six")
+
+        copy = view.copy()
+        self.assertIsInstance(copy, ArrayR)
+        copy[0] = "copied"
+        self.assertEqual(self.array[2], "two")
+
+    def test_nested_views(self):
+        view = self.array.view(2, 9)[1:5]
+        self.assertIsInstance(view, ArrayRView)
+        self.assertIs(view.base, self.array)
+        self.assertEqual(view.start, 3)
+        self.assertEqual(view.to_list(), [3, 4, 5, 6])
+        self.assertEqual(view.view(1, 3).to_list(), [4, 5])
+        self.assertEqual(view[2:100].to_list(), [5, 6])
+        self.assertRaises(ValueError, view.__getitem__, slice(None, None, 2))
+
+        view[1:3] = ["a", "b"]
+        self.assertEqual(self.array.to_list(), [0, 1, 2, 3, "a", "b", 6, 7, 8, 9])
+        self.assertRaises(ValueError, view.__setitem__, slice(0, 2), [1])
+
+    def test_copy_from_view(self):
+        target = ArrayR(4)
+        target.copy_from(self.array.view(5), 1, 0, 3)
+        self.assertEqual(target.to_list(), [6, 7, 8, None])
+        self.assertRaises(IndexError, target.copy_from, self.array.view(5, 7), 0, 0, 3)
+        target[1:3] = self.array.view(0, 2)
+        self.assertEqual(target.to_list(), [6, 0, 1, None])
+
+
+class TestTypedArrays(TestCase):
+    def test_init(self):
+        self.assertEqual(ArrayI64(3).to_list(), [0, 0, 0])
+        self.assertEqual(ArrayF64(2).to_list(), [0.0, 0.0])
+        self.assertEqual(len(ArrayU8(0)), 0)
+        self.assertRaises(ValueError, ArrayI64, -1)
+
+    def test_values(self):
+        array = ArrayI64.from_list([1, -2, 2 ** 62])
+        self.assertEqual(list(array), [1, -2, 2 ** 62])
+        array[0] = 5
+        self.assertEqual(array[0], 5)
+        self.assertRaises(TypeError, array.__setitem__, 0, None)
+        self.assertRaises(TypeError, array.__setitem__, 0, 1.5)
+        self.assertRaises(OverflowError, array.__setitem__, 0, 2 ** 64)
+        self.assertRaises(OverflowError, ArrayU8(1).__setitem__, 0, 256)
+        self.assertRaises(IndexError, array.__getitem__, 3)
+
+    def test_slices_and_copies(self):
+        array = ArrayF64.from_list([float(i) for i in range(6)])
+        part = array[1:4]
+        self.assertIsInstance(part, ArrayF64)
+        self.assertEqual(part.to_list(), [1.0, 2.0, 3.0])
+        array[0:2] = [10, 11]
+        array[4:] = ArrayR.from_list([40.0, 50.0])
+        self.assertEqual(array.to_list(), [10.0, 11.0, 2.0, 3.0, 40.0, 50.0])
+        self.assertRaises(ValueError, array.__setitem__, slice(0, 2), [1.0])
+
+        array.copy_from(array, 0, 1, 5)
+        self.assertEqual(array.to_list(), [10.0, 10.0, 11.0, 2.0, 3.0, 40.0])
+        array.copy_from(ArrayI64.from_list([7, 8]), 0, 0, 2)
+        self.assertEqual(array[:2].to_list(), [7.0, 8.0])
+        self.assertRaises(IndexError, array.copy_from, array, 2, 0, 5)
+        array.fill(1.5, 2)
+        self.assertEqual(array.to_list(), [7.0, 8.0, 1.5, 1.5, 1.5, 1.5])
+
+        references = ArrayR(3)
+        references.copy_from(array, 3)
+        self.assertEqual(references.to_list(), [1.5, 1.5, 1.5])
+
+    def test_views(self):
+        array = ArrayI64.from_list(list(range(8)))
+        view = array.view(2, 6)
+        self.assertEqual(view.to_list(), [2, 3, 4, 5])
+        self.assertEqual(list(view[1:3]), [3, 4])
+        view[0] = 20
+        self.assertEqual(array[2], 20)
+        self.assertIsInstance(view.copy(), ArrayI64)
+
+    def test_dump_and_load(self):
+        for array in [ArrayI64.from_list([1, -1, 2 ** 40]), ArrayF64.from_list([0.5, -2.0]), ArrayU8.from_list(b"bytes")]:
+            fp = io.BytesIO()
+            array.dump(fp)
+            fp.seek(0)
+            loaded = type(array).load(fp)
+            self.assertIsInstance(loaded, type(array))
+            self.assertEqual(loaded.to_list(), array.to_list())
@@ -1,6 +1,7 @@
 from unittest import TestCase
 
 from data_structures.referential_array import ArrayR
+from data_structures.typed_array import ArrayI64
 from algorithms.binary_search import binary_search
 
 
@@ -34,3 +35,16 @@ class TestArrayList(TestCase):
         
         with self.assertRaises(ValueError):
             binary_search(single_element_array, 0)
+
+    def test_binary_search_typed(self):
+        array = ArrayI64.from_list([i * 2 for i in range(50)])
+        for i in range(50):
+            self.assertEqual(binary_search(array, i * 2), i)
+        self.assertRaises(ValueError, binary_search, array, 3)
+
+    def test_binary_search_duplicates(self):
+        # The first occurrence of a repeated item is found
+        values = [i // 5 for i in range(107)]
+        array = ArrayR.from_list(values)
+        for i in range(22):
+            self.assertEqual(binary_search(array, i), values.index(i))
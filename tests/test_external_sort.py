@@ -0,0 +1,98 @@
+from unittest import TestCase
+from unittest.mock import patch
+import os
+import random
+import tempfile
+
+from algorithms import external_sort as external
+from algorithms.external_sort import external_sort, sorted_chunks
+
+
+class TestExternalSort(TestCase):
+    def setUp(self):
+        random.seed(1008)
+        self.values = [random.randint(0, 10 ** 6) for _ in range(5000)]
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def sort(self, records, **kwargs):
+        return list(external_sort(records, temp_dir=self.temp_dir.name, **kwargs))
+
+    def test_in_memory(self):
+        with patch.object(external, "write_run") as write_run:
+            self.assertEqual(self.sort(iter(self.values)), sorted(self.values))
+            self.assertEqual(self.sort([]), [])
+            write_run.assert_not_called()
+
+    def test_runs(self):
+        # A budget of about 100 records per chunk
+        budget = 100 * (external.RECORD_OVERHEAD + 28)
+        chunks = list(sorted_chunks(self.values, memory_budget=budget))
+        self.assertGreater(len(chunks), 10)
+        self.assertEqual([last for _, last in chunks], [False] * (len(chunks) - 1) + [True])
+        self.assertEqual(self.sort(self.values, memory_budget=budget), sorted(self.values))
+        # Several merge passes
+        self.assertEqual(self.sort(self.values, memory_budget=budget, fan_in=3), sorted(self.values))
+        self.assertEqual(self.sort(self.values, key=lambda x: -x, memory_budget=1), sorted(self.values, reverse=True))
+
+    def test_key_calls(self):
+        # Each key is computed once, however many merge passes there are
+        calls = []
+
+        def negate(value):
+            calls.append(value)
+            return -value
+
+        result = self.sort(self.values, key=negate, memory_budget=5000, fan_in=2)
+        self.assertEqual(result, sorted(self.values, reverse=True))
+        self.assertEqual(len(calls), len(self.values))
+
+    def test_stable(self):
+        records = [(random.randint(0, 5), i) for i in range(2000)]
+        result = self.sort(records, key=lambda record: record[0], memory_budget=5000, fan_in=2)
+        self.assertEqual(result, sorted(records, key=lambda record: record[0]))
+
+    def test_file(self):
+        path = os.path.join(self.temp_dir.name, "records.txt")
+        lines = [f"{value},record {i}" for i, value in enumerate(self.values)]
+        with open(path, "w") as fp:
+            fp.write("\n".join(lines) + "\n")
+        result = self.sort(path, key=lambda line: int(line.split(",")[0]), memory_budget=20000)
+        self.assertEqual(result, sorted(lines, key=lambda line: int(line.split(",")[0])))
+
+    def test_temporary_files(self):
+        opened = []
+        write_run = external.write_run
+
+        def recording_write_run(records, temp_dir=None):
+            opened.append(write_run(records, temp_dir))
+            return opened[-1]
+
+        with patch.object(external, "write_run", recording_write_run):
+            result = external_sort(self.values, memory_budget=5000, fan_in=4, temp_dir=self.temp_dir.name)
+            self.assertEqual(next(result), min(self.values))
+            result.close()
+        self.assertGreater(len(opened), 4)
+        self.assertTrue(all(fp.closed for fp in opened))
+
+    def test_failed_merge_pass(self):
+        # A write failing part way through the first merge pass (after the 91 runs of the chunks)
+        # closes the runs that pass already wrote
+        opened = []
+        write_run = external.write_run
+
+        def failing_write_run(records, temp_dir=None):
+            if len(opened) == 95:
+                raise OSError("No space left on device")
+            opened.append(write_run(records, temp_dir))
+            return opened[-1]
+
+        with patch.object(external, "write_run", failing_write_run):
+            with self.assertRaises(OSError):
+                self.sort(self.values, memory_budget=5000, fan_in=2)
+        self.assertEqual(len(opened), 95)
+        self.assertTrue(all(fp.closed for fp in opened))
+
+    def test_errors(self):
+        self.assertRaises(ValueError, external_sort, self.values, memory_budget=0)
+        self.assertRaises(ValueError, external_sort, self.values, fan_in=1)
@@ -1,9 +1,18 @@
 from unittest import TestCase
+import os
+import random
+import tempfile
 
 from data_structures.hash_table_linear_probing import LinearProbeTable
 from data_structures.hash_table_separate_chaining import HashTableSeparateChaining
+from data_structures.hash_table_ordered import OrderedHashTable
+from data_structures.hash_table_mmap import MmapLinearProbeTable
 from data_structures.binary_search_tree import BinarySearchTree
+from data_structures.avl_tree import AVLTree
 from data_structures.node import BinaryNode
+from data_structures.hashing import polynomial_hash, string_hash, int_hash, bytes_hash, tuple_hash, object_hash, \
+    default_hash, HASH_MODULUS
+from data_structures.referential_array import ArrayR
 
 
 class TestLinearProbeTable(TestCase):
@@ -74,6 +83,232 @@ class TestLinearProbeTable(TestCase):
         self.assertEqual(self.table["Key Two"], 2)
         self.assertEqual(self.table["Key Three"], 3)
 
+    def test_churn(self):
+        random.seed(1008)
+        expected = {}
+        for i in range(5000):
+            key = f"Key {random.randint(0, 300)}"
+            if key in expected and random.random() < 0.6:
+                del self.table[key]
+                del expected[key]
+            else:
+                self.table[key] = i
+                expected[key] = i
+        self.assertEqual(len(self.table), len(expected))
+        for key, value in expected.items():
+            self.assertEqual(self.table[key], value)
+        self.assertEqual(sorted(self.table.keys().to_list()), sorted(expected))
+        with self.assertRaises(KeyError):
+            del self.table["Key -1"]
+
+    def test_update_keeps_position(self):
+        for i in range(50):
+            self.table[str(i)] = i
+        keys = self.table.keys().to_list()
+        for i in range(50):
+            self.table[str(i)] = -i
+        self.assertEqual(self.table.keys().to_list(), keys)
+        self.assertEqual(len(self.table), 50)
+        self.assertEqual(sorted(self.table.values().to_list()), sorted(-i for i in range(50)))
+        self.assertEqual(sorted(self.table.items().to_list()), sorted((str(i), -i) for i in range(50)))
+
+    def test_none_key(self):
+        with self.assertRaises(ValueError):
+            self.table[None] = 1
+        self.assertEqual(len(self.table), 0)
+
+    def test_bulk_operations(self):
+        self.table.update((str(i), i) for i in range(100))
+        self.table.update([("0", -1), ("100", 100), ("0", -2)])
+        self.assertEqual(len(self.table), 101)
+        self.assertEqual(self.table.get_many(["0", "50", "100"]).to_list(), [-2, 50, 100])
+        with self.assertRaises(KeyError):
+            self.table.get_many(["0", "missing"])
+
+        # Both a small batch and one large enough to rebuild the table.
+        self.table.delete_many(["100"])
+        self.table.delete_many(str(i) for i in range(0, 100, 2))
+        self.assertEqual(len(self.table), 50)
+        for i in range(100):
+            self.assertEqual(str(i) in self.table, i % 2 == 1)
+        with self.assertRaises(KeyError):
+            self.table.delete_many(["1", "missing"])
+        self.assertFalse("1" in self.table)
+        self.assertEqual(len(self.table), 49)
+
+    def test_reserve(self):
+        self.table.reserve(1000)
+        size = self.table.table_size
+        self.assertGreaterEqual(size, 1000)
+        self.table.update((str(i), i) for i in range(1000))
+        self.assertEqual(self.table.table_size, size)
+        self.table.reserve(10)
+        self.assertEqual(self.table.table_size, size)
+
+
+class TestLinearProbeTableTombstones(TestLinearProbeTable):
+    def setUp(self):
+        self.table = LinearProbeTable(tombstones=True)
+
+
+class TestLinearProbeTableQuadratic(TestLinearProbeTable):
+    def setUp(self):
+        self.table = LinearProbeTable(probe=LinearProbeTable.QUADRATIC_PROBING)
+
+
+class TestLinearProbeTableDoubleHashing(TestLinearProbeTable):
+    def setUp(self):
+        self.table = LinearProbeTable(probe=LinearProbeTable.DOUBLE_HASHING, max_load_factor=0.9)
+
+
+class TestLinearProbeTableRobinHood(TestLinearProbeTable):
+    def setUp(self):
+        self.table = LinearProbeTable(probe=LinearProbeTable.ROBIN_HOOD, max_load_factor=0.9)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            LinearProbeTable(probe="cuckoo")
+        with self.assertRaises(ValueError):
+            LinearProbeTable(max_load_factor=1)
+        with self.assertRaises(ValueError):
+            LinearProbeTable(probe=LinearProbeTable.QUADRATIC_PROBING, max_load_factor=0.8)
+        with self.assertRaises(ValueError):
+            LinearProbeTable(probe=LinearProbeTable.ROBIN_HOOD, tombstones=True)
+
+
+class TestLinearProbeTablePolynomialHash(TestLinearProbeTable):
+    def setUp(self):
+        self.table = LinearProbeTable(hasher=polynomial_hash)
+
+
+class TestOrderedHashTable(TestLinearProbeTable):
+    def setUp(self):
+        self.table = OrderedHashTable()
+
+    def test_insertion_order(self):
+        keys = [str(i) for i in random.Random(1008).sample(range(1000), 200)]
+        for i, key in enumerate(keys):
+            self.table[key] = i
+        # Updates keep their place, deleted keys go back at the end.
+        self.table[keys[0]] = -1
+        del self.table[keys[1]]
+        self.table[keys[1]] = 1
+        expected = [keys[0]] + keys[2:] + [keys[1]]
+        self.assertEqual(list(self.table), expected)
+        self.assertEqual(self.table.keys().to_list(), expected)
+        self.assertEqual(list(self.table.iter_values()), [-1] + list(range(2, 200)) + [1])
+        self.assertEqual(self.table.items().to_list(), list(zip(expected, self.table.iter_values())))
+
+    def test_shrinks_after_deletions(self):
+        for i in range(1000):
+            self.table[i] = i
+        large = self.table.table_size
+        for i in range(990):
+            del self.table[i]
+        self.assertLess(self.table.table_size, large)
+        self.assertEqual(list(self.table.iter_items()), [(i, i) for i in range(990, 1000)])
+        for i in range(990):
+            self.assertFalse(i in self.table)
+
+
+class TestMmapLinearProbeTable(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "table.lpt")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_build_and_reopen(self):
+        pairs = [(f"Key {i}", i) for i in range(500)] + [(i, [i]) for i in range(100)] + [("Key 0", "updated")]
+        with MmapLinearProbeTable.build(self.path, pairs) as table:
+            self.assertEqual(len(table), 600)
+            self.assertEqual(table["Key 0"], "updated")
+
+        with MmapLinearProbeTable(self.path) as table:
+            self.assertEqual(len(table), 600)
+            self.assertEqual(table["Key 499"], 499)
+            self.assertEqual(table[42], [42])
+            self.assertTrue("Key 1" in table)
+            self.assertFalse("Key 500" in table)
+            self.assertFalse(100 in table)
+            with self.assertRaises(KeyError):
+                _ = table["Key 500"]
+            items = table.items().to_list()
+            self.assertEqual(sorted(pair for pair in items if isinstance(pair[0], int)), [(i, [i]) for i in range(100)])
+            self.assertEqual(len(table.keys()), 600)
+            self.assertEqual(len(table.values()), 600)
+
+    def test_read_only(self):
+        with MmapLinearProbeTable.build(self.path, [("Key One", 1)]) as table:
+            with self.assertRaises(TypeError):
+                table["Key Two"] = 2
+            with self.assertRaises(TypeError):
+                del table["Key One"]
+            self.assertEqual(str(table), "(Key One,1)\n")
+
+    def test_empty_and_invalid(self):
+        with MmapLinearProbeTable.build(self.path, []) as table:
+            self.assertTrue(table.is_empty())
+            self.assertFalse("Key One" in table)
+        with open(self.path, "wb") as file:
+            file.write(b"not a table")
+        with self.assertRaises(ValueError):
+            MmapLinearProbeTable(self.path)
+
+
+class TestHashing(TestCase):
+    def test_hash_range(self):
+        for key in ["", "a", "Key One", "x" * 100, "\u00e9\u4e2d"]:
+            for hasher in [polynomial_hash, string_hash]:
+                value = hasher(key)
+                self.assertTrue(0 <= value < HASH_MODULUS)
+                self.assertEqual(value, hasher(key))
+
+    def test_distinct_keys(self):
+        keys = [f"key-{i}" for i in range(1000)] + ["x" * i for i in range(100)]
+        for hasher in [polynomial_hash, string_hash]:
+            self.assertEqual(len({hasher(key) for key in keys}), len(keys))
+
+    def test_default_hash(self):
+        self.assertEqual(default_hash("Key One"), string_hash("Key One"))
+        self.assertEqual(default_hash(42), int_hash(42))
+        self.assertEqual(default_hash(True), int_hash(1))
+        self.assertEqual(default_hash(b"Key One"), bytes_hash(b"Key One"))
+        self.assertEqual(default_hash(b"Key One"), string_hash("Key One"))
+        self.assertEqual(default_hash((1, "a")), tuple_hash((1, "a")))
+        self.assertNotEqual(tuple_hash((1, 2)), tuple_hash((2, 1)))
+        self.assertEqual(default_hash(frozenset([1])), object_hash(frozenset([1])))
+        self.assertTrue(0 <= int_hash(-5) < HASH_MODULUS)
+
+    def test_mixed_keys(self):
+        keys = [7, -3, 10 ** 30, b"bytes", ("composite", 1), ("composite", 2), frozenset([1, 2]), "string"]
+        for table in [LinearProbeTable(), HashTableSeparateChaining()]:
+            for i, key in enumerate(keys):
+                table[key] = i
+            for i, key in enumerate(keys):
+                self.assertEqual(table[key], i)
+            self.assertFalse(("composite", 3) in table)
+            del table[("composite", 1)]
+            self.assertFalse(("composite", 1) in table)
+            self.assertEqual(len(table), len(keys) - 1)
+
+    def test_int_keys(self):
+        for table in [LinearProbeTable(hasher=int_hash), HashTableSeparateChaining(hasher=int_hash)]:
+            for i in range(1000):
+                table[i] = i * i
+            self.assertEqual(len(table), 1000)
+            self.assertEqual(table[999], 999 * 999)
+            self.assertFalse(1000 in table)
+
+    def test_table_uses_hasher(self):
+        table = LinearProbeTable(hasher=len)
+        for i in range(50):
+            table["x" * i] = i
+        self.assertEqual(table.hash("xxx"), 3)
+        self.assertEqual(len(table), 50)
+        self.assertEqual(table["x" * 49], 49)
+
 
 class TestHashTableSeparateChaining(TestCase):
     def setUp(self):
@@ -141,6 +376,85 @@ class TestHashTableSeparateChaining(TestCase):
         self.assertEqual(self.table["Key Two"], 2)
         self.assertEqual(self.table["Key Three"], 3)
 
+    def test_resize(self):
+        expected = {}
+        resized = False
+        for i in range(2000):
+            self.table[f"Key {i}"] = i
+            expected[f"Key {i}"] = i
+            resized = resized or self.table.is_resizing()
+            if i % 7 == 0:
+                # Lookups and updates must find keys in either table during a resize.
+                self.assertEqual(self.table[f"Key {i // 2}"], i // 2)
+                self.table[f"Key {i // 3}"] = -i
+                expected[f"Key {i // 3}"] = -i
+        self.assertTrue(resized)
+        self.assertGreater(self.table.table_size, 1000)
+        self.assertEqual(len(self.table), len(expected))
+        self.assertEqual(sorted(self.table.items().to_list()), sorted(expected.items()))
+
+    def test_shrink(self):
+        table = HashTableSeparateChaining(hasher=polynomial_hash, min_load_factor=0.25)
+        for i in range(1000):
+            table[str(i)] = i
+        large = table.table_size
+        for i in range(990):
+            del table[str(i)]
+        self.assertLess(table.table_size, large)
+        self.assertGreaterEqual(table.table_size, HashTableSeparateChaining.DEFAULT_TABLE_SIZE)
+        self.assertEqual(sorted(table.values().to_list()), list(range(990, 1000)))
+        with self.assertRaises(ValueError):
+            HashTableSeparateChaining(max_load_factor=1, min_load_factor=0.5)
+
+    def test_bulk_operations(self):
+        self.table.update((i, str(i)) for i in range(100))
+        self.table.update([(0, "zero"), (0, "0")])
+        self.assertEqual(len(self.table), 100)
+        self.assertEqual(self.table.get_many([0, 99]).to_list(), ["0", "99"])
+        with self.assertRaises(KeyError):
+            self.table.get_many([100])
+
+        table = HashTableSeparateChaining(min_load_factor=0.25)
+        table.update((i, i) for i in range(1000))
+        large = table.table_size
+        table.delete_many(range(990))
+        self.assertEqual(len(table), 10)
+        self.assertLess(table.table_size, large)
+        self.assertEqual(sorted(table.keys().to_list()), list(range(990, 1000)))
+
+    def test_reserve(self):
+        self.table.reserve(1000)
+        size = self.table.table_size
+        self.assertGreaterEqual(size, 1000)
+        self.assertFalse(self.table.is_resizing())
+        self.table.update((i, i) for i in range(1000))
+        self.assertEqual(self.table.table_size, size)
+        self.assertFalse(self.table.is_resizing())
+
+    def test_long_chains(self):
+        # Every key in the same chain, without ever resizing.
+        table = HashTableSeparateChaining(hasher=lambda key: 0, max_load_factor=100)
+        for i in range(10):
+            table[i] = i
+        for i in range(10):
+            table[i] = -i
+        self.assertEqual(sorted(table.values().to_list()), sorted(-i for i in range(10)))
+        # Remove the inline entry, one in the middle of the chain and the last one.
+        for key in [0, 5, 9]:
+            del table[key]
+            self.assertFalse(key in table)
+        self.assertEqual(sorted(table.keys().to_list()), [1, 2, 3, 4, 6, 7, 8])
+        for key in [1, 2, 3, 4, 6, 7, 8]:
+            self.assertEqual(table[key], -key)
+            del table[key]
+        self.assertTrue(table.is_empty())
+        self.assertEqual(str(table), "")
+
+    def test_none_key(self):
+        with self.assertRaises(ValueError):
+            self.table[None] = 1
+
+
 class TestBinarySearchTree(TestCase):
     def setUp(self):
         self.table = BinarySearchTree()
@@ -242,3 +556,217 @@ class TestBinarySearchTree(TestCase):
         tree = BinarySearchTree.from_node(node)
         self.assertEqual(len(tree), 3)
 
+        # Nodes made without their sizes, so a length alone can't be trusted
+        root = BinaryNode(2, 2)
+        root._left = BinaryNode(1, 1)
+        root._right = BinaryNode(3, 3)
+        tree = BinarySearchTree.from_node(root, 3)
+        self.assertEqual(len(tree), 3)
+        self.assertEqual([tree.select(i) for i in range(3)], [1, 2, 3])
+        self.assertEqual(tree.rank(3), 2)
+        tree = BinarySearchTree.from_node(root, 5)
+        self.assertEqual(len(tree), 3)
+
+    def test_deep_tree(self):
+        # Sorted insertion builds a chain deeper than the default recursion limit.
+        n = 3000
+        for i in range(n):
+            self.table[i] = i
+        self.assertEqual(len(self.table), n)
+        self.assertEqual(self.table[n - 1], n - 1)
+        for i in range(0, n, 2):
+            del self.table[i]
+        self.assertEqual(len(self.table), n // 2)
+        self.assertEqual([node.key for node in self.table], list(range(1, n, 2)))
+
+    def check_sizes(self, current):
+        # Returns the number of nodes in the subtree while checking the stored sizes.
+        if current is None:
+            return 0
+        size = 1 + self.check_sizes(current._left) + self.check_sizes(current._right)
+        self.assertEqual(current._size, size)
+        return size
+
+    def test_order_statistics(self):
+        keys = list(range(0, 200, 2))
+        random.seed(1008)
+        random.shuffle(keys)
+        for key in keys:
+            self.table[key] = key
+        self.table[keys[0]] = "updated"
+        with self.assertRaises(ValueError):
+            del self.table[1]
+        for key in keys[:50]:
+            del self.table[key]
+        self.check_sizes(next(self.table.pre_iter()))
+
+        remaining = sorted(keys[50:])
+        for i, key in enumerate(remaining):
+            self.assertEqual(self.table.select(i), key)
+            self.assertEqual(self.table.kth(i + 1), key)
+            self.assertEqual(self.table.rank(key), i)
+            self.assertEqual(self.table.rank(key + 1), i + 1)
+        with self.assertRaises(IndexError):
+            self.table.select(len(remaining))
+
+        self.assertEqual(self.table.count_range(20, 120), len([k for k in remaining if 20 <= k < 120]))
+        self.assertEqual(self.table.count_range(120, 20), 0)
+        self.assertEqual(self.table.percentile(0), remaining[0])
+        self.assertEqual(self.table.percentile(50), remaining[24])
+        self.assertEqual(self.table.percentile(100), remaining[-1])
+
+    def test_range_queries(self):
+        for key in [40, 20, 60, 10, 30, 50, 70]:
+            self.table[key] = str(key)
+
+        self.assertEqual([n.key for n in self.table.range_iter(20, 60)], [20, 30, 40, 50])
+        self.assertEqual([n.key for n in self.table.range_iter(15, 55)], [20, 30, 40, 50])
+        self.assertEqual([n.key for n in self.table.range_iter(15, 55, reverse=True)], [50, 40, 30, 20])
+        self.assertEqual([n.key for n in self.table.range_iter(hi=30)], [10, 20])
+        self.assertEqual([n.key for n in self.table.range_iter(lo=65)], [70])
+        self.assertEqual([n.key for n in self.table.range_iter(41, 49)], [])
+        self.assertEqual([n.key for n in reversed(self.table)], [70, 60, 50, 40, 30, 20, 10])
+
+        self.assertEqual(self.table.floor(45), 40)
+        self.assertEqual(self.table.floor(40), 40)
+        self.assertEqual(self.table.ceiling(45), 50)
+        self.assertEqual(self.table.ceiling(70), 70)
+        with self.assertRaises(KeyError):
+            self.table.floor(5)
+        with self.assertRaises(KeyError):
+            self.table.ceiling(75)
+
+    def tree_height(self, current):
+        if current is None:
+            return 0
+        return 1 + max(self.tree_height(current._left), self.tree_height(current._right))
+
+    def test_from_sorted(self):
+        pairs = [(i, str(i)) for i in range(100)]
+        for items in [pairs, ArrayR.from_list(pairs), iter(pairs)]:
+            tree = BinarySearchTree.from_sorted(items)
+            self.assertEqual(len(tree), 100)
+            self.assertEqual(tree[0], "0")
+            self.assertEqual(tree.items().to_list(), pairs)
+            self.assertEqual(self.tree_height(next(tree.pre_iter())), 7)
+            self.check_sizes(next(tree.pre_iter()))
+            self.assertEqual(tree.select(42), 42)
+        self.assertTrue(BinarySearchTree.from_sorted([]).is_empty())
+
+    def test_rebalance(self):
+        for i in range(127):
+            self.table[i] = i
+        self.assertEqual(self.tree_height(next(self.table.pre_iter())), 127)
+        self.table.rebalance()
+        self.assertEqual(self.tree_height(next(self.table.pre_iter())), 7)
+        self.check_sizes(next(self.table.pre_iter()))
+        self.assertEqual([n.key for n in self.table], list(range(127)))
+        self.table[127] = 127
+        self.assertEqual(self.table.rank(127), 127)
+
+    def test_remove_inner_nodes(self):
+        self.balance_tree()
+        del self.table[4]
+        del self.table[2]
+        self.assertEqual([n.key for n in self.table], [1, 3, 5, 6, 7])
+        self.assertEqual([n.key for n in self.table.pre_iter()], [5, 3, 1, 6, 7])
+        with self.assertRaises(ValueError):
+            del self.table[4]
+
+    def test_bulk_operations(self):
+        # A large batch of sorted keys builds a balanced tree.
+        self.table.update((i, i) for i in range(127))
+        self.assertEqual(self.tree_height(next(self.table.pre_iter())), 7)
+        # Merged with the existing keys, the last value for a key winning.
+        self.table.update([(200, 200), (0, "a")] + [(i, -i) for i in range(100, 227)] + [(0, "b")])
+        self.assertEqual(len(self.table), 227)
+        self.assertEqual(self.table.get_many([0, 99, 100, 200]).to_list(), ["b", 99, -100, -200])
+        self.check_sizes(next(self.table.pre_iter()))
+        # A small batch is inserted one by one.
+        self.table.update([(-1, -1)])
+        self.assertEqual(self.table.select(0), -1)
+        with self.assertRaises(KeyError):
+            self.table.get_many([1000])
+
+        with self.assertRaises(ValueError):
+            self.table.delete_many(list(range(200)) + [1000])
+        with self.assertRaises(ValueError):
+            self.table.delete_many(list(range(200)) + [0])
+        self.assertEqual(len(self.table), 228)
+        self.table.delete_many(range(-1, 200))
+        self.assertEqual([n.key for n in self.table], list(range(200, 227)))
+        self.check_sizes(next(self.table.pre_iter()))
+        self.table.delete_many([200])
+        self.assertEqual(len(self.table), 26)
+        # A small batch is checked before anything is deleted too.
+        for keys in ([201, 1000], [201, 202, 201]):
+            with self.assertRaises(ValueError):
+                self.table.delete_many(keys)
+            self.assertEqual(len(self.table), 26)
+            self.assertIn(201, self.table)
+
+
+class TestAVLTree(TestCase):
+    def setUp(self):
+        self.table = AVLTree()
+
+    def check_balanced(self, current):
+        # Returns the height of the subtree while checking the AVL property and stored heights.
+        if current is None:
+            return 0
+        left = self.check_balanced(current._left)
+        right = self.check_balanced(current._right)
+        self.assertLessEqual(abs(left - right), 1)
+        self.assertEqual(current._size, 1 + max(left, right))
+        return 1 + max(left, right)
+
+    def test_add(self):
+        self.table["Key One"] = 1
+        self.assertEqual(len(self.table), 1)
+        self.table["Key Two"] = 2
+        self.assertEqual(len(self.table), 2)
+        self.table["Key Two"] = 3
+        self.assertEqual(len(self.table), 2)
+        self.assertEqual(self.table["Key Two"], 3)
+
+    def test_remove(self):
+        self.table["Key Three"] = 3
+        self.table["Key One"] = 1
+        self.table["Key Two"] = 2
+
+        del self.table["Key One"]
+        self.assertEqual(len(self.table), 2)
+        self.assertFalse("Key One" in self.table)
+        self.assertTrue("Key Two" in self.table)
+        self.assertTrue("Key Three" in self.table)
+
+        with self.assertRaises(ValueError):
+            del self.table["Key One"]
+
+        del self.table["Key Three"]
+        del self.table["Key Two"]
+        self.assertEqual(len(self.table), 0)
+        self.assertTrue(self.table.is_empty())
+
+    def test_sorted_insertion(self):
+        n = 5000
+        for i in range(n):
+            self.table[i] = str(i)
+        self.assertEqual(len(self.table), n)
+        # An AVL tree with N nodes has height below 1.45 * log2(N + 2).
+        self.assertLessEqual(self.table.height, 19)
+        self.assertEqual(self.table[0], "0")
+        self.assertEqual([node.key for node in self.table], list(range(n)))
+
+    def test_balance_after_deletions(self):
+        keys = list(range(200))
+        random.seed(1008)
+        random.shuffle(keys)
+        for key in keys:
+            self.table[key] = key
+        self.check_balanced(next(self.table.pre_iter()))
+        for key in keys[:150]:
+            del self.table[key]
+        self.assertEqual(len(self.table), 50)
+        self.assertEqual(self.table.keys().to_list(), sorted(keys[150:]))
+        self.check_balanced(next(self.table.pre_iter()))
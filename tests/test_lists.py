@@ -2,11 +2,15 @@ from unittest import TestCase
 
 from data_structures.linked_list import LinkedList
 from data_structures.array_list import ArrayList
+from data_structures.referential_array import ArrayR
+from data_structures.typed_array import ArrayI64
 
 
 class TestArrayList(TestCase):
+    ARRAY_TYPE = ArrayR
+
     def setUp(self):
-        self.list = ArrayList()
+        self.list = ArrayList(array_type=self.ARRAY_TYPE)
     
     def test_capacity(self):
         # These should work
@@ -103,6 +107,16 @@ class TestArrayList(TestCase):
         self.assertRaises(IndexError, lambda: self.list[-3])
 
 
+class TestTypedArrayList(TestArrayList):
+    ARRAY_TYPE = ArrayI64
+
+    def test_types(self):
+        for i in range(100):
+            self.list.insert(0, i)
+        self.assertEqual([self.list[i] for i in range(100)], list(range(99, -1, -1)))
+        self.assertRaises(TypeError, self.list.append, "not a number")
+
+
 class TestLinkedList(TestCase):
     def setUp(self):
         self.list = LinkedList()
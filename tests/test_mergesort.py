@@ -1,6 +1,8 @@
 from unittest import TestCase
-from algorithms.mergesort import mergesort
+from algorithms.mergesort import mergesort, merge, bottom_up_mergesort
+from data_structures.array_list import ArrayList
 from data_structures.referential_array import ArrayR
+from data_structures.typed_array import ArrayI64, ArrayF64
 import random
 import time
 
@@ -25,3 +27,97 @@ class TestMergeSort(TestCase):
         empty_array = ArrayR.from_list([])
         result_array = mergesort(empty_array)
         self.assertEqual(len(result_array), 0, "Resulting array should be empty for an empty input array")
+
+    def test_sort_typed(self):
+        for array_type in [ArrayI64, ArrayF64]:
+            values = [random.randint(-1000, 1000) for _ in range(200)]
+            result_array = mergesort(array_type.from_list(values))
+            self.assertIsInstance(result_array, array_type)
+            self.assertEqual(result_array.to_list(), sorted(values))
+
+
+class TestBottomUpMergeSort(TestCase):
+    def setUp(self):
+        random.seed(1008)
+
+    def test_sort(self):
+        for length in [0, 1, 2, 3, 31, 64, 100, 257]:
+            values = [random.randint(0, 50) for _ in range(length)]
+            array = ArrayR.from_list(values)
+            result = bottom_up_mergesort(array)
+            self.assertIsInstance(result, ArrayR)
+            self.assertEqual(result.to_list(), sorted(values))
+            self.assertEqual(array.to_list(), values)
+
+    def test_in_place(self):
+        values = [random.randint(-100, 100) for _ in range(300)]
+        array = ArrayR.from_list(values)
+        self.assertIsNone(bottom_up_mergesort(array, in_place=True))
+        self.assertEqual(array.to_list(), sorted(values))
+
+        # Only the items of a view are sorted
+        array = ArrayR.from_list(values)
+        bottom_up_mergesort(array.view(100, 200), key=lambda x: -x, in_place=True)
+        self.assertEqual(array.to_list(), values[:100] + sorted(values[100:200], reverse=True) + values[200:])
+
+        array = ArrayI64.from_list(values)
+        bottom_up_mergesort(array, in_place=True)
+        self.assertEqual(array.to_list(), sorted(values))
+
+    def test_array_list(self):
+        values = [random.randint(0, 1000) for _ in range(150)]
+        array_list = ArrayList()
+        for value in values:
+            array_list.append(value)
+        result = bottom_up_mergesort(array_list)
+        self.assertIsInstance(result, ArrayList)
+        self.assertEqual([result[i] for i in range(len(result))], sorted(values))
+        self.assertEqual(array_list[0], values[0])
+
+        bottom_up_mergesort(array_list, in_place=True)
+        self.assertEqual([array_list[i] for i in range(len(array_list))], sorted(values))
+        array_list.append(-1)
+        self.assertEqual(array_list[len(values)], -1)
+        self.assertRaises(TypeError, bottom_up_mergesort, values)
+
+    def test_stable(self):
+        pairs = [(random.randint(0, 5), i) for i in range(200)]
+        result = bottom_up_mergesort(ArrayR.from_list(pairs), key=lambda pair: pair[0])
+        self.assertEqual(result.to_list(), sorted(pairs, key=lambda pair: pair[0]))
+
+
+class TestKeyCaching(TestCase):
+    def setUp(self):
+        random.seed(1008)
+        self.values = [random.randint(0, 100) for _ in range(500)]
+        self.calls = 0
+
+    def key(self, x):
+        self.calls += 1
+        return -x
+
+    def test_mergesort(self):
+        for sort in [mergesort, bottom_up_mergesort]:
+            self.calls = 0
+            result = sort(ArrayR.from_list(self.values), key=self.key)
+            self.assertEqual(result.to_list(), sorted(self.values, reverse=True))
+            self.assertEqual(self.calls, len(self.values))
+
+        array_list = ArrayList(array_type=ArrayI64)
+        for value in self.values:
+            array_list.append(value)
+        result = mergesort(array_list, key=self.key)
+        self.assertIsInstance(result, ArrayList)
+        self.assertEqual([result[i] for i in range(len(result))], sorted(self.values, reverse=True))
+
+    def test_merge(self):
+        first = ArrayR.from_list(sorted(self.values[:200], reverse=True))
+        second = ArrayR.from_list(sorted(self.values[200:], reverse=True))
+        result = merge(first, second, key=self.key)
+        self.assertEqual(result.to_list(), sorted(self.values, reverse=True))
+        self.assertEqual(self.calls, len(self.values))
+
+    def test_stable(self):
+        pairs = [(random.randint(0, 5), i) for i in range(300)]
+        result = mergesort(ArrayR.from_list(pairs), key=lambda pair: pair[0])
+        self.assertEqual(result.to_list(), sorted(pairs, key=lambda pair: pair[0]))
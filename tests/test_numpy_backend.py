@@ -0,0 +1,120 @@
+from unittest import TestCase
+from unittest.mock import patch
+import random
+
+from data_structures import numpy_backend
+from data_structures.referential_array import ArrayR
+from data_structures.typed_array import ArrayI64, ArrayF64, ArrayU8
+from data_structures.array_list import ArrayList
+from data_structures.array_sorted_list import ArraySortedList
+from data_structures.array_sorted_set import ArraySortedSet
+from algorithms.mergesort import mergesort, merge
+from algorithms.binary_search import binary_search
+
+
+class TestTypedAlgorithms(TestCase):
+    """ Runs with NumPy if it is installed, see TestTypedAlgorithmsWithoutNumpy for the fallback. """
+
+    def setUp(self):
+        random.seed(1008)
+        self.values = [random.randint(-500, 500) for _ in range(300)]
+
+    def test_as_numpy(self):
+        array = ArrayI64.from_list([1, 2, 3, 4])
+        if numpy_backend.numpy is None:
+            self.assertIsNone(numpy_backend.as_numpy(array))
+            return
+        values = numpy_backend.as_numpy(array.view(1, 3))
+        self.assertEqual(values.tolist(), [2, 3])
+        values[0] = 20
+        self.assertEqual(array[1], 20)
+        self.assertEqual(numpy_backend.as_numpy(array, 2).tolist(), [1, 20])
+        self.assertIsNone(numpy_backend.as_numpy(ArrayR.from_list([1, 2])))
+        array_list = ArrayList(8, ArrayI64)
+        for value in [5, 6, 7]:
+            array_list.append(value)
+        self.assertEqual(numpy_backend.as_numpy(array_list).tolist(), [5, 6, 7])
+        self.assertEqual(numpy_backend.from_numpy(values, ArrayF64).to_list(), [20.0, 3.0])
+
+    def test_mergesort(self):
+        for array_type in [ArrayI64, ArrayF64]:
+            result = mergesort(array_type.from_list(self.values))
+            self.assertIsInstance(result, array_type)
+            self.assertEqual(result.to_list(), sorted(self.values))
+        result = mergesort(ArrayI64.from_list(self.values), key=lambda x: -x)
+        self.assertEqual(result.to_list(), sorted(self.values, reverse=True))
+        self.assertEqual(mergesort(ArrayU8.from_list(b"sorted")).to_list(), sorted(b"sorted"))
+        array_list = ArrayList(array_type=ArrayI64)
+        for value in self.values:
+            array_list.append(value)
+        result = mergesort(array_list)
+        self.assertIsInstance(result, ArrayList)
+        self.assertEqual([result[i] for i in range(len(result))], sorted(self.values))
+        self.assertIsInstance(merge(result, result), ArrayList)
+
+    def test_merge(self):
+        first = ArrayI64.from_list(sorted(self.values[:100]))
+        second = ArrayI64.from_list(sorted(self.values[100:]))
+        result = merge(first, second.view(50))
+        self.assertIsInstance(result, ArrayI64)
+        self.assertEqual(result.to_list(), sorted(self.values[:100] + sorted(self.values[100:])[50:]))
+
+    def test_binary_search(self):
+        array = ArrayF64.from_list([float(i) for i in range(0, 100, 2)])
+        for i in range(50):
+            self.assertEqual(binary_search(array, 2 * i), i)
+        self.assertRaises(ValueError, binary_search, array, 3)
+        self.assertRaises(ValueError, binary_search, array, 1000)
+        # The first occurrence of a repeated item, with or without NumPy
+        values = sorted(value // 50 for value in self.values)
+        array_list = ArrayList(array_type=ArrayI64)
+        for value in values:
+            array_list.append(value)
+        for array in [ArrayI64.from_list(values), array_list]:
+            for value in set(values):
+                self.assertEqual(binary_search(array, value), values.index(value))
+
+    def test_sorted_list(self):
+        sorted_list = ArraySortedList(array_type=ArrayI64)
+        for value in self.values:
+            sorted_list.add(value)
+        self.assertEqual([sorted_list[i] for i in range(len(sorted_list))], sorted(self.values))
+        self.assertEqual(sorted_list[sorted_list.index(self.values[0])], self.values[0])
+        sorted_list.remove(self.values[0])
+        self.assertEqual(len(sorted_list), len(self.values) - 1)
+        self.assertRaises(ValueError, sorted_list.index, 1000)
+
+    def test_sorted_set(self):
+        first = ArraySortedSet(array_type=ArrayI64)
+        second = ArraySortedSet(array_type=ArrayI64)
+        for value in self.values[:200]:
+            first.add(value)
+        for value in self.values[100:]:
+            second.add(value)
+        first_values = set(self.values[:200])
+        second_values = set(self.values[100:])
+        self.assertEqual(len(first), len(first_values))
+        self.assertTrue(self.values[0] in first)
+        self.assertFalse(1000 in first)
+
+        for result, expected in [(first.union(second), first_values | second_values),
+                                 (first.intersection(second), first_values & second_values),
+                                 (first.difference(second), first_values - second_values)]:
+            self.assertEqual(result.values().to_list(), sorted(expected))
+            self.assertIsInstance(result.values(), ArrayI64)
+            result.add(1000)
+            self.assertTrue(1000 in result)
+
+        empty = ArraySortedSet(array_type=ArrayI64)
+        self.assertTrue(first.intersection(ArraySortedSet(5, ArrayI64)).is_empty())
+        self.assertEqual(len(empty.union(first)), len(first))
+
+
+class TestTypedAlgorithmsWithoutNumpy(TestTypedAlgorithms):
+    """ The same tests, with the pure Python code used when NumPy is not installed. """
+
+    def setUp(self):
+        super().setUp()
+        patcher = patch.object(numpy_backend, 'numpy', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
@@ -0,0 +1,93 @@
+from unittest import TestCase
+from unittest.mock import patch
+import random
+
+from algorithms import parallel_mergesort as parallel
+from algorithms.parallel_mergesort import parallel_mergesort, chunk_bounds, sort_chunk
+from algorithms.mergesort import mergesort
+from data_structures import numpy_backend
+from data_structures.referential_array import ArrayR
+from data_structures.array_list import ArrayList
+from data_structures.typed_array import ArrayI64, ArrayF64
+
+
+def negate(x):
+    """ A key that can be sent to the workers, unlike a lambda. """
+    return -x
+
+
+def first(pair):
+    return pair[0]
+
+
+key_calls = 0
+
+
+def counted_negate(x):
+    """ negate, counting the calls made in this process (the workers count their own). """
+    global key_calls
+    key_calls += 1
+    return -x
+
+
+class TestParallelMergeSort(TestCase):
+    def setUp(self):
+        random.seed(1008)
+        self.values = [random.randint(-1000, 1000) for _ in range(2000)]
+        # Sort small lists in the workers too, to keep the tests quick
+        patcher = patch.object(parallel, 'PARALLEL_THRESHOLD', 100)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_chunk_bounds(self):
+        self.assertEqual(chunk_bounds(10, 3), [(0, 3), (3, 6), (6, 10)])
+        self.assertEqual(chunk_bounds(2, 3), [(0, 0), (0, 1), (1, 2)])
+
+    def test_sort_chunk(self):
+        self.assertEqual(sort_chunk([3, 1, 2]), [1, 2, 3])
+        self.assertEqual(sort_chunk([3, 1, 3], negate, 10), [(-3, 10), (-3, 12), (-1, 11)])
+
+    def test_key_calls(self):
+        # The keys are computed in the workers only, never by the merge in this process
+        global key_calls
+        for array in [ArrayR.from_list(self.values), ArrayI64.from_list(self.values)]:
+            key_calls = 0
+            result = parallel_mergesort(array, key=counted_negate, workers=3)
+            self.assertEqual(result.to_list(), sorted(self.values, reverse=True))
+            self.assertEqual(key_calls, 0)
+
+    def test_objects(self):
+        array = ArrayR.from_list(self.values)
+        result = parallel_mergesort(array, workers=3)
+        self.assertIsInstance(result, ArrayR)
+        self.assertEqual(result.to_list(), sorted(self.values))
+        self.assertEqual(array.to_list(), self.values)
+
+        pairs = [(random.randint(0, 5), i) for i in range(1000)]
+        result = parallel_mergesort(ArrayR.from_list(pairs), key=first, workers=4)
+        self.assertEqual(result.to_list(), mergesort(ArrayR.from_list(pairs), key=first).to_list())
+
+    def test_shared_memory(self):
+        for array_type in [ArrayI64, ArrayF64]:
+            array = array_type.from_list(self.values)
+            result = parallel_mergesort(array, key=negate, workers=3)
+            self.assertIsInstance(result, array_type)
+            self.assertEqual(result.to_list(), sorted(self.values, reverse=True))
+
+        with patch.object(numpy_backend, 'numpy', None):
+            view = ArrayI64.from_list(self.values).view(100, 1900)
+            self.assertEqual(parallel_mergesort(view, workers=2).to_list(), sorted(self.values[100:1900]))
+
+    def test_array_list(self):
+        array_list = ArrayList(array_type=ArrayI64)
+        for value in self.values:
+            array_list.append(value)
+        result = parallel_mergesort(array_list, key=negate, workers=2)
+        self.assertIsInstance(result, ArrayList)
+        self.assertEqual([result[i] for i in range(len(result))], sorted(self.values, reverse=True))
+
+    def test_sequential(self):
+        self.assertEqual(parallel_mergesort(ArrayR.from_list([3, 1, 2]), workers=4).to_list(), [1, 2, 3])
+        self.assertEqual(parallel_mergesort(ArrayR.from_list(self.values), workers=1).to_list(), sorted(self.values))
+        self.assertRaises(ValueError, parallel_mergesort, ArrayR.from_list(self.values), workers=0)
+        self.assertRaises(TypeError, parallel_mergesort, self.values)
@@ -2,16 +2,19 @@ from unittest import TestCase
 
 from data_structures.linked_queue import LinkedQueue
 from data_structures.circular_queue import CircularQueue
+from data_structures.referential_array import ArrayR
+from data_structures.typed_array import ArrayI64
 
 class TestCircularQueue(TestCase):
     EMPTY = 0
     ROOMY = 5
     LARGE = 10
     CAPACITY = 20
+    ARRAY_TYPE = ArrayR
 
     def setUp(self) -> None:
         self.lengths = [self.EMPTY, self.ROOMY, self.LARGE, self.ROOMY, self.LARGE]
-        self.queues = [CircularQueue(self.CAPACITY) for i in range(len(self.lengths))]
+        self.queues = [CircularQueue(self.CAPACITY, self.ARRAY_TYPE) for i in range(len(self.lengths))]
         for queue, length in zip(self.queues, self.lengths):
             for i in range(length):
                 queue.append(i)
@@ -104,6 +107,10 @@ class TestCircularQueue(TestCase):
         self.assertEqual(roomy_str, str(self.roomy_queue))
 
 
+class TestTypedArrayCircularQueue(TestCircularQueue):
+    ARRAY_TYPE = ArrayI64
+
+
 class TestLinkedQueue(TestCase):
     def setUp(self):
         self.queue = LinkedQueue()
@@ -0,0 +1,228 @@
+from unittest import TestCase
+import io
+
+from data_structures.referential_array import ArrayR
+from data_structures.array_list import ArrayList
+from data_structures.typed_array import ArrayF64, ArrayI64
+from data_structures.linked_list import LinkedList
+from data_structures.array_sorted_list import ArraySortedList
+from data_structures.array_stack import ArrayStack
+from data_structures.linked_stack import LinkedStack
+from data_structures.circular_queue import CircularQueue
+from data_structures.linked_queue import LinkedQueue
+from data_structures.array_set import ArraySet
+from data_structures.array_sorted_set import ArraySortedSet
+from data_structures.bit_vector_set import BitVectorSet
+from data_structures.hash_table_linear_probing import LinearProbeTable
+from data_structures.hash_table_separate_chaining import HashTableSeparateChaining
+from data_structures.hash_table_ordered import OrderedHashTable
+from data_structures.binary_search_tree import BinarySearchTree
+from data_structures.avl_tree import AVLTree
+from data_structures.hashing import polynomial_hash
+from data_structures.serialization import write_varint, read_varint
+
+
+class TestSerialization(TestCase):
+    def round_trip(self, structure, *args, compress=False):
+        """ Dumps the structure and loads it back with the load method of its class. """
+        fp = io.BytesIO()
+        structure.dump(fp, compress)
+        fp.seek(0)
+        result = type(structure).load(fp, *args)
+        self.assertEqual(fp.read(), b"")
+        return result
+
+    def test_varint(self):
+        for value in [0, 1, 127, 128, 300, 2 ** 64]:
+            fp = io.BytesIO()
+            write_varint(fp, value)
+            fp.seek(0)
+            self.assertEqual(read_varint(fp), value)
+        self.assertRaises(ValueError, read_varint, io.BytesIO(b"\x80"))
+
+    def test_arrays_and_lists(self):
+        array = ArrayR.from_list([1, "two", None, (3, 4)])
+        loaded = self.round_trip(array)
+        self.assertEqual([loaded[i] for i in range(len(loaded))], [1, "two", None, (3, 4)])
+
+        array_list = ArrayList(20)
+        linked_list = LinkedList()
+        for i in range(10000):
+            array_list.append(i)
+            linked_list.append(str(i))
+        for compress in (False, True):
+            loaded = self.round_trip(array_list, compress=compress)
+            self.assertEqual([loaded[i] for i in range(len(loaded))], list(range(10000)))
+            loaded.append(-1)
+            self.assertEqual(loaded[10000], -1)
+            loaded = self.round_trip(linked_list, compress=compress)
+            self.assertEqual(list(loaded), [str(i) for i in range(10000)])
+            loaded.append("end")
+            self.assertEqual(loaded[len(loaded) - 1], "end")
+
+        typed_list = ArrayList(array_type=ArrayF64)
+        typed_list.append(1.5)
+        loaded = self.round_trip(typed_list)
+        self.assertEqual(loaded[0], 1.5)
+        self.assertRaises(TypeError, loaded.append, "not a number")
+
+        self.assertEqual(len(self.round_trip(ArrayList())), 0)
+        self.assertEqual(len(self.round_trip(LinkedList())), 0)
+
+    def test_sorted_list(self):
+        sorted_list = ArraySortedList(array_type=ArrayI64)
+        for item in [5, 3, 9, 1000, 3]:
+            sorted_list.add(item)
+        for compress in (False, True):
+            loaded = self.round_trip(sorted_list, compress=compress)
+            self.assertEqual([loaded[i] for i in range(len(loaded))], [3, 3, 5, 9, 1000])
+            loaded.add(4)
+            self.assertEqual(loaded.index(4), 2)
+        self.assertEqual(len(self.round_trip(ArraySortedList())), 0)
+
+    def test_stacks_and_queues(self):
+        array_stack = ArrayStack(10)
+        linked_stack = LinkedStack()
+        circular_queue = CircularQueue(4, ArrayI64)
+        linked_queue = LinkedQueue()
+        for i in range(6):
+            array_stack.push(i)
+            linked_stack.push(i)
+            linked_queue.append((i, str(i)))
+        # Wrap the queue around the end of its array
+        for i in range(7):
+            circular_queue.append(i)
+            if i >= 2:
+                circular_queue.serve()
+        for compress in (False, True):
+            for stack in (array_stack, linked_stack):
+                loaded = self.round_trip(stack, compress=compress)
+                self.assertEqual(len(loaded), 6)
+                loaded.push("top")
+                self.assertEqual([loaded.pop() for _ in range(7)], ["top", 5, 4, 3, 2, 1, 0])
+                self.assertTrue(loaded.is_empty())
+
+            loaded = self.round_trip(circular_queue, compress=compress)
+            self.assertEqual(str(loaded), "[5, 6]")
+            for i in range(7, 9):
+                loaded.append(i)
+            self.assertTrue(loaded.is_full())
+            self.assertEqual([loaded.serve() for _ in range(4)], [5, 6, 7, 8])
+
+            loaded = self.round_trip(linked_queue, compress=compress)
+            loaded.append("rear")
+            self.assertEqual([loaded.serve() for _ in range(7)], [(i, str(i)) for i in range(6)] + ["rear"])
+        self.assertTrue(self.round_trip(LinkedStack()).is_empty())
+        self.assertTrue(self.round_trip(LinkedQueue()).is_empty())
+
+    def test_sets(self):
+        array_set = ArraySet(10)
+        sorted_set = ArraySortedSet()
+        bit_set = BitVectorSet()
+        for item in [5, 3, 9, 1000]:
+            array_set.add(item)
+            sorted_set.add(item)
+            bit_set.add(item)
+        for compress in (False, True):
+            for structure in (array_set, sorted_set, bit_set):
+                loaded = self.round_trip(structure, compress=compress)
+                self.assertEqual(len(loaded), 4)
+                for item in [5, 3, 9, 1000]:
+                    self.assertIn(item, loaded)
+                self.assertNotIn(4, loaded)
+        self.assertTrue(self.round_trip(BitVectorSet()).is_empty())
+
+    def test_hash_tables(self):
+        tables = [
+            LinearProbeTable(),
+            LinearProbeTable(tombstones=True),
+            LinearProbeTable(probe=LinearProbeTable.DOUBLE_HASHING),
+            LinearProbeTable(probe=LinearProbeTable.ROBIN_HOOD),
+            HashTableSeparateChaining(min_load_factor=0.25),
+            OrderedHashTable(),
+        ]
+        for table in tables:
+            expected = {}
+            for i in range(3000):
+                table[f"key{i}"] = i
+                expected[f"key{i}"] = i
+            for i in range(0, 3000, 7):
+                del table[f"key{i}"]
+                del expected[f"key{i}"]
+            for compress in (False, True):
+                loaded = self.round_trip(table, compress=compress)
+                self.assertEqual(loaded.table_size, table.table_size)
+                self.assertEqual(len(loaded), len(expected))
+                self.assertEqual(sorted(loaded.items()), sorted(expected.items()))
+                self.assertNotIn("key0", loaded)
+                loaded["new"] = -1
+                del loaded["key1"]
+                self.assertEqual(loaded["new"], -1)
+                self.assertNotIn("key1", loaded)
+
+    def test_ordered_hash_table_order(self):
+        table = OrderedHashTable()
+        for key in ["c", "a", "b", "d"]:
+            table[key] = key.upper()
+        del table["a"]
+        loaded = self.round_trip(table)
+        self.assertEqual(list(loaded.iter_items()), [("c", "C"), ("b", "B"), ("d", "D")])
+        loaded["a"] = "A"
+        self.assertEqual(list(loaded), ["c", "b", "d", "a"])
+
+    def test_hasher(self):
+        table = LinearProbeTable(hasher=polynomial_hash)
+        table["one"] = 1
+        self.assertEqual(self.round_trip(table, polynomial_hash)["one"], 1)
+        fp = io.BytesIO()
+        table.dump(fp)
+        fp.seek(0)
+        self.assertRaises(ValueError, LinearProbeTable.load, fp)
+
+    def test_trees(self):
+        bst = BinarySearchTree()
+        avl = AVLTree()
+        keys = list(range(0, 2000, 3)) + list(range(1, 2000, 3))
+        for key in keys:
+            bst[key] = str(key)
+            avl[key] = str(key)
+        # A degenerate tree much deeper than the recursion limit.
+        path = BinarySearchTree.from_node(None)
+        for key in range(2000):
+            path[key] = key
+
+        loaded = self.round_trip(bst)
+        self.assertEqual(list(loaded.items()), list(bst.items()))
+        self.assertEqual([node.key for node in loaded.pre_iter()], [node.key for node in bst.pre_iter()])
+        self.assertEqual(loaded.select(100), bst.select(100))
+        loaded[5000] = "new"
+        del loaded[0]
+        self.assertEqual(len(loaded), len(keys))
+
+        loaded = self.round_trip(avl, compress=True)
+        self.assertEqual(list(loaded.items()), list(avl.items()))
+        self.assertEqual(loaded.height, avl.height)
+        loaded[5000] = "new"
+        self.assertEqual(loaded[5000], "new")
+
+        loaded = self.round_trip(path)
+        self.assertEqual(len(loaded), 2000)
+        self.assertEqual(loaded.get_maximal(loaded.get_tree_node_by_key(0)).key, 1999)
+        self.assertTrue(self.round_trip(AVLTree()).is_empty())
+
+    def test_stream_and_errors(self):
+        fp = io.BytesIO()
+        array_list = ArrayList()
+        array_list.append(1)
+        array_list.dump(fp)
+        table = LinearProbeTable()
+        table["a"] = 1
+        table.dump(fp, compress=True)
+        fp.seek(0)
+        self.assertEqual(ArrayList.load(fp)[0], 1)
+        self.assertEqual(LinearProbeTable.load(fp)["a"], 1)
+
+        fp.seek(0)
+        self.assertRaises(ValueError, LinkedList.load, fp)
+        self.assertRaises(ValueError, ArrayList.load, io.BytesIO(b"not a structure"))
+        self.assertRaises(ValueError, ArrayList.load, io.BytesIO(fp.getvalue()[:20]))
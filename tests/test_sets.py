@@ -196,6 +196,16 @@ class TestSortedArraySet(TestCase):
         self.assertTrue(1 in self.set)
         self.set.remove(1)
         self.assertFalse(1 in self.set)
+
+    def test_full(self):
+        full = ArraySortedSet(3)
+        for i in [3, 1, 2]:
+            full.add(i)
+        self.assertFalse(4 in full)
+        self.assertRaises(KeyError, full.remove, 4)
+        full.remove(1)
+        self.assertEqual(full.values().to_list(), [2, 3])
+        self.assertFalse(1 in full)
     
     def test_union(self):
         set1 = ArraySortedSet(10)
@@ -2,16 +2,19 @@ from unittest import TestCase
 
 from data_structures.array_stack import ArrayStack
 from data_structures.linked_stack import LinkedStack
+from data_structures.referential_array import ArrayR
+from data_structures.typed_array import ArrayI64
 
 class TestStack(TestCase):
     EMPTY = 0
     ROOMY = 5
     LARGE = 10
     CAPACITY = 20
+    ARRAY_TYPE = ArrayR
 
     def setUp(self) -> None:
         self.lengths = [self.EMPTY, self.ROOMY, self.LARGE, self.ROOMY, self.LARGE]
-        self.stacks = [ArrayStack(self.CAPACITY) for i in range(len(self.lengths))]
+        self.stacks = [ArrayStack(self.CAPACITY, self.ARRAY_TYPE) for i in range(len(self.lengths))]
         for stack, length in zip(self.stacks, self.lengths):
             for i in range(length):
                 stack.push(i)
@@ -88,6 +91,10 @@ class TestStack(TestCase):
 
 
 
+class TestTypedArrayStack(TestStack):
+    ARRAY_TYPE = ArrayI64
+
+
 class TestLinkedStack(TestCase):
     
     def setUp(self):
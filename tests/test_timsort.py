@@ -0,0 +1,110 @@
+from unittest import TestCase
+import random
+
+from algorithms.timsort import timsort, timsort_list, min_run_length, gallop
+from data_structures.referential_array import ArrayR
+from data_structures.array_list import ArrayList
+from data_structures.typed_array import ArrayI64
+
+
+class Record:
+    """ An item ordered by its key only, so items with equal keys show whether a sort is stable. """
+    comparisons = 0
+
+    def __init__(self, key, position):
+        self.key = key
+        self.position = position
+
+    def __lt__(self, other):
+        Record.comparisons += 1
+        return self.key < other.key
+
+    def __le__(self, other):
+        Record.comparisons += 1
+        return self.key <= other.key
+
+
+class TestTimsort(TestCase):
+    def setUp(self):
+        random.seed(1008)
+
+    def assertSorts(self, values):
+        """ Sorts a copy of values with timsort_list, and compares it with sorted (which is stable). """
+        result = list(values)
+        timsort_list(result)
+        self.assertEqual(result, sorted(values))
+
+    def test_random(self):
+        for length in [0, 1, 2, 31, 64, 65, 500, 3000]:
+            self.assertSorts([random.randint(0, 1000) for _ in range(length)])
+
+    def test_runs(self):
+        self.assertSorts(list(range(2000)))
+        self.assertSorts(list(range(2000, 0, -1)))
+        # Alternating ascending and descending runs of different lengths
+        values = []
+        for length in [500, 3, 1000, 40, 70, 2000, 1]:
+            run = sorted(random.randint(0, 100) for _ in range(length))
+            values += run if len(values) % 2 else run[::-1]
+        self.assertSorts(values)
+
+        # Nearly sorted, with a few items swapped
+        values = list(range(5000))
+        for _ in range(20):
+            i, j = random.randrange(5000), random.randrange(5000)
+            values[i], values[j] = values[j], values[i]
+        self.assertSorts(values)
+
+    def test_stable(self):
+        # Few distinct keys make long galloping stretches of equal keys
+        records = [Record(random.randint(0, 3), i) for i in range(3000)]
+        for _ in range(2):
+            result = list(records)
+            timsort_list(result)
+            self.assertEqual([(record.key, record.position) for record in result],
+                             sorted((record.key, record.position) for record in records))
+            records.sort(key=lambda record: -record.key)
+
+    def test_sorted_is_linear(self):
+        Record.comparisons = 0
+        timsort_list([Record(i, i) for i in range(10000)])
+        self.assertEqual(Record.comparisons, 10000 - 1)
+
+    def test_key_called_once(self):
+        calls = []
+
+        def key(x):
+            calls.append(x)
+            return -x
+
+        values = [random.randint(0, 100) for _ in range(1000)]
+        self.assertEqual(timsort(ArrayR.from_list(values), key=key).to_list(), sorted(values, reverse=True))
+        self.assertEqual(len(calls), len(values))
+
+    def test_helpers(self):
+        for n in [1, 63, 64, 65, 1000, 2 ** 20, 2 ** 20 + 1]:
+            run = min_run_length(n)
+            self.assertTrue(n < 64 and run == n or 32 <= run <= 64)
+        items = [1, 2, 2, 2, 5, 8]
+        for hint in range(len(items)):
+            self.assertEqual(gallop(items, 2, 0, len(items), hint), 1)
+            self.assertEqual(gallop(items, 2, 0, len(items), hint, after_equal=True), 4)
+            self.assertEqual(gallop(items, 9, 0, len(items), hint), 6)
+
+    def test_structures(self):
+        values = [random.randint(-50, 50) for _ in range(300)]
+        array = ArrayR.from_list(values)
+        result = timsort(array, key=lambda x: -x)
+        self.assertIsInstance(result, ArrayR)
+        self.assertEqual(result.to_list(), sorted(values, reverse=True))
+        self.assertEqual(array.to_list(), values)
+
+        self.assertIsNone(timsort(array, in_place=True))
+        self.assertEqual(array.to_list(), sorted(values))
+
+        array_list = ArrayList(array_type=ArrayI64)
+        for value in values:
+            array_list.append(value)
+        timsort(array_list, key=abs, in_place=True)
+        self.assertEqual([array_list[i] for i in range(len(array_list))], sorted(values, key=abs))
+        self.assertRaises(TypeError, timsort, values)